@@ -0,0 +1,161 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = [
+#     "fire>=0.5",
+#     "rich>=13.9",
+#     "abersetz",
+# ]
+# ///
+# this_file: examples/startup_benchmark.py
+"""Benchmark abersetz import time and cold CLI start-up against thresholds.
+
+Each measurement runs in a fresh interpreter: ``python -X importtime`` gives
+the cumulative import time of ``abersetz``, ``abersetz.pipeline`` and
+``abersetz.cli``, and the wall time of ``abersetz tr --help`` and
+``abersetz lang`` covers the whole cold start. The median of ``--runs``
+samples is compared with ``startup_thresholds.json``; the results go to a
+JSON report and the run exits with status 1 if any threshold is exceeded."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import fire  # type: ignore[import-untyped]
+from rich.console import Console
+from rich.table import Table
+
+from abersetz.import_profile import cumulative_us, parse_importtime
+
+console = Console()
+
+IMPORT_TARGETS = ("abersetz", "abersetz.pipeline", "abersetz.cli")
+COMMANDS: dict[str, list[str]] = {"tr --help": ["tr", "--help"], "lang": ["lang"]}
+DEFAULT_THRESHOLDS = Path(__file__).resolve().with_name("startup_thresholds.json")
+HEADROOM = 1.5
+"""Factor applied to measured times when ``--update`` rewrites the thresholds."""
+
+
+def measure_import(module: str, runs: int) -> float:
+    """Return the median cumulative import time of ``module`` in ms."""
+    samples: list[float] = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        records, _ = parse_importtime(completed.stderr)
+        value = cumulative_us(records, module)
+        if value is None:
+            raise RuntimeError(f"{module} was not imported")
+        samples.append(value / 1000)
+    return statistics.median(samples)
+
+
+def measure_command(argv: Sequence[str], runs: int) -> float:
+    """Return the median wall time of ``abersetz *argv`` in a new interpreter, in ms."""
+    samples: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "abersetz", *argv],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def regressions(results: Mapping[str, float], thresholds: Mapping[str, float]) -> list[str]:
+    """Describe every measurement above its threshold."""
+    return [
+        f"{name}: {results[name]:.1f} ms > {limit:.1f} ms"
+        for name, limit in thresholds.items()
+        if name in results and results[name] > limit
+    ]
+
+
+class StartupBenchmark:
+    """Measure start-up cost and compare it with stored thresholds."""
+
+    def run(
+        self,
+        report: str = "startup_benchmark.json",
+        *,
+        thresholds: str | None = None,
+        runs: int = 5,
+        update: bool = False,
+    ) -> None:
+        """Measure imports and cold commands, write a JSON ``report``, fail on regressions.
+
+        Args:
+            report: Path to write the JSON report.
+            thresholds: JSON file of ``{measurement: max_ms}`` (defaults to startup_thresholds.json).
+            runs: Samples per measurement; the median is reported.
+            update: Rewrite the thresholds from this run (times HEADROOM) instead of checking.
+        """
+        thresholds_path = Path(thresholds).resolve() if thresholds else DEFAULT_THRESHOLDS
+        results: dict[str, float] = {}
+        for module in IMPORT_TARGETS:
+            results[f"import {module}"] = measure_import(module, runs)
+        for label, argv in COMMANDS.items():
+            results[f"abersetz {label}"] = measure_command(argv, runs)
+
+        if update:
+            limits = {name: round(value * HEADROOM, 1) for name, value in results.items()}
+            thresholds_path.write_text(json.dumps(limits, indent=2) + "\n", encoding="utf-8")
+            console.print(f"[green]✓[/green] Thresholds written to {thresholds_path}")
+        else:
+            limits = json.loads(thresholds_path.read_text(encoding="utf-8"))
+        failed = regressions(results, limits)
+
+        self._render(results, limits)
+        report_path = Path(report).resolve()
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": runs,
+            "results_ms": results,
+            "thresholds_ms": limits,
+            "regressions": failed,
+        }
+        report_path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        console.print(f"\n[green]✓[/green] Report written to {report_path}")
+        if failed:
+            for line in failed:
+                console.print(f"[red]✗ {line}[/red]")
+            raise SystemExit(1)
+
+    def _render(self, results: Mapping[str, float], limits: Mapping[str, float]) -> None:
+        table = Table(title="abersetz start-up", show_header=True, header_style="bold magenta")
+        table.add_column("Measurement", style="cyan")
+        table.add_column("Median (ms)", justify="right")
+        table.add_column("Threshold (ms)", justify="right")
+        table.add_column("Status")
+        for name, value in results.items():
+            limit = limits.get(name)
+            if limit is None:
+                status, shown = "[yellow]untracked[/yellow]", "-"
+            else:
+                status = "[green]OK[/green]" if value <= limit else "[red]Regressed[/red]"
+                shown = f"{limit:.1f}"
+            table.add_row(name, f"{value:.1f}", shown, status)
+        console.print(table)
+
+
+def main() -> None:
+    fire.Fire(StartupBenchmark)
+
+
+if __name__ == "__main__":
+    main()
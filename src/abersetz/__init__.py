@@ -14,7 +14,6 @@ We export only what you need to run translations or handle their failures:
 
 from __future__ import annotations
 
-from importlib import metadata as _metadata
 from typing import TYPE_CHECKING, Any
 
 # Only import types for static analysis
@@ -22,6 +21,8 @@ if TYPE_CHECKING:
     from .pipeline import PipelineError, TranslationResult, TranslatorOptions, translate_path
     from .tasks import translate_flow, translate_task
 
+    __version__: str
+
 # Lazy loading implementation
 _LAZY_IMPORTS: dict[str, Any] = {}
 
@@ -49,14 +50,20 @@ def __getattr__(name: str) -> Any:
         _LAZY_IMPORTS["translate_flow"] = tasks.translate_flow
         return _LAZY_IMPORTS[name]
 
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Version lookup reads package metadata, so it waits until someone asks
+    if name == "__version__":
+        from importlib import metadata
+
+        try:
+            version = metadata.version("abersetz")
+        except metadata.PackageNotFoundError:  # pragma: no cover - fallback for local dev
+            from .__about__ import __version__ as version  # type: ignore
 
+        _LAZY_IMPORTS["__version__"] = version
+        return version
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Version handling - lightweight
-try:
-    __version__ = _metadata.version("abersetz")
-except _metadata.PackageNotFoundError:  # pragma: no cover - fallback for local dev
-    from .__about__ import __version__  # type: ignore
 
 __all__ = [
     "PipelineError",
@@ -0,0 +1,343 @@
+"""Offline throughput benchmark for the translation pipeline (``abersetz bench``).
+
+Writes a synthetic corpus and drives :func:`~abersetz.pipeline.translate_path`
+(or :func:`~abersetz.pipeline.translate_string`, file by file) over it once per
+concurrency level, by default with the offline ``mk::`` mock engine so no
+network variance gets into the numbers. Each engine call is timed through a
+thin proxy, and every pass reports:
+
+* throughput in characters and chunks per second;
+* p50/p95/p99 latency of the engine calls;
+* pipeline overhead per chunk: wall time with no engine call in flight,
+  divided by the number of chunks;
+* cache hit rate and failed files;
+* peak RSS of the process so far.
+
+Each concurrency level gets its own corpus, and chunks are cached in memory
+for the run only, never in the persistent chunk cache: the first pass is
+always cold, further ``passes`` over the same corpus show the cached path,
+and benchmarking leaves nothing behind in the user's cache."""
+# this_file: src/abersetz/bench.py
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from . import metrics
+from .config import AbersetzConfig, load_config
+from .engines import Engine, EngineError, EngineRequest, EngineResult, create_engine
+from .pipeline import PipelineError, TranslatorOptions, translate_path, translate_string
+
+DEFAULT_ENGINE = "mk::latency=20ms,jitter=5ms"
+CORPUS_FORMATS = {"txt": ".txt", "md": ".md", "html": ".html"}
+
+_WORDS = [
+    "the",
+    "quick",
+    "brown",
+    "fox",
+    "jumps",
+    "over",
+    "a",
+    "lazy",
+    "dog",
+    "while",
+    "translators",
+    "count",
+    "every",
+    "token",
+    "pipeline",
+    "chunk",
+    "engine",
+    "cache",
+    "latency",
+    "throughput",
+    "document",
+    "paragraph",
+    "sentence",
+    "language",
+    "model",
+    "server",
+    "request",
+    "response",
+    "format",
+    "markup",
+    "heading",
+    "list",
+    "table",
+    "value",
+    "river",
+    "mountain",
+    "city",
+    "morning",
+    "evening",
+    "window",
+    "garden",
+    "letter",
+    "story",
+    "reader",
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(6, 16))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+
+
+def synthetic_document(size: int, fmt: str, rng: random.Random) -> str:
+    """Return a document of roughly ``size`` characters in format ``fmt``."""
+    parts: list[str] = []
+    length = 0
+    section = 0
+    while length < size:
+        section += 1
+        paragraph = _paragraph(rng)
+        if fmt == "html":
+            block = f"<h2>Section {section}</h2>\n<p>{paragraph}</p>\n"
+        elif fmt == "md":
+            items = "\n".join(f"- {_sentence(rng)}" for _ in range(2))
+            block = f"## Section {section}\n\n{paragraph}\n\n{items}\n\n"
+        else:
+            block = f"{paragraph}\n\n"
+        parts.append(block)
+        length += len(block)
+    body = "".join(parts)
+    if fmt == "html":
+        return f"<html><head><title>Benchmark</title></head><body>\n{body}</body></html>\n"
+    return body
+
+
+def write_corpus(directory: Path, *, files: int, size: int, fmt: str, seed: int = 0) -> list[Path]:
+    """Write ``files`` synthetic documents of about ``size`` characters each."""
+    if fmt not in CORPUS_FORMATS:
+        raise ValueError(f"Unknown corpus format '{fmt}' (use {', '.join(CORPUS_FORMATS)})")
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(files):
+        path = directory / f"doc{index:04d}{CORPUS_FORMATS[fmt]}"
+        path.write_text(synthetic_document(size, fmt, rng), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the ``q``-th percentile (0-100) with linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def busy_time(intervals: Iterable[tuple[float, float]]) -> float:
+    """Return how long at least one of the ``(start, end)`` intervals was open."""
+    total = 0.0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start  # type: ignore[operator]
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start  # type: ignore[operator]
+    return total
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MB (``None`` if unknown)."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _TimedEngine:
+    """Proxy that records the interval of every ``translate`` call of ``engine``."""
+
+    def __init__(self, engine: Engine) -> None:
+        self._engine = engine
+        self._lock = threading.Lock()
+        self.intervals: list[tuple[float, float]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._engine, name)
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        start = time.perf_counter()
+        try:
+            return self._engine.translate(request)
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.intervals.append((start, end))
+
+    def reset(self) -> list[tuple[float, float]]:
+        with self._lock:
+            intervals, self.intervals = self.intervals, []
+        return intervals
+
+
+@dataclass(slots=True)
+class BenchPass:
+    """Measurements of one pass over the corpus at one concurrency level."""
+
+    concurrency: int
+    pass_index: int
+    files: int
+    failed: int
+    chunks: int
+    engine_calls: int
+    chars: int
+    seconds: float
+    chars_per_second: float
+    chunks_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    overhead_ms_per_chunk: float
+    cache_hit_rate: float
+    peak_rss_mb: float | None
+
+
+def _run_pass(
+    corpus: list[Path],
+    engine: Any,
+    opts: TranslatorOptions,
+    config: AbersetzConfig,
+    mode: str,
+) -> tuple[int, int, int, float]:
+    """Translate the corpus once; return ``(failed, chunks, chars, seconds)``."""
+    failed = chunks = chars = 0
+    started = time.perf_counter()
+    if mode == "path":
+        results = translate_path(corpus[0].parent, opts, config=config, engine=engine)
+        for result in results:
+            failed += result.error is not None
+            chunks += result.chunks
+            chars += result.chars
+    else:
+        # translate_string returns only the text; every chunk, cached or not,
+        # is one cache lookup in the metrics.
+        lookups_before = _cache_lookups(engine)
+        for path in corpus:
+            text = path.read_text(encoding="utf-8")
+            try:
+                translate_string(text, opts, config=config, engine=engine)
+            except (EngineError, PipelineError):
+                failed += 1
+            chars += len(text)
+        chunks = int(_cache_lookups(engine) - lookups_before)
+    return failed, chunks, chars, time.perf_counter() - started
+
+
+def _cache_lookups(engine: Any) -> float:
+    labels = metrics.engine_labels(engine)
+    return sum(metrics.CACHE_LOOKUPS.value(result=result, **labels) for result in ("hit", "miss"))
+
+
+@contextlib.contextmanager
+def _run_cache() -> Iterator[None]:
+    """Cache chunks in memory for one bench run instead of in the persistent chunk cache."""
+    from . import pipeline
+
+    token = pipeline._chunk_call.set(functools.lru_cache(maxsize=None)(pipeline._translate_chunk))
+    try:
+        yield
+    finally:
+        pipeline._chunk_call.reset(token)
+
+
+def run_bench(
+    engine: str = DEFAULT_ENGINE,
+    *,
+    files: int = 20,
+    size: int = 4000,
+    fmt: str = "md",
+    concurrency: Sequence[int] = (1, 4, 8),
+    passes: int = 1,
+    mode: str = "path",
+    to_lang: str = "de",
+    seed: int = 0,
+    config: AbersetzConfig | None = None,
+    workdir: Path | None = None,
+) -> list[BenchPass]:
+    """Benchmark ``engine`` over a synthetic corpus at each concurrency level.
+
+    The concurrency level is passed to the engine as its ``slots`` setting.
+    The corpus and outputs go to a temporary directory unless ``workdir`` is given."""
+    if mode not in {"path", "string"}:
+        raise ValueError(f"Unknown bench mode '{mode}' (use 'path' or 'string')")
+    cfg = config or load_config()
+    rows: list[BenchPass] = []
+    with _run_cache(), tempfile.TemporaryDirectory(prefix="abersetz-bench-") as scratch:
+        root = workdir or Path(scratch)
+        for level_index, level in enumerate(concurrency):
+            level_dir = root / f"c{level}"
+            corpus = write_corpus(
+                level_dir / "source", files=files, size=size, fmt=fmt, seed=seed + level_index
+            )
+            timed = _TimedEngine(create_engine(engine, cfg, slots=level))
+            for pass_index in range(passes):
+                opts = TranslatorOptions(
+                    engine=engine, to_lang=to_lang, output_dir=level_dir / f"pass{pass_index}"
+                )
+                timed.reset()
+                failed, chunks, chars, seconds = _run_pass(corpus, timed, opts, cfg, mode)
+                intervals = timed.reset()
+                latencies = [(end - start) * 1000 for start, end in intervals]
+                idle = max(seconds - busy_time(intervals), 0.0)
+                rows.append(
+                    BenchPass(
+                        concurrency=level,
+                        pass_index=pass_index,
+                        files=len(corpus),
+                        failed=failed,
+                        chunks=chunks,
+                        engine_calls=len(intervals),
+                        chars=chars,
+                        seconds=seconds,
+                        chars_per_second=chars / seconds if seconds else 0.0,
+                        chunks_per_second=chunks / seconds if seconds else 0.0,
+                        p50_ms=percentile(latencies, 50),
+                        p95_ms=percentile(latencies, 95),
+                        p99_ms=percentile(latencies, 99),
+                        overhead_ms_per_chunk=idle * 1000 / chunks if chunks else 0.0,
+                        cache_hit_rate=max(chunks - len(intervals), 0) / chunks if chunks else 0.0,
+                        peak_rss_mb=peak_rss_mb(),
+                    )
+                )
+    return rows
+
+
+__all__ = [
+    "DEFAULT_ENGINE",
+    "BenchPass",
+    "busy_time",
+    "percentile",
+    "peak_rss_mb",
+    "run_bench",
+    "synthetic_document",
+    "write_corpus",
+]
@@ -0,0 +1,259 @@
+"""Checkpoint journal for resumable file and directory translations.
+
+The journal is an append-only NDJSON file under the output directory. It
+records a header with the settings that shape the output, one ``chunk`` line
+per translated chunk (index, digest of the source chunk, translated text and
+the vocabulary entries the chunk added or changed) and one ``file`` line per
+finished file. Every line
+is flushed as it is written, so a killed run loses at most the chunk in
+flight. On ``resume`` the journal is replayed: finished files whose source is
+unchanged are skipped, and a partially translated file continues from its
+first missing chunk with the vocabulary rebuilt from the journaled chunks. The replayed state is
+rewritten compactly (finished files drop their chunk lines) before appending."""
+# this_file: src/abersetz/checkpoint.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from .fileio import SourceFile, atomic_write_text
+
+JOURNAL_NAME = ".abersetz-journal.ndjson"
+JOURNAL_VERSION = 1
+
+
+def chunk_digest(text: str) -> str:
+    """Return a short digest identifying a source chunk."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def source_fingerprint(source: SourceFile) -> str:
+    """Return ``size:mtime_ns`` for ``source``, stat-ing only if discovery did not."""
+    size, mtime_ns = source.size, source.mtime_ns
+    if size is None or mtime_ns is None:
+        info = os.stat(source.path)
+        size, mtime_ns = info.st_size, info.st_mtime_ns
+    return f"{size}:{mtime_ns}"
+
+
+@dataclass(slots=True)
+class _FileState:
+    fingerprint: str
+    chunks: dict[int, tuple[str, str, dict[str, str]]] = field(default_factory=dict)
+    destination: str | None = None
+
+
+class FileCheckpoint:
+    """Chunk-level view of the journal for one source file."""
+
+    def __init__(self, journal: RunJournal, key: str, state: _FileState) -> None:
+        self._journal = journal
+        self._key = key
+        self._state = state
+
+    def lookup(self, index: int, chunk: str) -> tuple[str, dict[str, str]] | None:
+        """Return ``(text, added)`` journaled for chunk ``index`` if it is unchanged.
+
+        ``added`` holds the vocabulary entries the chunk added or changed;
+        merging them in chunk order rebuilds the vocabulary."""
+        stored = self._state.chunks.get(index)
+        if stored is None or stored[0] != chunk_digest(chunk):
+            return None
+        return stored[1], dict(stored[2])
+
+    def record(self, index: int, chunk: str, text: str, added: Mapping[str, str]) -> None:
+        """Journal the translation of chunk ``index`` and the vocabulary entries it ``added``.
+
+        Only the delta is written, so the journal grows with the chunks, not
+        with chunks times vocabulary size."""
+        digest = chunk_digest(chunk)
+        voc = dict(added)
+        self._state.chunks[index] = (digest, text, voc)
+        self._journal._append(
+            {
+                "kind": "chunk",
+                "source": self._key,
+                "fingerprint": self._state.fingerprint,
+                "index": index,
+                "digest": digest,
+                "text": text,
+                "voc": voc,
+            }
+        )
+
+
+class RunJournal:
+    """Append-only record of finished files and chunks for one output tree.
+
+    ``settings`` are the options that change the output (engine, languages,
+    chunk sizes, ...); a journal written under different settings is ignored
+    on resume. Keys are paths relative to ``root`` so a moved tree still
+    resumes."""
+
+    def __init__(
+        self,
+        path: Path,
+        root: Path,
+        settings: dict[str, Any],
+        *,
+        resume: bool = False,
+        trust_keys: bool = False,
+    ) -> None:
+        self.path = path
+        self._root = root
+        self._settings = settings
+        # With ``write_over`` the finished output replaces the source, so its
+        # fingerprint changes by design; the key alone marks it as done.
+        self._trust_keys = trust_keys
+        self._files: dict[str, _FileState] = {}
+        self._lock = threading.Lock()
+        if resume and path.exists():
+            self._load()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(path, self._snapshot())
+        self._handle: IO[str] | None = path.open("a", encoding="utf-8")
+
+    def __enter__(self) -> RunJournal:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close()
+
+    def completed(self, source: SourceFile) -> Path | None:
+        """Return the recorded destination if ``source`` was already finished."""
+        state = self._files.get(self._key(source.path))
+        if state is None or state.destination is None:
+            return None
+        if not self._trust_keys and state.fingerprint != source_fingerprint(source):
+            return None
+        return Path(state.destination)
+
+    def file(self, source: SourceFile) -> FileCheckpoint:
+        """Return the chunk checkpoint for ``source``, discarding stale progress."""
+        key = self._key(source.path)
+        fingerprint = source_fingerprint(source)
+        with self._lock:
+            state = self._files.get(key)
+            if state is None or state.fingerprint != fingerprint or state.destination:
+                state = _FileState(fingerprint)
+                self._files[key] = state
+        return FileCheckpoint(self, key, state)
+
+    def mark_done(self, source: SourceFile, destination: Path) -> None:
+        """Journal ``source`` as finished and drop its chunk progress."""
+        key = self._key(source.path)
+        with self._lock:
+            state = self._files.setdefault(key, _FileState(source_fingerprint(source)))
+            state.destination = str(destination)
+            state.chunks.clear()
+        self._append(
+            {
+                "kind": "file",
+                "source": key,
+                "fingerprint": state.fingerprint,
+                "destination": str(destination),
+            },
+            sync=True,
+        )
+
+    def close(self) -> None:
+        """Flush and close the journal file."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _key(self, path: Path) -> str:
+        try:
+            return path.relative_to(self._root).as_posix()
+        except ValueError:
+            return path.as_posix()
+
+    def _append(self, record: dict[str, Any], *, sync: bool = False) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._handle is None:
+                return
+            self._handle.write(line)
+            self._handle.flush()
+            if sync:
+                os.fsync(self._handle.fileno())
+
+    def _header(self) -> dict[str, Any]:
+        return {"kind": "run", "version": JOURNAL_VERSION, "settings": self._settings}
+
+    def _load(self) -> None:
+        from loguru import logger
+
+        with self.path.open(encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+        records: list[dict[str, Any]] = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # torn last line from a killed run
+        if not records or records[0] != self._header():
+            logger.warning(f"Ignoring checkpoint {self.path}: written with different settings")
+            return
+        for record in records[1:]:
+            key = record.get("source")
+            fingerprint = record.get("fingerprint")
+            if not isinstance(key, str) or not isinstance(fingerprint, str):
+                continue
+            state = self._files.get(key)
+            if state is None or state.fingerprint != fingerprint:
+                state = _FileState(fingerprint)
+                self._files[key] = state
+            if record.get("kind") == "file":
+                state.destination = record.get("destination")
+                state.chunks.clear()
+            elif record.get("kind") == "chunk" and state.destination is None:
+                state.chunks[int(record["index"])] = (
+                    str(record["digest"]),
+                    str(record["text"]),
+                    dict(record.get("voc") or {}),
+                )
+
+    def _snapshot(self) -> str:
+        lines = [self._header()]
+        for key, state in self._files.items():
+            if state.destination is not None:
+                lines.append(
+                    {
+                        "kind": "file",
+                        "source": key,
+                        "fingerprint": state.fingerprint,
+                        "destination": state.destination,
+                    }
+                )
+                continue
+            for index, (digest, text, voc) in sorted(state.chunks.items()):
+                lines.append(
+                    {
+                        "kind": "chunk",
+                        "source": key,
+                        "fingerprint": state.fingerprint,
+                        "index": index,
+                        "digest": digest,
+                        "text": text,
+                        "voc": voc,
+                    }
+                )
+        return "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+
+
+__all__ = [
+    "FileCheckpoint",
+    "JOURNAL_NAME",
+    "RunJournal",
+    "chunk_digest",
+    "source_fingerprint",
+]
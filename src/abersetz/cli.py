@@ -5,23 +5,21 @@ The user-facing CLI. This translates terminal commands into pipeline options, fo
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
 import sys
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
 
 import fire  # type: ignore
-import tomli_w
 from loguru import logger
 
 logger.remove()
 logger.add(sys.stderr, level="WARNING", enqueue=False)
 
-from rich.console import Console  # noqa: E402
-from rich.table import Table  # noqa: E402
-
-from .config import config_path, load_config  # noqa: E402
 from .engine_catalog import (  # noqa: E402
     DEEP_TRANSLATOR_PAID_PROVIDERS,
     PAID_TRANSLATOR_PROVIDERS,
@@ -31,26 +29,80 @@ from .engine_catalog import (  # noqa: E402
     normalize_selector,
 )
 
-with open(os.devnull, "w") as devnull:
-    old_stdout = sys.stdout
-    old_stderr = sys.stderr
-    sys.stdout = devnull
-    sys.stderr = devnull
-    try:
-        from .pipeline import (  # noqa: E402
-            PipelineError,
-            TranslationResult,
-            TranslatorOptions,
-            translate_path,
-            translate_string,
-        )
-        from .setup import setup_command  # noqa: E402
-        from .validation import ValidationResult, validate_engines  # noqa: E402
-    finally:
-        sys.stdout = old_stdout
-        sys.stderr = old_stderr
+if TYPE_CHECKING:
+    from .pipeline import TranslationResult, TranslatorOptions
+    from .validation import ValidationResult
+
+# Subcommands import what they use (rich, the pipeline and its engines,
+# ``setup``) on first use, so ``lang`` or ``--help`` never pay for httpx or the
+# engine modules. The forwarders below keep the module-level names that tests
+# and callers patch.
+
+
+def _pipeline() -> ModuleType:
+    """Import :mod:`abersetz.pipeline`, silencing import-time output of cache backends."""
+    if "abersetz.pipeline" not in sys.modules:
+        with (
+            open(os.devnull, "w") as devnull,
+            contextlib.redirect_stdout(devnull),
+            contextlib.redirect_stderr(devnull),
+        ):
+            from . import pipeline  # noqa: F401
+    return sys.modules["abersetz.pipeline"]
+
+
+def translate_path(path: str | Path, options: TranslatorOptions, **kwargs: Any) -> Any:
+    """Forward to :func:`abersetz.pipeline.translate_path`."""
+    return _pipeline().translate_path(path, options, **kwargs)
+
+
+def translate_string(text: str, options: TranslatorOptions, **kwargs: Any) -> str:
+    """Forward to :func:`abersetz.pipeline.translate_string`."""
+    return _pipeline().translate_string(text, options, **kwargs)
+
+
+def validate_engines(*args: Any, **kwargs: Any) -> list[ValidationResult]:
+    """Forward to :func:`abersetz.validation.validate_engines`."""
+    from .validation import validate_engines as validate
+
+    return validate(*args, **kwargs)
+
+
+def setup_command(**kwargs: Any) -> None:
+    """Forward to :func:`abersetz.setup.setup_command`."""
+    from .setup import setup_command as run_setup
+
+    run_setup(**kwargs)
+
+
+def load_config() -> Any:
+    """Forward to :func:`abersetz.config.load_config`."""
+    from .config import load_config as load
+
+    return load()
+
 
-console = Console()
+def config_path() -> Path:
+    """Forward to :func:`abersetz.config.config_path`."""
+    from .config import config_path as path
+
+    return path()
+
+
+class _LazyConsole:
+    """Stand-in for a ``rich`` console that imports rich on first use."""
+
+    _console: Any = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return getattr(self._console, name)
+
+
+console: Any = _LazyConsole()
 
 
 def _configure_logging(verbose: bool) -> None:
@@ -59,6 +111,60 @@ def _configure_logging(verbose: bool) -> None:
     logger.add(sys.stderr, level=level, enqueue=False)
 
 
+@contextlib.contextmanager
+def _instrumented(
+    trace: str | None,
+    profile: bool | str | Sequence[str],
+    metrics: str | None,
+    profile_out: str | None = None,
+) -> Iterator[None]:
+    """Apply ``--trace``, ``--profile`` and ``--metrics`` around a command.
+
+    ``--trace otel`` mirrors spans into OpenTelemetry, any other value is an
+    NDJSON file. A bare ``--profile`` prints the stage summary to stderr;
+    ``--profile=cpu|sample|alloc`` also runs the command under those profilers
+    and writes their files to ``profile_out``. The ``--metrics`` file is
+    written, also after a failure."""
+    if metrics:
+        with _instrumented(trace, profile, None, profile_out):
+            try:
+                yield
+            finally:
+                from . import metrics as registry
+
+                registry.REGISTRY.write(Path(metrics).resolve())
+        return
+    if profile not in (False, True, None):
+        from . import profiling
+
+        modes = profiling.parse_modes(profile)
+        with (
+            profiling.profiled(modes, profile_out or profiling.DEFAULT_OUTPUT),
+            _instrumented(trace, "stages" in modes, None),
+        ):
+            yield
+        return
+    if not trace and not profile:
+        yield
+        return
+    from . import tracing
+
+    installed: list[tracing.TraceHook] = []
+    if trace == "otel":
+        installed.append(tracing.OpenTelemetryExporter())
+    elif trace:
+        installed.append(tracing.NdjsonExporter(Path(trace).resolve()))
+    stage_profile = tracing.StageProfile() if profile else None
+    if stage_profile is not None:
+        installed.append(stage_profile)
+    try:
+        with tracing.hooks(*installed):
+            yield
+    finally:
+        if stage_profile is not None:
+            print(stage_profile.format(), file=sys.stderr)
+
+
 def _parse_patterns(value: str | Sequence[str] | None) -> tuple[str, ...]:
     if value is None:
         return tuple()
@@ -87,6 +193,8 @@ def _render_engine_entries(entries: list[EngineEntry]) -> None:
     if not entries:
         console.print("No engines detected.")
         return
+    from rich.table import Table
+
     table = Table(title="Available Translation Engines", show_header=True, header_style="bold cyan")
     table.add_column("Selector", style="white")
     table.add_column("Family", style="cyan")
@@ -110,6 +218,7 @@ def _render_validation_entries(results: list[ValidationResult]) -> None:
     if not results:
         console.print("No engines available for validation.")
         return
+    from rich.table import Table
 
     table = Table(title="Engine Validation", show_header=True, header_style="bold cyan")
     table.add_column("Selector", style="white")
@@ -284,6 +393,8 @@ class ConfigCommands:
         Returns:
             str: The configuration formatted as TOML.
         """
+        import tomli_w
+
         cfg = load_config()
         data = cfg.to_dict()
         toml_output = tomli_w.dumps(data)
@@ -332,6 +443,21 @@ def _build_options_from_cli(
     n_ctx: int | None = None,
     max_tokens: int | None = None,
     n_threads: int | None = None,
+    slots: int | None = None,
+    prompt_cache: int | None = None,
+    workers: int | None = None,
+    warmup: bool = False,
+    draft: str | None = None,
+    prompt_lookup: int | None = None,
+    background_write: bool = False,
+    gitignore: bool = False,
+    report: str | Path | None = None,
+    max_failures: int | None = None,
+    retry_failed: str | Path | None = None,
+    checkpoint: bool = False,
+    resume: bool = False,
+    budget: float | None = None,
+    termbase: str | Path | None = None,
 ) -> TranslatorOptions:
     # Validate language codes
     validated_from_lang = _validate_language_code(from_lang, "--from-lang")
@@ -344,7 +470,8 @@ def _build_options_from_cli(
     output_dir: Path | None
     output_dir = None if output is None else Path(output).resolve()
 
-    return TranslatorOptions(
+    pipeline = _pipeline()
+    return pipeline.TranslatorOptions(
         to_lang=validated_to_lang,
         engine=normalized_engine,
         from_lang=validated_from_lang,
@@ -354,7 +481,7 @@ def _build_options_from_cli(
         save_voc=save_voc,
         chunk_size=chunk_size,
         html_chunk_size=html_chunk_size,
-        include=_parse_patterns(include) or TranslatorOptions().include,
+        include=_parse_patterns(include) or pipeline.DEFAULT_PATTERNS,
         xclude=_parse_patterns(xclude),
         dry_run=dry_run,
         prolog=_load_json_data(prolog),
@@ -364,9 +491,29 @@ def _build_options_from_cli(
         n_ctx=n_ctx,
         max_tokens=max_tokens,
         n_threads=n_threads,
+        slots=slots,
+        prompt_cache=prompt_cache,
+        workers=workers,
+        warmup=True if warmup else None,
+        draft=draft,
+        prompt_lookup=prompt_lookup,
+        background_write=background_write,
+        gitignore=gitignore,
+        report=None if report is None else Path(report).resolve(),
+        max_failures=max_failures,
+        retry_failed=None if retry_failed is None else Path(retry_failed).resolve(),
+        checkpoint=checkpoint,
+        resume=resume,
+        budget=budget,
+        termbase=None if termbase is None else Path(termbase).expanduser().resolve(),
     )
 
 
+def _write_stdout(piece: str) -> None:
+    sys.stdout.write(piece)
+    sys.stdout.flush()
+
+
 def _iter_language_rows() -> list[str]:
     from langcodes import get
     from langcodes.language_lists import CLDR_LANGUAGES
@@ -422,7 +569,26 @@ class AbersetzCLI:
         n_ctx: int | None = None,
         max_tokens: int | None = None,
         n_threads: int | None = None,
+        slots: int | None = None,
+        prompt_cache: int | None = None,
+        workers: int | None = None,
+        warmup: bool = False,
+        draft: str | None = None,
+        prompt_lookup: int | None = None,
+        background_write: bool = False,
+        gitignore: bool = False,
+        report: str | None = None,
+        max_failures: int | None = None,
+        retry_failed: str | None = None,
+        checkpoint: bool = False,
+        resume: bool = False,
+        budget: float | None = None,
+        termbase: str | None = None,
         job: str | None = None,
+        trace: str | None = None,
+        profile: bool | str = False,
+        profile_out: str | None = None,
+        metrics: str | None = None,
         verbose: bool = False,
     ) -> None:
         """Shared implementation for ``tf`` (file) and ``td`` (directory)."""
@@ -433,39 +599,68 @@ class AbersetzCLI:
 
         _configure_logging(verbose)
 
-        if job:
-            self._run_file_job(path, job, output=output, dry_run=dry_run, verbose=verbose)
-            return
-
-        opts = _build_options_from_cli(
-            to_lang=to_lang,
-            path=path,
-            engine=engine,
-            from_lang=from_lang,
-            recurse=recurse,
-            write_over=actual_overwrite,
-            output=output,
-            save_voc=save_voc,
-            chunk_size=chunk_size,
-            html_chunk_size=html_chunk_size,
-            include=include,
-            xclude=xclude,
-            dry_run=dry_run,
-            prolog=prolog,
-            voc=actual_voc,
-            temperature=actual_temperature,
-            n_gpu_layers=n_gpu_layers,
-            n_ctx=n_ctx,
-            max_tokens=max_tokens,
-            n_threads=n_threads,
-        )
-        try:
-            results = translate_path(path, opts)
-        except PipelineError as error:
-            console.print(f"[red]{error}[/red]")
-            raise
+        with _instrumented(trace, profile, metrics, profile_out):
+            if job:
+                self._run_file_job(path, job, output=output, dry_run=dry_run, verbose=verbose)
+                return
+
+            opts = _build_options_from_cli(
+                to_lang=to_lang,
+                path=path,
+                engine=engine,
+                from_lang=from_lang,
+                recurse=recurse,
+                write_over=actual_overwrite,
+                output=output,
+                save_voc=save_voc,
+                chunk_size=chunk_size,
+                html_chunk_size=html_chunk_size,
+                include=include,
+                xclude=xclude,
+                dry_run=dry_run,
+                prolog=prolog,
+                voc=actual_voc,
+                temperature=actual_temperature,
+                n_gpu_layers=n_gpu_layers,
+                n_ctx=n_ctx,
+                max_tokens=max_tokens,
+                n_threads=n_threads,
+                slots=slots,
+                prompt_cache=prompt_cache,
+                workers=workers,
+                warmup=warmup,
+                draft=draft,
+                prompt_lookup=prompt_lookup,
+                background_write=background_write,
+                gitignore=gitignore,
+                report=report,
+                max_failures=max_failures,
+                retry_failed=retry_failed,
+                checkpoint=checkpoint,
+                resume=resume,
+                budget=budget,
+                termbase=termbase,
+            )
+            pipeline = _pipeline()
+            try:
+                results = translate_path(path, opts)
+            except (pipeline.FailureLimitExceeded, pipeline.BudgetExceeded) as error:
+                self._print_results(error.results, opts, verbose)
+                console.print(f"[red]{error}[/red]")
+                raise
+            except pipeline.PipelineError as error:
+                console.print(f"[red]{error}[/red]")
+                raise
+            self._print_results(results, opts, verbose)
+
+    def _print_results(
+        self, results: list[TranslationResult], opts: TranslatorOptions, verbose: bool
+    ) -> None:
         # Minimal output - just print destinations
         for result in results:
+            if result.error:
+                console.print(f"[red]{result.source}: {result.error}[/red]")
+                continue
             if verbose:
                 logger.debug("Input: {}", result.source)
                 logger.debug(
@@ -492,12 +687,13 @@ class AbersetzCLI:
         """Run every entry of a job against ``path``, one suffixed output each."""
         from .job import load_job
 
+        pipeline = _pipeline()
         loaded = load_job(job_ref)
         base_output = Path(output).resolve() if output is not None else None
         for entry in loaded.resolved_entries():
             suffix = entry.resolved_suffix()
             out_dir = (base_output or Path(path).resolve().parent) / suffix
-            opts = TranslatorOptions(
+            opts = pipeline.TranslatorOptions(
                 engine=entry.selector,
                 from_lang=entry.from_lang,
                 to_lang=entry.to_lang,
@@ -510,10 +706,16 @@ class AbersetzCLI:
                 n_gpu_layers=entry.params.get("n_gpu_layers"),
                 n_ctx=entry.params.get("n_ctx"),
                 n_threads=entry.params.get("n_threads"),
+                slots=entry.params.get("slots"),
+                prompt_cache=entry.params.get("prompt_cache"),
+                workers=entry.params.get("workers"),
+                warmup=entry.params.get("warmup"),
+                draft=entry.params.get("draft"),
+                prompt_lookup=entry.params.get("prompt_lookup"),
             )
             try:
                 results = translate_path(path, opts)
-            except PipelineError as error:
+            except pipeline.PipelineError as error:
                 console.print(f"[red]{entry.selector}: {error}[/red]")
                 continue
             for result in results:
@@ -550,6 +752,12 @@ class AbersetzCLI:
         chunk_size: int | None = None,
         temperature: float | None = None,
         job: str | None = None,
+        stream: bool = False,
+        budget: float | None = None,
+        trace: str | None = None,
+        profile: bool | str = False,
+        profile_out: str | None = None,
+        metrics: str | None = None,
         verbose: bool = False,
     ) -> None:
         """Translate a string and print the result to stdout.
@@ -563,16 +771,47 @@ class AbersetzCLI:
             temperature: Inference temperature for LLM-based engines.
             job: JSON job (file path or inline) — translates the text with every
                 entry and prints ``selector<TAB>translation`` lines.
+            stream: Print the translation as the engine produces it instead of
+                waiting for the whole text.
+            budget: Refuse engine calls that would take the spend past this many
+                dollars, priced from the ``[pricing]`` config table.
+            trace: Write timing spans to this NDJSON file, or ``otel`` to send
+                them to OpenTelemetry.
+            profile: Print time spent per pipeline stage to stderr; ``cpu``,
+                ``sample`` and/or ``alloc`` (comma-separated) profile the command
+                with cProfile, a stack sampler or tracemalloc instead.
+            profile_out: Path prefix of the profiler files (default
+                ``abersetz-profile``: ``.pstats``, ``.collapsed``, ``.tracemalloc``).
+            metrics: Write Prometheus-format counters for the run to this file.
             verbose: Enable debug log output.
         """
         _configure_logging(verbose)
+        with _instrumented(trace, profile, metrics, profile_out):
+            self._translate_text(
+                to_lang, text, engine, from_lang, chunk_size, temperature, job, stream, budget
+            )
+
+    def _translate_text(
+        self,
+        to_lang: str,
+        text: str,
+        engine: str | None,
+        from_lang: str | None,
+        chunk_size: int | None,
+        temperature: float | None,
+        job: str | None,
+        stream: bool,
+        budget: float | None,
+    ) -> None:
+        """Body of ``tr``, run inside the tracing session."""
+        pipeline = _pipeline()
 
         if job:
             from .job import load_job
 
             loaded = load_job(job)
             for entry in loaded.resolved_entries():
-                opts = TranslatorOptions(
+                opts = pipeline.TranslatorOptions(
                     engine=entry.selector,
                     from_lang=entry.from_lang or from_lang,
                     to_lang=entry.to_lang or to_lang,
@@ -581,25 +820,27 @@ class AbersetzCLI:
                 )
                 try:
                     out = translate_string(text, opts)
-                except PipelineError as error:
+                except pipeline.PipelineError as error:
                     console.print(f"[red]{entry.selector}: {error}[/red]")
                     continue
                 print(f"{entry.selector}\t{out}")
             return
 
-        opts = TranslatorOptions(
+        opts = pipeline.TranslatorOptions(
             engine=normalize_selector(engine) if engine else engine,
             from_lang=from_lang,
             to_lang=to_lang,
             chunk_size=chunk_size,
             temperature=temperature,
+            budget=budget,
         )
+        streaming: dict[str, Any] = {"on_text": _write_stdout} if stream else {}
         try:
-            output = translate_string(text, opts)
-        except PipelineError as error:
+            output = translate_string(text, opts, **streaming)
+        except pipeline.PipelineError as error:
             console.print(f"[red]{error}[/red]")
             raise
-        print(output)
+        print("" if stream else output)  # a streamed translation only needs its newline
 
     def config(self) -> ConfigCommands:
         """Access configuration helper subcommands.
@@ -690,6 +931,8 @@ class AbersetzCLI:
         if not entries:
             console.print("No matching engines, providers, or models found.")
             return
+        from rich.table import Table
+
         table = Table(title="abersetz catalog", show_header=True, header_style="bold cyan")
         table.add_column("Selector", style="white")
         table.add_column("Kind", style="cyan")
@@ -767,6 +1010,88 @@ class AbersetzCLI:
         _render_validation_entries(results)
         return results
 
+    def bench(
+        self,
+        engine: str | None = None,
+        *,
+        files: int = 20,
+        size: int = 4000,
+        format: str = "md",
+        concurrency: int | str | Sequence[int] = (1, 4, 8),
+        passes: int = 1,
+        mode: str = "path",
+        to_lang: str = "de",
+        seed: int = 0,
+        report: str | None = None,
+    ) -> None:
+        """Benchmark pipeline throughput offline on a synthetic corpus.
+
+        Uses the ``mk::`` mock engine unless another selector is given, and
+        prints throughput, engine-call latency percentiles, pipeline overhead per
+        chunk, cache hit rate and peak RSS for every concurrency level and pass.
+
+        Args:
+            engine: Engine selector (default 'mk::latency=20ms,jitter=5ms').
+            files: Number of synthetic documents.
+            size: Approximate characters per document.
+            format: Corpus format: 'txt', 'md' or 'html'.
+            concurrency: Concurrency levels (engine slots), e.g. '1,4,8'.
+            passes: Passes per level; passes after the first show the cached path.
+            mode: 'path' drives translate_path over the corpus, 'string' translate_string per file.
+            to_lang: Target language code.
+            seed: Seed for the corpus text.
+            report: Optional path for a JSON report of all passes.
+        """
+        from dataclasses import asdict
+
+        from .bench import DEFAULT_ENGINE, run_bench
+
+        levels: tuple[int, ...]
+        if isinstance(concurrency, int):
+            levels = (concurrency,)
+        else:
+            parts = _parse_patterns(concurrency)  # type: ignore[arg-type]
+            levels = tuple(int(level) for level in parts)
+        rows = run_bench(
+            engine or DEFAULT_ENGINE,
+            files=files,
+            size=size,
+            fmt=format,
+            concurrency=levels,
+            passes=passes,
+            mode=mode,
+            to_lang=to_lang,
+            seed=seed,
+        )
+        from rich.table import Table
+
+        table = Table(
+            title="abersetz bench (times in ms)", show_header=True, header_style="bold cyan"
+        )
+        columns: tuple[str, ...] = ("conc", "pass", "chunks", "fail", "char/s", "chunk/s")
+        columns += ("p50", "p95", "p99", "ovh/chunk", "hits", "RSS MB")
+        for column in columns:
+            table.add_column(column, justify="right")
+        for row in rows:
+            table.add_row(
+                str(row.concurrency),
+                str(row.pass_index + 1),
+                str(row.chunks),
+                str(row.failed),
+                f"{row.chars_per_second:,.0f}",
+                f"{row.chunks_per_second:.1f}",
+                f"{row.p50_ms:.1f}",
+                f"{row.p95_ms:.1f}",
+                f"{row.p99_ms:.1f}",
+                f"{row.overhead_ms_per_chunk:.2f}",
+                f"{row.cache_hit_rate:.0%}",
+                "-" if row.peak_rss_mb is None else f"{row.peak_rss_mb:.0f}",
+            )
+        console.print(table)
+        if report:
+            payload = {"engine": engine or DEFAULT_ENGINE, "passes": [asdict(row) for row in rows]}
+            Path(report).write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
     def discover(
         self,
         *,
@@ -798,7 +1123,9 @@ def abtr_main() -> None:
     """Direct translation CLI.
 
     A shortcut command. `abtr es file.txt` is exactly the same as `abersetz tr es file.txt`."""
+    from .cli_fast import handle_import_profile
 
+    handle_import_profile(("tr",))
     # Create CLI instance and call tr method directly
     cli = AbersetzCLI()
 
@@ -24,10 +24,23 @@ def handle_version() -> None:
         sys.exit(0)
 
 
+def handle_import_profile(command: tuple[str, ...] = ()) -> None:
+    """Handle --import-profile by re-running the command under ``-X importtime``.
+
+    The command runs as usual in a child interpreter; afterwards an import-time breakdown goes to stderr.
+    ``command`` is put before the arguments, so ``abtr`` can re-run itself as ``abersetz tr``."""
+    if "--import-profile" in sys.argv:
+        from .import_profile import run
+
+        sys.exit(run([*command, *(arg for arg in sys.argv[1:] if arg != "--import-profile")]))
+
+
 def main() -> None:
     """Fast CLI entry point that defers heavy imports.
 
     Checks the flags, and if it's a real command, hands off to the main `fire`-based CLI."""
+    handle_import_profile()
+
     # Check for version flag first with minimal imports
     handle_version()
 
@@ -44,6 +44,7 @@ class Defaults:
     to_lang: str = "en"
     chunk_size: int = 1200
     html_chunk_size: int = 1800
+    termbase: str | None = None
 
     def __setattr__(self, name: str, value: Any) -> None:  # noqa: D401 - dataclass override
         if name == "engine" and isinstance(value, str):
@@ -51,13 +52,16 @@ class Defaults:
         object.__setattr__(self, name, value)
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "engine": self.engine,
             "from_lang": self.from_lang,
             "to_lang": self.to_lang,
             "chunk_size": self.chunk_size,
             "html_chunk_size": self.html_chunk_size,
         }
+        if self.termbase:
+            data["termbase"] = self.termbase
+        return data
 
     @classmethod
     def from_dict(cls, raw: Mapping[str, Any] | None) -> Defaults:
@@ -70,6 +74,7 @@ class Defaults:
             to_lang=str(raw.get("to_lang", defaults.to_lang)),
             chunk_size=int(raw.get("chunk_size", defaults.chunk_size)),
             html_chunk_size=int(raw.get("html_chunk_size", defaults.html_chunk_size)),
+            termbase=str(raw["termbase"]) if raw.get("termbase") else None,
         )
 
 
@@ -148,6 +153,35 @@ class EngineConfig:
         )
 
 
+@dataclass(slots=True)
+class Price:
+    """What an engine or model costs, in dollars per million units.
+
+    Token-billed models set ``input`` and ``output``; character-billed
+    providers (DeepL, Microsoft) set ``chars``."""
+
+    input: float = 0.0
+    output: float = 0.0
+    chars: float = 0.0
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, billed_chars: int) -> float:
+        """Return the dollar cost of the given usage."""
+        return (
+            prompt_tokens * self.input + completion_tokens * self.output + billed_chars * self.chars
+        ) / 1_000_000
+
+    def to_dict(self) -> dict[str, float]:
+        values = {"input": self.input, "output": self.output, "chars": self.chars}
+        return {key: value for key, value in values.items() if value}
+
+    @classmethod
+    def from_dict(cls, raw: Mapping[str, Any]) -> Price:
+        unknown = set(raw) - {"input", "output", "chars"}
+        if unknown:
+            raise ValueError(f"Unknown price field(s): {', '.join(sorted(unknown))}")
+        return cls(**{key: float(value) for key, value in raw.items()})
+
+
 @dataclass(slots=True)
 class AbersetzConfig:
     """Aggregate configuration for the toolkit.
@@ -157,13 +191,17 @@ class AbersetzConfig:
     defaults: Defaults = field(default_factory=Defaults)
     credentials: dict[str, Credential] = field(default_factory=dict)
     engines: dict[str, EngineConfig] = field(default_factory=dict)
+    pricing: dict[str, Price] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        data: dict[str, Any] = {
             "defaults": self.defaults.to_dict(),
             "credentials": {key: cred.to_dict() for key, cred in self.credentials.items()},
             "engines": {key: engine.to_dict() for key, engine in self.engines.items()},
         }
+        if self.pricing:
+            data["pricing"] = {key: price.to_dict() for key, price in self.pricing.items()}
+        return data
 
     @classmethod
     def from_dict(cls, raw: Mapping[str, Any]) -> AbersetzConfig:
@@ -176,7 +214,10 @@ class AbersetzConfig:
             key: EngineConfig.from_dict(key, value)
             for key, value in dict(raw.get("engines", {})).items()
         }
-        return cls(defaults=defaults, credentials=credentials, engines=engines)
+        pricing = {
+            key: Price.from_dict(value) for key, value in dict(raw.get("pricing", {})).items()
+        }
+        return cls(defaults=defaults, credentials=credentials, engines=engines, pricing=pricing)
 
 
 DEFAULT_CONFIG_DICT: dict[str, Any] = {
@@ -348,6 +389,7 @@ __all__ = [
     "CredentialLike",
     "Defaults",
     "EngineConfig",
+    "Price",
     "config_dir",
     "config_path",
     "load_config",
@@ -10,6 +10,7 @@ from .engine_catalog import (
     normalize_selector,
     resolve_engine_reference,
 )
+from .glossary import DEFAULT_LIMIT as DEFAULT_GLOSSARY_LIMIT
 from .openai_lite import OpenAI
 
 # Import all engine classes and common components from providers
@@ -24,9 +25,11 @@ from .providers import (
     LmstudioEngine,
     LocalGgufEngine,
     LocalMlxEngine,
+    MockEngine,
     TranslatorsEngine,
 )
 from .providers.mlx import _resolve_mthy_language
+from .providers.mock import MockSpec
 from .selector import Selector, is_new_syntax, parse_selector
 
 # Re-export for compatibility
@@ -78,6 +81,7 @@ def _build_llm_engine(
         model=model,
         temperature=temp,
         static_prolog=static_prolog,
+        glossary_limit=_glossary_limit({**options, **settings}),
     )
 
 
@@ -95,6 +99,41 @@ def _select_profile(engine_cfg: EngineConfig, variant: str | None) -> Mapping[st
     return profiles[profile_name]
 
 
+def _prompt_cache_setting(prompt_cache: int | None, options: Mapping[str, Any]) -> int | None:
+    """Return the prompt-cache size in MiB (``0`` disables) or ``None`` for the engine default."""
+    raw = prompt_cache if prompt_cache is not None else options.get("prompt_cache")
+    return None if raw is None else int(raw)
+
+
+def _guardrail_settings(options: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the local-generation guardrail kwargs configured in ``options``."""
+    expansion = options.get("expansion")
+    return {
+        "expansion": None if expansion is None else float(expansion),
+        "repetition_guard": bool(options.get("repetition_guard", True)),
+    }
+
+
+def _glossary_limit(options: Mapping[str, Any]) -> int:
+    """Return the ``glossary_limit`` option: most vocabulary terms per prompt, 0 for all."""
+    return int(options.get("glossary_limit", DEFAULT_GLOSSARY_LIMIT))
+
+
+def _draft_settings(draft: str | None, options: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the speculative-decoding kwargs: draft model and tokens per step."""
+    draft_tokens = options.get("draft_tokens")
+    settings: dict[str, Any] = {"draft": draft or options.get("draft") or None}
+    if draft_tokens is not None:
+        settings["draft_tokens"] = int(draft_tokens)
+    return settings
+
+
+def _prompt_lookup_setting(prompt_lookup: int | None, options: Mapping[str, Any]) -> int:
+    """Return the prompt-lookup draft length (``0`` disables prompt-lookup decoding)."""
+    raw = prompt_lookup if prompt_lookup is not None else options.get("prompt_lookup", 0)
+    return int(raw or 0)
+
+
 def _local_engine_config(config: AbersetzConfig, family: str) -> EngineConfig:
     """Return the configured block for a local family or a bare default."""
     return config.engines.get(family) or EngineConfig(name=family)
@@ -110,12 +149,19 @@ def _create_from_selector(
     n_ctx: int | None,
     max_tokens: int | None,
     n_threads: int | None,
+    slots: int | None = None,
+    prompt_cache: int | None = None,
+    workers: int | None = None,
+    warmup: bool | None = None,
+    draft: str | None = None,
+    prompt_lookup: int | None = None,
 ) -> Engine:
     """Build an engine from a parsed ``engine[/subvariant]::provider`` selector.
 
     Delegates ``tr``/``dt``/``ll`` to the legacy factory (which already knows how
     to read provider/profile config) and builds the model-path engines
-    (``lm``/``ml``/``gg``) directly so the provider can carry a model id or path."""
+    (``lm``/``ml``/``gg``) directly so the provider can carry a model id or path.
+    ``mk`` builds the offline mock engine from its ``key=value`` provider spec."""
     engine = sel.engine
     provider = sel.provider
 
@@ -138,6 +184,9 @@ def _create_from_selector(
             options=options,
         )
         return LmstudioEngine(cfg, temperature=temperature)
+    if engine == "mk":
+        spec = MockSpec.parse(provider)
+        return MockEngine(spec, _local_engine_config(config, "mock"), slots=slots)
     if engine in {"ml", "gg"}:
         family = sel.family
         engine_cfg = _local_engine_config(config, family)
@@ -150,9 +199,19 @@ def _create_from_selector(
         max_tokens_val = (
             max_tokens if max_tokens is not None else int(options.get("max_tokens", 2048))
         )
+        prompt_cache_val = _prompt_cache_setting(prompt_cache, options)
+        warmup_val = warmup if warmup is not None else bool(options.get("warmup", False))
         if engine == "ml":
             return LocalMlxEngine(
-                family, engine_cfg, str(model_path or ""), max_tokens=max_tokens_val
+                family,
+                engine_cfg,
+                str(model_path or ""),
+                max_tokens=max_tokens_val,
+                prompt_cache=prompt_cache_val != 0,
+                warmup=warmup_val,
+                **_guardrail_settings(options),
+                glossary_limit=_glossary_limit(options),
+                **_draft_settings(draft, options),
             )
         temp_val = (
             temperature if temperature is not None else float(options.get("temperature", 0.0))
@@ -167,6 +226,8 @@ def _create_from_selector(
             if n_threads is not None
             else (int(n_threads_raw) if n_threads_raw is not None else None)
         )
+        slots_val = slots if slots is not None else int(options.get("slots", 1))
+        workers_val = workers if workers is not None else int(options.get("workers", 1))
         return LocalGgufEngine(
             family,
             engine_cfg,
@@ -176,6 +237,14 @@ def _create_from_selector(
             n_gpu_layers=n_gpu_layers_val,
             n_ctx=n_ctx_val,
             n_threads=n_threads_val,
+            slots=slots_val,
+            prompt_cache_mb=prompt_cache_val or 0,
+            workers=workers_val,
+            warmup=warmup_val,
+            **_guardrail_settings(options),
+            glossary_limit=_glossary_limit(options),
+            **_draft_settings(draft, options),
+            prompt_lookup=_prompt_lookup_setting(prompt_lookup, options),
         )
     raise EngineError(f"Unsupported engine code '{engine}' in selector '{sel.raw}'")
 
@@ -190,6 +259,12 @@ def create_engine(
     n_ctx: int | None = None,
     max_tokens: int | None = None,
     n_threads: int | None = None,
+    slots: int | None = None,
+    prompt_cache: int | None = None,
+    workers: int | None = None,
+    warmup: bool | None = None,
+    draft: str | None = None,
+    prompt_lookup: int | None = None,
 ) -> Engine:
     """Factory that builds the requested engine supporting short aliases."""
     # New ``engine[/subvariant]::provider`` grammar is handled separately; the
@@ -206,6 +281,12 @@ def create_engine(
             n_ctx=n_ctx,
             max_tokens=max_tokens,
             n_threads=n_threads,
+            slots=slots,
+            prompt_cache=prompt_cache,
+            workers=workers,
+            warmup=warmup,
+            draft=draft,
+            prompt_lookup=prompt_lookup,
         )
     normalized = normalize_selector(selector) or selector
     base, variant = resolve_engine_reference(normalized)
@@ -319,9 +400,19 @@ def create_engine(
             if n_threads is not None
             else (int(n_threads_raw) if n_threads_raw is not None else None)
         )
+        prompt_cache_val = _prompt_cache_setting(prompt_cache, options)
+        warmup_val = warmup if warmup is not None else bool(options.get("warmup", False))
         if backend == "mlx":
             return LocalMlxEngine(
-                base, engine_cfg, str(model_path or ""), max_tokens=max_tokens_val
+                base,
+                engine_cfg,
+                str(model_path or ""),
+                max_tokens=max_tokens_val,
+                prompt_cache=prompt_cache_val != 0,
+                warmup=warmup_val,
+                **_guardrail_settings(options),
+                glossary_limit=_glossary_limit(options),
+                **_draft_settings(draft, options),
             )
         if backend == "gguf":
             return LocalGgufEngine(
@@ -333,6 +424,14 @@ def create_engine(
                 n_gpu_layers=n_gpu_layers_val,
                 n_ctx=n_ctx_val,
                 n_threads=n_threads_val,
+                slots=slots if slots is not None else int(options.get("slots", 1)),
+                prompt_cache_mb=prompt_cache_val or 0,
+                workers=workers if workers is not None else int(options.get("workers", 1)),
+                warmup=warmup_val,
+                **_guardrail_settings(options),
+                glossary_limit=_glossary_limit(options),
+                **_draft_settings(draft, options),
+                prompt_lookup=_prompt_lookup_setting(prompt_lookup, options),
             )
         raise EngineError(f"Unsupported backend '{backend}' for engine '{normalized}'")
     raise EngineError(f"Unsupported engine '{base}'")
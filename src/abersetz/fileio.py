@@ -0,0 +1,182 @@
+"""Filesystem helpers for reading sources and writing translated artefacts.
+
+Sources are read exactly once, reusing the size recorded during discovery
+instead of a separate ``stat``. Outputs are written atomically: content
+goes to a temp file next to the destination and is moved into place with
+``os.replace``. An interrupted run
+therefore never leaves a half-written translation behind — which matters most
+with ``write_over``, where the destination *is* the source. ``OutputWriter``
+remembers which directories it already created and can push writes onto a
+background thread so disk I/O overlaps with the next file's engine calls."""
+# this_file: src/abersetz/fileio.py
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import queue
+import tempfile
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@functools.cache
+def _default_file_mode() -> int:
+    """Return the mode ``Path.write_text`` would give a new file (mkstemp uses 0600).
+
+    The umask is read from ``/proc/self/status`` rather than set and restored
+    with ``os.umask``, which would briefly change it for every thread."""
+    umask = 0o022
+    with contextlib.suppress(OSError, ValueError), open("/proc/self/status") as handle:
+        for line in handle:
+            if line.startswith("Umask:"):
+                umask = int(line.split(":", 1)[1], 8)
+                break
+    return 0o666 & ~umask
+
+
+@dataclass(slots=True, frozen=True)
+class SourceFile:
+    """A discovered input file plus the metadata seen while discovering it."""
+
+    path: Path
+    size: int | None = None
+    mtime_ns: int | None = None
+
+
+def read_source(source: SourceFile) -> tuple[str, int]:
+    """Read ``source`` as UTF-8 text and return ``(text, size_in_bytes)``.
+
+    Opens the file once; when discovery did not record a size it comes from
+    ``fstat`` on the open descriptor. Newlines are normalised like
+    ``Path.read_text`` does."""
+    with open(source.path, "rb") as handle:
+        size = source.size if source.size is not None else os.fstat(handle.fileno()).st_size
+        text = handle.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, size
+
+
+def atomic_write_text(path: Path, content: str, *, encoding: str = "utf-8") -> None:
+    """Write ``content`` to ``path`` via a sibling temp file and ``os.replace``.
+
+    Readers see either the old file or the complete new one, never a partial
+    write. An existing destination keeps its permission bits."""
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = _default_file_mode()
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as handle:
+            handle.write(content)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+class OutputWriter:
+    """Write translated files atomically, optionally from a background thread.
+
+    Directory creation is cached so each output directory is ``mkdir``-ed once
+    per run. With ``background=True`` writes are queued and drained by a single
+    worker thread; :meth:`close` waits for pending writes and re-raises the first
+    failure. The queue is bounded so a slow disk applies back-pressure instead of
+    buffering an entire tree of translations in memory."""
+
+    def __init__(self, *, background: bool = False, max_pending: int = 64) -> None:
+        self._created: set[Path] = set()
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+        self._queue: queue.Queue[Callable[[], None] | None] | None = None
+        self._thread: threading.Thread | None = None
+        if background:
+            self._queue = queue.Queue(maxsize=max(max_pending, 1))
+            self._thread = threading.Thread(
+                target=self._drain, name="abersetz-output-writer", daemon=True
+            )
+            self._thread.start()
+
+    def __enter__(self) -> OutputWriter:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close(raise_errors=exc_type is None)
+
+    def ensure_dir(self, directory: Path) -> None:
+        """Create ``directory`` (and parents) unless this writer already did."""
+        with self._lock:
+            if directory in self._created:
+                return
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._created.add(directory)
+
+    def write_text(self, path: Path, content: str) -> None:
+        """Atomically write ``content`` to ``path``, creating its directory."""
+        self._submit(lambda: self._write_text(path, content))
+
+    def write_json(self, path: Path, data: Mapping[str, str]) -> None:
+        """Serialise ``data`` as indented JSON and write it to ``path``.
+
+        Serialisation happens on the writer thread when running in the background."""
+        snapshot = dict(data)
+        self._submit(
+            lambda: self._write_text(path, json.dumps(snapshot, indent=2, ensure_ascii=False))
+        )
+
+    def after_writes(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` once every write submitted so far has landed.
+
+        In the background it runs on the writer thread, and not at all once a
+        write has failed; otherwise it runs immediately."""
+        self._submit(callback)
+
+    def close(self, *, raise_errors: bool = True) -> None:
+        """Flush pending writes and stop the background worker, if any."""
+        if self._queue is not None and self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._queue = None
+            self._thread = None
+        if raise_errors and self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write_text(self, path: Path, content: str) -> None:
+        self.ensure_dir(path.parent)
+        atomic_write_text(path, content)
+
+    def _submit(self, job: Callable[[], None]) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        if self._queue is None:
+            job()
+            return
+        self._queue.put(job)
+
+    def _drain(self) -> None:
+        assert self._queue is not None
+        jobs = self._queue
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            if self._error is not None:
+                continue  # keep draining so producers never block on a dead writer
+            try:
+                job()
+            except BaseException as exc:  # surfaced from close()
+                self._error = exc
+
+
+__all__ = ["OutputWriter", "SourceFile", "atomic_write_text", "read_source"]
@@ -0,0 +1,158 @@
+"""Pick the glossary terms that occur in a chunk.
+
+Prompts used to carry the whole vocabulary, so prompt tokens grew with the
+glossary whether or not a chunk used any of it. A :class:`Glossary` indexes
+source terms in a character trie and finds, in one pass over a chunk, the
+terms it mentions; :func:`relevant_terms` turns those hits into the capped
+``{term: translation}`` map an engine puts in its prompt.
+
+Matching is deliberately loose, because an extra term costs a few tokens
+while a missed one costs consistency:
+
+* case is ignored and any whitespace matches any whitespace;
+* in scripts written with spaces, a term must start at a word boundary and
+  may be followed by up to :data:`MAX_SUFFIX` more letters (``widget`` finds
+  ``widgets``); up to :data:`STEM_TRIM` final letters of longer words are
+  optional too (``company`` finds ``companies``, ``Katze`` finds ``Katzen``);
+* in CJK and other unspaced scripts a term matches anywhere."""
+# this_file: src/abersetz/glossary.py
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+DEFAULT_LIMIT = 40
+"""Most terms injected into one prompt; ``0`` ships the whole vocabulary."""
+MAX_SUFFIX = 4
+STEM_TRIM = 2
+_MIN_STEM = 4
+_TERMS = ""  # trie key holding the terms that end at a node; never a folded character
+
+
+def _fold(char: str) -> str:
+    if char.isspace():
+        return " "
+    lowered = char.lower()
+    return lowered if len(lowered) == 1 else char
+
+
+def _spaced(char: str) -> bool:
+    """Whether ``char`` is a letter or digit of a script that separates words by spaces."""
+    return char.isalnum() and ord(char) < 0x2E80
+
+
+def normalize(term: str) -> str:
+    """Return the key a term is indexed under: folded, with single spaces, trimmed."""
+    return " ".join("".join(_fold(char) for char in term).split())
+
+
+def _stem(key: str) -> str:
+    last = key.rsplit(" ", 1)[-1]
+    if len(last) <= _MIN_STEM or not all(_spaced(char) for char in last):
+        return key
+    return key[: -min(STEM_TRIM, len(last) - _MIN_STEM)]
+
+
+class Glossary:
+    """Trie of source terms that grows as terms are added.
+
+    An engine keeps one for its lifetime and calls :meth:`update` with each
+    request's vocabulary; terms already indexed cost one set lookup."""
+
+    def __init__(self, terms: Iterable[str] = ()) -> None:
+        self._root: dict[str, Any] = {}
+        self._indexed: set[str] = set()
+        self._lock = threading.Lock()
+        self.update(terms)
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._indexed
+
+    def update(self, terms: Iterable[str]) -> None:
+        """Index every term of ``terms`` not indexed yet."""
+        new = [term for term in terms if term not in self._indexed]
+        if not new:
+            return
+        with self._lock:
+            for term in new:
+                key = _stem(normalize(term))
+                if not key or term in self._indexed:
+                    continue
+                node = self._root
+                for char in key:
+                    node = node.setdefault(char, {})
+                node.setdefault(_TERMS, []).append(term)
+                self._indexed.add(term)
+
+    def find(self, text: str) -> dict[str, int]:
+        """Return ``{term: hits}`` for the indexed terms in ``text``, in order of first hit."""
+        folded = normalize(text)
+        size = len(folded)
+        hits: dict[str, int] = {}
+        root = self._root
+        for start in range(size):
+            char = folded[start]
+            if char not in root:
+                continue
+            if start and _spaced(char) and _spaced(folded[start - 1]):
+                continue  # not at a word start
+            node = root
+            end = start
+            while end < size:
+                child = node.get(folded[end])
+                if child is None:
+                    break
+                node = child
+                end += 1
+                terms = node.get(_TERMS)
+                if terms and self._ends_word(folded, end):
+                    for term in terms:
+                        hits[term] = hits.get(term, 0) + 1
+        return hits
+
+    @staticmethod
+    def _ends_word(folded: str, end: int) -> bool:
+        if end == len(folded) or not _spaced(folded[end - 1]):
+            return True
+        tail = end
+        while tail < len(folded) and _spaced(folded[tail]):
+            tail += 1
+            if tail - end > MAX_SUFFIX:
+                return False
+        return True
+
+
+def relevant_terms(
+    text: str,
+    voc: Mapping[str, str],
+    *,
+    limit: int = DEFAULT_LIMIT,
+    glossary: Glossary | None = None,
+) -> dict[str, str]:
+    """Return the entries of ``voc`` whose terms occur in ``text``, sorted by term.
+
+    At most ``limit`` entries are kept, the most frequent first (ties go to
+    the earlier term); ``limit=0`` returns all of ``voc``. ``glossary`` is the
+    caller's long-lived index; without one a throwaway index is built."""
+    if not voc:
+        return {}
+    if limit <= 0:
+        return dict(voc)
+    if glossary is None:
+        glossary = Glossary(voc)
+    else:
+        glossary.update(voc)
+    hits = glossary.find(text)
+    order = {term: position for position, term in enumerate(hits)}
+    ranked = sorted(
+        (term for term in hits if term in voc), key=lambda term: (-hits[term], order[term])
+    )
+    return {term: voc[term] for term in sorted(ranked[:limit])}
+
+
+__all__ = ["DEFAULT_LIMIT", "MAX_SUFFIX", "STEM_TRIM", "Glossary", "normalize", "relevant_terms"]
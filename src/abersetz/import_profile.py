@@ -0,0 +1,99 @@
+"""Import-time breakdown for ``abersetz --import-profile``.
+
+Runs the rest of the command line in a child interpreter started with
+``python -X importtime`` and summarises the report CPython writes to stderr:
+the total import time and the slowest imports with their cumulative and self
+cost, indented by nesting depth. The command's own output passes through."""
+# this_file: src/abersetz/import_profile.py
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import TextIO
+
+IMPORT_PREFIX = "import time:"
+DEFAULT_TOP = 15
+
+
+@dataclass(slots=True)
+class ImportRecord:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(text: str) -> tuple[list[ImportRecord], list[str]]:
+    """Split ``-X importtime`` stderr into import records and the remaining lines."""
+    records: list[ImportRecord] = []
+    other: list[str] = []
+    for line in text.splitlines():
+        if not line.startswith(IMPORT_PREFIX):
+            other.append(line)
+            continue
+        fields = line[len(IMPORT_PREFIX) :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        name = fields[2]
+        module = name.lstrip(" ")
+        depth = max(len(name) - len(module) - 1, 0) // 2
+        records.append(ImportRecord(module, int(fields[0]), int(fields[1]), depth))
+    return records, other
+
+
+def total_us(records: Iterable[ImportRecord]) -> int:
+    """Return the import time of the whole process (sum of the outermost imports)."""
+    return sum(record.cumulative_us for record in records if record.depth == 0)
+
+
+def cumulative_us(records: Iterable[ImportRecord], module: str) -> int | None:
+    """Return the cumulative import time of ``module``, or ``None`` if it was not imported."""
+    return next((record.cumulative_us for record in records if record.module == module), None)
+
+
+def format_report(records: Sequence[ImportRecord], top: int = DEFAULT_TOP) -> str:
+    """Return the total and the ``top`` slowest imports two levels deep."""
+    shallow = [record for record in records if record.depth <= 1]
+    slowest = sorted(shallow, key=lambda record: record.cumulative_us, reverse=True)[:top]
+    lines = [
+        f"import time: {total_us(records) / 1000:.1f} ms total, {len(records)} modules",
+        f"{'cumulative':>12} {'self':>10}  module",
+    ]
+    for record in slowest:
+        lines.append(
+            f"{record.cumulative_us / 1000:>9.1f} ms {record.self_us / 1000:>7.1f} ms  "
+            f"{'  ' * record.depth}{record.module}"
+        )
+    return "\n".join(lines)
+
+
+def run(argv: Sequence[str], *, top: int = DEFAULT_TOP, stream: TextIO | None = None) -> int:
+    """Run ``abersetz *argv`` under ``-X importtime``, print the breakdown, return its exit code."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "abersetz", *argv],
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    records, other = parse_importtime(completed.stderr)
+    out = stream or sys.stderr
+    for line in other:
+        print(line, file=out)
+    print(format_report(records, top), file=out)
+    return completed.returncode
+
+
+__all__ = [
+    "DEFAULT_TOP",
+    "ImportRecord",
+    "cumulative_us",
+    "format_report",
+    "parse_importtime",
+    "run",
+    "total_us",
+]
@@ -84,6 +84,7 @@ def _engine_entries() -> list[CatalogEntry]:
         CatalogEntry("ll::", "engine", notes="OpenAI-compatible LLM API"),
         CatalogEntry("ml::", "engine", notes="local MLX model"),
         CatalogEntry("gg::", "engine", notes="local GGUF model"),
+        CatalogEntry("mk::", "engine", notes="offline mock (benchmarks)"),
     ]
 
 
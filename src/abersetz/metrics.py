@@ -0,0 +1,405 @@
+"""In-process Prometheus-style metrics.
+
+The pipeline updates a few counters, one gauge and one histogram in the
+process-wide :data:`REGISTRY` as it runs, whether it is driven by the CLI,
+:func:`~abersetz.pipeline.translate_string` or the Prefect flow. Updating a
+metric is a dict lookup under a lock, so they are always on.
+
+Read them with :meth:`Registry.exposition` (Prometheus text format 0.0.4),
+serve them with :func:`start_http_server`, or write them to a file with
+:meth:`Registry.write` (what ``--metrics PATH`` does; the format suits
+node_exporter's textfile collector)."""
+# this_file: src/abersetz/metrics.py
+
+from __future__ import annotations
+
+import contextlib
+import math
+import os
+import tempfile
+import threading
+from collections.abc import Iterator, Sequence
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Chunk latency buckets in seconds, from cache-speed web APIs to local LLMs."""
+
+LabelKey = tuple[str, ...]
+M = TypeVar("M", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelKey:
+        if labels.keys() != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} takes labels {list(self.labelnames)}, got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelKey, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key, strict=True)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing total per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, /, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError(f"{self.name}: counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._labels(key)} {_number(value)}" for key, value in values]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. a queue depth."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, /, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, /, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, /, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative ``le`` buckets, plus their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[LabelKey, list[int]] = {}
+        self._sums: dict[LabelKey, float] = {}
+
+    def observe(self, value: float, /, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            snapshot = [
+                (key, list(counts), self._sums[key]) for key, counts in self._counts.items()
+            ]
+        lines: list[str] = []
+        for key, counts, total in sorted(snapshot):
+            running = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                running += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {running}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {running}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+class Registry:
+    """A set of named metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: M) -> M:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def exposition(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric._header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path | str) -> Path:
+        """Atomically write :meth:`exposition` to ``path`` and return it."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(self.exposition())
+            os.replace(tmp, target)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        return target
+
+    def clear(self) -> None:
+        """Drop all recorded values (the metrics stay registered)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+_ENGINE = ("engine", "provider")
+
+ENGINE_REQUESTS = REGISTRY.counter(
+    "abersetz_engine_requests_total",
+    "Engine calls (cache misses) by outcome.",
+    (*_ENGINE, "outcome"),
+)
+CHARS_IN = REGISTRY.counter("abersetz_chars_in_total", "Characters sent to engines.", _ENGINE)
+CHARS_OUT = REGISTRY.counter("abersetz_chars_out_total", "Characters returned by engines.", _ENGINE)
+TOKENS_IN = REGISTRY.counter(
+    "abersetz_tokens_in_total", "Prompt tokens reported by engines.", _ENGINE
+)
+TOKENS_OUT = REGISTRY.counter(
+    "abersetz_tokens_out_total", "Completion tokens reported by engines.", _ENGINE
+)
+BILLED_CHARS = REGISTRY.counter(
+    "abersetz_billed_chars_total",
+    "Characters billed by character-priced engines (DeepL, Microsoft).",
+    _ENGINE,
+)
+COST_DOLLARS = REGISTRY.counter(
+    "abersetz_cost_dollars_total", "Estimated spend from the [pricing] table.", _ENGINE
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "abersetz_cache_lookups_total",
+    "Chunk translation cache lookups by result (hit or miss).",
+    (*_ENGINE, "result"),
+)
+RETRIES = REGISTRY.counter("abersetz_retries_total", "Engine call retries.", _ENGINE)
+RATE_LIMITED = REGISTRY.counter(
+    "abersetz_rate_limited_total",
+    "Engine calls rejected with HTTP 429 or a rate-limit error.",
+    _ENGINE,
+)
+CHUNK_SECONDS = REGISTRY.histogram(
+    "abersetz_chunk_seconds", "Wall time of one engine call, retries included.", _ENGINE
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "abersetz_queue_depth",
+    "Chunks handed to the pipeline's engine stage and not finished yet.",
+    _ENGINE,
+)
+FILES = REGISTRY.counter(
+    "abersetz_files_total", "Files processed by translate_path, by status.", ("status",)
+)
+
+_UNATTRIBUTED = {"engine": "", "provider": ""}
+_labels: ContextVar[dict[str, str]] = ContextVar("abersetz_metric_labels", default=_UNATTRIBUTED)
+
+
+def engine_labels(engine: object) -> dict[str, str]:
+    """Return the ``engine``/``provider`` labels of an engine instance.
+
+    Engines without a ``provider`` attribute are labelled with their family,
+    the part of the name before ``/``; model names and engine specs never
+    become label values, so every label stays a small, fixed set."""
+    name = str(getattr(engine, "name", ""))
+    provider = getattr(engine, "provider", None)
+    if not isinstance(provider, str):
+        provider = name.split("/", 1)[0]
+    return {"engine": name, "provider": provider}
+
+
+@contextlib.contextmanager
+def engine_scope(labels: dict[str, str]) -> Iterator[None]:
+    """Attribute retries and rate limits recorded in the block to ``labels``."""
+    token = _labels.set(labels)
+    try:
+        yield
+    finally:
+        _labels.reset(token)
+
+
+def is_rate_limited(error: BaseException | None) -> bool:
+    """Tell whether ``error`` is an HTTP 429 / rate-limit rejection."""
+    if error is None:
+        return False
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(error, "status_code", None)
+    if status == 429:
+        return True
+    message = str(error).lower()
+    return "429" in message or "too many requests" in message or "rate limit" in message
+
+
+def record_retry(error: BaseException | None) -> None:
+    """Count a retry (and a rate limit, if ``error`` is one) for the current engine."""
+    labels = _labels.get()
+    RETRIES.inc(**labels)
+    if is_rate_limited(error):
+        RATE_LIMITED.inc(**labels)
+
+
+def record_tokens(labels: dict[str, str], prompt: int | None, completion: int | None) -> None:
+    """Add token usage an engine reported for one call."""
+    if prompt:
+        TOKENS_IN.inc(prompt, **labels)
+    if completion:
+        TOKENS_OUT.inc(completion, **labels)
+
+
+def start_http_server(
+    port: int = 9464, host: str = "127.0.0.1", registry: Registry = REGISTRY
+) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` from a daemon thread; call ``shutdown()`` on the result to stop."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.exposition().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="abersetz-metrics", daemon=True).start()
+    return server
+
+
+__all__ = [
+    "BILLED_CHARS",
+    "CACHE_LOOKUPS",
+    "CHARS_IN",
+    "CHARS_OUT",
+    "CHUNK_SECONDS",
+    "CONTENT_TYPE",
+    "COST_DOLLARS",
+    "DEFAULT_BUCKETS",
+    "ENGINE_REQUESTS",
+    "FILES",
+    "QUEUE_DEPTH",
+    "RATE_LIMITED",
+    "REGISTRY",
+    "RETRIES",
+    "TOKENS_IN",
+    "TOKENS_OUT",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "engine_labels",
+    "engine_scope",
+    "is_rate_limited",
+    "record_retry",
+    "record_tokens",
+    "start_http_server",
+]
@@ -3,6 +3,8 @@
 
 from __future__ import annotations
 
+import json
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Any
 
@@ -37,26 +39,86 @@ class ChatCompletionResponse:
     usage: dict[str, int] | None = None
 
 
+@dataclass
+class ChoiceDelta:
+    """Represents the incremental message content of a streamed choice."""
+
+    content: str | None = None
+    role: str | None = None
+
+
+@dataclass
+class ChatCompletionChunkChoice:
+    """Represents one choice in a streamed chat completion chunk."""
+
+    delta: ChoiceDelta
+    index: int
+    finish_reason: str | None = None
+
+
+@dataclass
+class ChatCompletionChunk:
+    """Represents one server-sent event of a streamed chat completion."""
+
+    choices: list[ChatCompletionChunkChoice]
+    id: str
+    model: str
+    usage: dict[str, int] | None = None
+
+
+def _parse_chunk(data: dict[str, Any], model: str) -> ChatCompletionChunk:
+    choices = [
+        ChatCompletionChunkChoice(
+            delta=ChoiceDelta(
+                content=(choice.get("delta") or {}).get("content"),
+                role=(choice.get("delta") or {}).get("role"),
+            ),
+            index=choice.get("index", 0),
+            finish_reason=choice.get("finish_reason"),
+        )
+        for choice in data.get("choices", [])
+    ]
+    return ChatCompletionChunk(
+        choices=choices,
+        id=data.get("id", ""),
+        model=data.get("model", model),
+        usage=data.get("usage"),
+    )
+
+
+def _note_retry(retry_state: Any) -> None:
+    # Imported lazily: this module must stay importable without the engines.
+    from .providers.base import note_retry
+
+    note_retry(retry_state)
+
+
 class ChatCompletions:
     """Chat completions API interface."""
 
     def __init__(self, client: OpenAI):
         self.client = client
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, max=10))
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, max=10),
+        before_sleep=_note_retry,
+    )
     def create(
         self, model: str, messages: list[dict[str, str]], temperature: float = 0.7, **kwargs: Any
-    ) -> ChatCompletionResponse:
+    ) -> Any:
         """Create a chat completion.
 
         Args:
             model: The model to use for completion
             messages: List of message dicts with 'role' and 'content' keys
             temperature: Sampling temperature
-            **kwargs: Additional parameters passed to the API
+            **kwargs: Additional parameters passed to the API; ``stream=True``
+                returns an iterator of ``ChatCompletionChunk`` instead
 
         Returns:
-            ChatCompletionResponse object compatible with OpenAI SDK
+            ChatCompletionResponse object compatible with OpenAI SDK, or an
+            iterator of ChatCompletionChunk objects when streaming
         """
         url = f"{self.client.base_url}/chat/completions"
 
@@ -67,6 +129,10 @@ class ChatCompletions:
             "Content-Type": "application/json",
         }
 
+        if payload.get("stream"):
+            # Not retried: a half-delivered reply cannot be replayed transparently.
+            return self._stream(url, payload, headers, model)
+
         # Use httpx for the request
         with httpx.Client(timeout=60.0) as client:
             response = client.post(url, json=payload, headers=headers)
@@ -95,6 +161,23 @@ class ChatCompletions:
             usage=data.get("usage"),
         )
 
+    def _stream(
+        self, url: str, payload: dict[str, Any], headers: dict[str, str], model: str
+    ) -> Iterator[ChatCompletionChunk]:
+        """Yield chunks from an OpenAI-style server-sent event stream."""
+        with (
+            httpx.Client(timeout=60.0) as client,
+            client.stream("POST", url, json=payload, headers=headers) as response,
+        ):
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue  # blank separators, comments and event names
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    return
+                yield _parse_chunk(json.loads(data), model)
+
 
 class OpenAI:
     """Lightweight OpenAI client - drop-in replacement for the official SDK.
@@ -131,5 +214,8 @@ __all__ = [
     "ChatCompletionResponse",
     "ChatCompletionChoice",
     "ChatCompletionMessage",
+    "ChatCompletionChunk",
+    "ChatCompletionChunkChoice",
+    "ChoiceDelta",
     "Chat",
 ]
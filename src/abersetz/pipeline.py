@@ -5,17 +5,33 @@ The brain of the operation. This takes a file or directory, figures out what tex
 
 from __future__ import annotations
 
+import contextvars
+import dataclasses
+import functools
+import itertools
 import json
 import threading
-from collections.abc import Iterable
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from . import metrics, tracing
+from .checkpoint import JOURNAL_NAME, FileCheckpoint, RunJournal
 from .chunking import TextFormat, chunk_text, detect_format
 from .config import AbersetzConfig, load_config
 from .engine_catalog import normalize_selector
 from .engines import Engine, EngineRequest, EngineResult, create_engine
+from .fileio import OutputWriter, SourceFile, read_source
+from .pricing import Ledger, find_price
+from .providers.base import Usage, reset_retry_count, retry_count
+from .report import STATUS_FAILED, STATUS_OK, STATUS_SKIPPED, RunReport, failed_sources
+from .termbase import TermBase
+from .vocabulary import EMPTY, Vocabulary
+from .walker import iter_files
 
 try:
     from twat_cache.decorators import bcache
@@ -50,12 +66,28 @@ class TranslatorOptions:
     xclude: tuple[str, ...] = tuple()
     dry_run: bool = False
     prolog: dict[str, str] = field(default_factory=dict)
-    initial_voc: dict[str, str] = field(default_factory=dict)
+    initial_voc: Mapping[str, str] = field(default_factory=dict)
     temperature: float | None = None
     n_gpu_layers: int | None = None
     n_ctx: int | None = None
     max_tokens: int | None = None
     n_threads: int | None = None
+    slots: int | None = None
+    prompt_cache: int | None = None
+    workers: int | None = None
+    warmup: bool | None = None
+    draft: str | None = None
+    prompt_lookup: int | None = None
+    background_write: bool = False
+    gitignore: bool = False
+    discovery_workers: int | None = None
+    report: Path | None = None
+    max_failures: int | None = None
+    retry_failed: Path | None = None
+    checkpoint: bool = False
+    resume: bool = False
+    budget: float | None = None
+    termbase: Path | None = None
 
 
 @dataclass(slots=True)
@@ -73,6 +105,17 @@ class TranslationResult:
     source_lang: str = ""
     target_lang: str = ""
     chunk_size: int = 0
+    error: str | None = None
+    status: str = STATUS_OK
+    error_class: str | None = None
+    retries: int = 0
+    seconds: float = 0.0
+    chars: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    billed_chars: int = 0
+    cost: float | None = None
 
 
 class PipelineError(RuntimeError):
@@ -81,38 +124,82 @@ class PipelineError(RuntimeError):
     Catch this if you pass a bad path, lack read permissions, or something breaks catastrophically in the middle of translation."""
 
 
+class SourceReadError(PipelineError):
+    """Raised when a discovered source file cannot be read or decoded."""
+
+
+class FailureLimitExceeded(PipelineError):
+    """Raised when more files failed than ``max_failures`` allows.
+
+    ``results`` holds every outcome recorded before the run stopped."""
+
+    def __init__(self, message: str, results: list[TranslationResult]) -> None:
+        super().__init__(message)
+        self.results = results
+
+
+class BudgetExceeded(PipelineError):
+    """Raised instead of an engine call that would take the run past ``budget``.
+
+    ``results`` holds every outcome recorded before the run stopped; the file
+    that was being translated is among them as failed."""
+
+    def __init__(self, message: str, results: list[TranslationResult] | None = None) -> None:
+        super().__init__(message)
+        self.results = results or []
+
+
 def translate_path(
     path: Path | str,
     options: TranslatorOptions | None = None,
     *,
     config: AbersetzConfig | None = None,
     client: object | None = None,
+    engine: Engine | None = None,
 ) -> list[TranslationResult]:
     """Translate a file or directory tree.
 
-    The main entry point. Resolves paths, merges user options with defaults, finds all matching files, spins up the right engine, and feeds everything through the pipeline."""
+    The main entry point. Resolves paths, merges user options with defaults, finds all matching files, spins up the right engine, and feeds everything through the pipeline.
+    An already built ``engine`` is used as is instead of one created from the options.
+    With a :mod:`~abersetz.tracing` hook installed, the run is traced stage by stage."""
     resolved = Path(path).resolve()
 
-    # Validate input path exists and is accessible
     if not resolved.exists():
         raise PipelineError(f"Path does not exist: {resolved}")
 
-    # Check readability
-    try:
-        if resolved.is_file():
-            # Try to open the file to check read permissions
-            resolved.open("r").close()
-        elif resolved.is_dir():
-            # Try to list directory to check read permissions
-            list(resolved.iterdir())
-    except (PermissionError, OSError) as e:
-        raise PipelineError(f"Cannot read {resolved}: {e}") from e
-
     cfg = config or load_config()
     opts = _merge_defaults(options, cfg)
-    targets = list(_discover_files(resolved, opts))
-    if not targets:
+    with tracing.span("run", mode="path", path=str(resolved), engine=opts.engine) as run_span:
+        results = _translate_tree(resolved, opts, cfg, client, engine)
+        run_span.set(files=len(results), failed=sum(r.error is not None for r in results))
+    return results
+
+
+def _translate_tree(
+    resolved: Path,
+    opts: TranslatorOptions,
+    cfg: AbersetzConfig,
+    client: object | None,
+    engine: Engine | None,
+) -> list[TranslationResult]:
+    # Discovery is lazy: translation starts as soon as the first file is found.
+    discovered = _discover_files(resolved, opts)
+    if tracing.enabled():
+        discovered = _traced_discovery(discovered)
+    try:
+        first = next(discovered, None)
+    except OSError as e:
+        raise PipelineError(f"Cannot read {resolved}: {e}") from e
+    if first is None:
         raise PipelineError(f"No files matched under {resolved}")
+    single_file = first.path == resolved
+    if single_file:
+        # Fail on an unreadable file before paying for engine construction.
+        try:
+            open(first.path, "rb").close()
+        except OSError as e:
+            raise SourceReadError(f"Cannot read {resolved}: {e}") from e
+    targets = itertools.chain([first], discovered)
     engine_selector = normalize_selector(opts.engine or cfg.defaults.engine) or cfg.defaults.engine
     import inspect
 
@@ -128,51 +215,252 @@ def translate_path(
         kwargs["max_tokens"] = opts.max_tokens
     if "n_threads" in sig.parameters and getattr(opts, "n_threads", None) is not None:
         kwargs["n_threads"] = opts.n_threads
-
-    engine = create_engine(engine_selector, cfg, client=client, **kwargs)
+    if "slots" in sig.parameters and getattr(opts, "slots", None) is not None:
+        kwargs["slots"] = opts.slots
+    if "prompt_cache" in sig.parameters and getattr(opts, "prompt_cache", None) is not None:
+        kwargs["prompt_cache"] = opts.prompt_cache
+    if "workers" in sig.parameters and getattr(opts, "workers", None) is not None:
+        kwargs["workers"] = opts.workers
+    if "warmup" in sig.parameters and getattr(opts, "warmup", None) is not None:
+        kwargs["warmup"] = opts.warmup
+    if "draft" in sig.parameters and getattr(opts, "draft", None) is not None:
+        kwargs["draft"] = opts.draft
+    if "prompt_lookup" in sig.parameters and getattr(opts, "prompt_lookup", None) is not None:
+        kwargs["prompt_lookup"] = opts.prompt_lookup
+
+    # Read before the report is (re)opened: both options may name the same file.
+    retry_only = failed_sources(opts.retry_failed) if opts.retry_failed else None
+    if engine is None:
+        with tracing.span("engine_init", selector=engine_selector):
+            engine = create_engine(engine_selector, cfg, client=client, **kwargs)
     results: list[TranslationResult] = []
+    failures = 0
+    ledger = _open_ledger(engine, opts, cfg)
+    ledger_token = _ledger.set(ledger)
 
     # Simple translation without progress bar
-    for file_path in targets:
-        result = _translate_file(file_path, engine, opts, cfg)
-        results.append(result)
+    report = RunReport(opts.report) if opts.report else None
+    # The journal fingerprints the caller's options: a termbase that grew
+    # since an interrupted run must not invalidate its checkpoint.
+    journal = _open_journal(resolved, single_file, opts, cfg)
+    termbase = _open_termbase(opts, cfg)
+    run_opts = _seeded(opts, termbase)
+    seed_token = _termbase_seed.set(_termbase_entries(opts, termbase))
+    try:
+        with OutputWriter(background=opts.background_write) as writer:
+            for source in targets:
+                if retry_only is not None and source.path not in retry_only:
+                    continue
+                result, error = _run_file(source, engine, run_opts, cfg, writer, journal)
+                results.append(result)
+                if termbase is not None and result.status == STATUS_OK:
+                    termbase.record(run_opts.initial_voc, result.voc)
+                if report is not None:
+                    report.add(result)
+                if error is None:
+                    continue
+                # A single requested file still fails loudly; inside a tree the
+                # failure is recorded and the run moves on to the next file.
+                if single_file:
+                    raise error
+                if isinstance(error, BudgetExceeded):
+                    raise BudgetExceeded(str(error), results) from error
+                failures += 1
+                if opts.max_failures is not None and failures > opts.max_failures:
+                    raise FailureLimitExceeded(
+                        f"Stopping after {failures} failed file(s) "
+                        f"(max_failures={opts.max_failures})",
+                        results,
+                    )
+    except BaseException as error:
+        if report is not None:
+            report.close(aborted=f"{type(error).__name__}: {error}")
+        raise
+    finally:
+        _ledger.reset(ledger_token)
+        _termbase_seed.reset(seed_token)
+        if journal is not None:
+            journal.close()
+        if termbase is not None and not opts.dry_run:
+            termbase.save()
+    if report is not None:
+        report.close()
+    _log_speculation(engine)
+    _log_spend(ledger)
 
     return results
 
 
+def _traced_discovery(files: Iterator[SourceFile]) -> Iterator[SourceFile]:
+    """Time each step of the lazy discovery walk as a ``discover`` span."""
+    while True:
+        with tracing.span("discover") as step:
+            source = next(files, None)
+            if source is not None:
+                step.set(path=str(source.path))
+        if source is None:
+            return
+        yield source
+
+
+def _log_speculation(engine: Engine) -> None:
+    """Log the draft acceptance rate of engines that decode speculatively."""
+    speculation = getattr(engine, "speculation", None)
+    if speculation is None or not speculation.drafted:
+        return
+    from loguru import logger
+
+    logger.info(f"{engine.name}: speculative decoding, {speculation.summary()}")
+
+
+def _open_ledger(engine: Engine, opts: TranslatorOptions, cfg: AbersetzConfig) -> Ledger:
+    """Price ``engine`` from the ``[pricing]`` table and start a ledger for this run."""
+    price = find_price(
+        cfg.pricing,
+        _engine_model_name(engine),
+        getattr(engine, "provider", None),
+        engine.name,
+        engine.name.split("/", 1)[0],
+    )
+    if price is None and opts.budget is not None:
+        from loguru import logger
+
+        logger.warning(
+            f"No [pricing] entry matches {engine.name}; the ${opts.budget:g} budget is not enforced"
+        )
+    return Ledger(price, opts.budget)
+
+
+def _open_termbase(opts: TranslatorOptions, cfg: AbersetzConfig) -> TermBase | None:
+    """Load the terminology base of this run's language pair, if one is configured."""
+    if opts.termbase is None:
+        return None
+    return TermBase(
+        opts.termbase,
+        opts.from_lang or cfg.defaults.from_lang,
+        opts.to_lang or cfg.defaults.to_lang,
+    )
+
+
+def _seeded(opts: TranslatorOptions, termbase: TermBase | None) -> TranslatorOptions:
+    """Return ``opts`` with the termbase under ``initial_voc``; explicit entries win."""
+    if termbase is None or not len(termbase):
+        return opts
+    from loguru import logger
+
+    logger.debug(f"Seeding the vocabulary with {len(termbase)} term(s) from {termbase.path}")
+    return dataclasses.replace(opts, initial_voc=termbase.vocabulary().merge(opts.initial_voc))
+
+
+def _termbase_entries(opts: TranslatorOptions, termbase: TermBase | None) -> Mapping[str, str]:
+    """Return the termbase entries :func:`_seeded` adds: those ``initial_voc`` does not set."""
+    if termbase is None or not len(termbase):
+        return EMPTY
+    return {
+        term: value for term, value in termbase.vocabulary().items() if term not in opts.initial_voc
+    }
+
+
+def _log_spend(ledger: Ledger) -> None:
+    """Log what a priced run cost."""
+    if ledger.price is None:
+        return
+    from loguru import logger
+
+    budget = f" of ${ledger.budget:g} budget" if ledger.budget is not None else ""
+    logger.info(f"Estimated spend: ${ledger.spent:.4f}{budget}")
+
+
 def translate_string(
     text: str,
     options: TranslatorOptions | None = None,
     *,
     config: AbersetzConfig | None = None,
     client: object | None = None,
+    on_text: Callable[[str], None] | None = None,
+    engine: Engine | None = None,
 ) -> str:
     """Translate a raw string and return the translated string.
 
     Mirrors :func:`translate_path` but operates in memory — used by the ``tr``
     CLI verb to translate text straight to stdout. Detects HTML vs plain text and
-    chunks accordingly."""
+    chunks accordingly.
+
+    With ``on_text``, the output is also passed on piece by piece as it is
+    produced: plain-text chunks that miss the cache arrive as the engine's
+    streamed deltas, cached chunks whole. HTML is passed on once merged.
+    As with :func:`translate_path`, a given ``engine`` replaces the one the
+    options would build."""
     cfg = config or load_config()
     opts = _merge_defaults(options, cfg)
+    opts = _seeded(opts, _open_termbase(opts, cfg))
+    with tracing.span("run", mode="string", engine=opts.engine, chars=len(text)):
+        return _translate_text(text, opts, cfg, client, on_text, engine)
+
+
+def _translate_text(
+    text: str,
+    opts: TranslatorOptions,
+    cfg: AbersetzConfig,
+    client: object | None,
+    on_text: Callable[[str], None] | None,
+    engine: Engine | None,
+) -> str:
     engine_selector = normalize_selector(opts.engine or cfg.defaults.engine) or cfg.defaults.engine
 
     kwargs: dict[str, Any] = {}
-    for attr in ("temperature", "n_gpu_layers", "n_ctx", "max_tokens", "n_threads"):
+    for attr in (
+        "temperature",
+        "n_gpu_layers",
+        "n_ctx",
+        "max_tokens",
+        "n_threads",
+        "slots",
+        "prompt_cache",
+        "workers",
+        "warmup",
+        "draft",
+        "prompt_lookup",
+    ):
         value = getattr(opts, attr, None)
         if value is not None:
             kwargs[attr] = value
-    engine = create_engine(engine_selector, cfg, client=client, **kwargs)
+    if engine is None:
+        with tracing.span("engine_init", selector=engine_selector):
+            engine = create_engine(engine_selector, cfg, client=client, **kwargs)
 
+    ledger_token = _ledger.set(_open_ledger(engine, opts, cfg))
+    try:
+        return _translate_text_with(text, opts, cfg, on_text, engine)
+    finally:
+        _ledger.reset(ledger_token)
+
+
+def _translate_text_with(
+    text: str,
+    opts: TranslatorOptions,
+    cfg: AbersetzConfig,
+    on_text: Callable[[str], None] | None,
+    engine: Engine,
+) -> str:
     if not text.strip():
+        if on_text is not None:
+            on_text(text)
         return text
 
-    fmt = detect_format(text)
+    with tracing.span("detect") as detect_span:
+        fmt = detect_format(text)
+        detect_span.set(format=fmt.value)
     if fmt is TextFormat.HTML:
         merged, _chunks, _voc = _translate_html(text, engine, opts, cfg)
+        if on_text is not None:
+            on_text(merged)
         return merged
     chunk_size = _select_chunk_size(fmt, engine, opts, cfg)
-    chunks = chunk_text(text, chunk_size, fmt)
-    results, _voc = _apply_engine(engine, chunks, fmt, opts, cfg)
+    with tracing.span("chunk", chunk_size=chunk_size) as chunk_span:
+        chunks = chunk_text(text, chunk_size, fmt)
+        chunk_span.set(chunks=len(chunks))
+    results, _voc = _apply_engine(engine, chunks, fmt, opts, cfg, on_text=on_text)
     return "".join(item.text for item in results)
 
 
@@ -192,31 +480,163 @@ def _merge_defaults(options: TranslatorOptions | None, config: AbersetzConfig) -
         opts.chunk_size = config.defaults.chunk_size
     if opts.html_chunk_size is None:
         opts.html_chunk_size = config.defaults.html_chunk_size
+    if opts.termbase is None and config.defaults.termbase:
+        opts.termbase = Path(config.defaults.termbase).expanduser()
     return opts
 
 
-def _discover_files(root: Path, opts: TranslatorOptions) -> Iterable[Path]:
-    if root.is_file():
-        return [root]
-    pattern_iter = root.rglob if opts.recurse else root.glob
-    matched: list[Path] = []
-    for pattern in opts.include:
-        matched.extend(pattern_iter(pattern))
-    filtered = [path for path in matched if not _is_xcluded(path, opts.xclude)]
-    return sorted({path.resolve() for path in filtered if path.is_file()})
+def _discover_files(root: Path, opts: TranslatorOptions) -> Iterator[SourceFile]:
+    return iter_files(
+        root,
+        opts.include,
+        opts.xclude,
+        recurse=opts.recurse,
+        gitignore=opts.gitignore,
+        workers=opts.discovery_workers,
+    )
 
 
-def _is_xcluded(path: Path, patterns: tuple[str, ...]) -> bool:
-    return any(path.match(pattern) for pattern in patterns)
+def _open_journal(
+    root: Path, single_file: bool, opts: TranslatorOptions, config: AbersetzConfig
+) -> RunJournal | None:
+    if not (opts.checkpoint or opts.resume) or opts.dry_run:
+        return None
+    target_lang = opts.to_lang or config.defaults.to_lang
+    base = root.parent if single_file else root
+    if opts.output_dir is not None:
+        base = opts.output_dir
+    elif not opts.write_over:
+        base = base / target_lang
+    settings = {
+        "engine": opts.engine,
+        "from_lang": opts.from_lang,
+        "to_lang": target_lang,
+        "chunk_size": opts.chunk_size,
+        "html_chunk_size": opts.html_chunk_size,
+        "prolog": dict(sorted(opts.prolog.items())),
+        "initial_voc": dict(sorted(opts.initial_voc.items())),
+        "write_over": opts.write_over,
+    }
+    return RunJournal(
+        base / JOURNAL_NAME,
+        root.parent if single_file else root,
+        settings,
+        resume=opts.resume,
+        trust_keys=opts.write_over,
+    )
+
+
+_file_stats = threading.local()
+_ledger: ContextVar[Ledger | None] = ContextVar("abersetz_ledger", default=None)
+# Termbase entries the run was seeded with; ``save_voc`` sidecars leave them out.
+_termbase_seed: ContextVar[Mapping[str, str]] = ContextVar("abersetz_termbase_seed", default=EMPTY)
+
+
+def _run_file(
+    source: SourceFile,
+    engine: Engine,
+    opts: TranslatorOptions,
+    config: AbersetzConfig,
+    writer: OutputWriter,
+    journal: RunJournal | None = None,
+) -> tuple[TranslationResult, Exception | None]:
+    """Translate one file, turning any exception into a failed result."""
+    reset_retry_count()
+    _file_stats.calls = 0
+    _file_stats.misses = 0
+    _file_stats.worker_retries = 0
+    _file_stats.usage = Usage()
+    _file_stats.cost = None
+    started = time.perf_counter()
+    error: Exception | None = None
+    with tracing.span("file", path=str(source.path)) as file_span:
+        try:
+            finished = journal.completed(source) if journal is not None else None
+            if finished is not None and (opts.write_over or finished.exists()):
+                result = _resumed_result(source.path, finished, opts, config)
+            else:
+                checkpoint = journal.file(source) if journal is not None else None
+                result = _translate_file(source, engine, opts, config, writer, checkpoint)
+                if journal is not None:
+                    # Only a written output may be skipped by ``--resume``.
+                    writer.after_writes(
+                        functools.partial(journal.mark_done, source, result.destination)
+                    )
+        except Exception as exc:
+            error = exc
+            result = _failed_result(source.path, exc, opts, config)
+        result.seconds = time.perf_counter() - started
+        result.retries = retry_count() + _file_stats.worker_retries
+        result.cache_hits = max(_file_stats.calls - _file_stats.misses, 0)
+        result.prompt_tokens = _file_stats.usage.prompt_tokens
+        result.completion_tokens = _file_stats.usage.completion_tokens
+        result.billed_chars = _file_stats.usage.billed_chars
+        result.cost = _file_stats.cost
+        metrics.FILES.inc(status=result.status)
+        file_span.set(
+            status=result.status,
+            error_class=result.error_class,
+            chars=result.chars,
+            chunks=result.chunks,
+            cache_hits=result.cache_hits,
+            retries=result.retries,
+            cost=result.cost,
+        )
+    return result, error
+
+
+def _resumed_result(
+    source: Path, destination: Path, opts: TranslatorOptions, config: AbersetzConfig
+) -> TranslationResult:
+    return TranslationResult(
+        source=source,
+        destination=destination,
+        chunks=0,
+        voc={},
+        format=TextFormat.PLAIN,
+        engine=opts.engine or config.defaults.engine,
+        source_lang=opts.from_lang or config.defaults.from_lang,
+        target_lang=opts.to_lang or config.defaults.to_lang,
+        status=STATUS_SKIPPED,
+    )
+
+
+def _failed_result(
+    source: Path, error: Exception, opts: TranslatorOptions, config: AbersetzConfig
+) -> TranslationResult:
+    target_lang = opts.to_lang or config.defaults.to_lang
+    return TranslationResult(
+        source=source,
+        destination=_destination_for(source, opts, target_lang),
+        chunks=0,
+        voc={},
+        format=TextFormat.PLAIN,
+        engine=opts.engine or config.defaults.engine,
+        source_lang=opts.from_lang or config.defaults.from_lang,
+        target_lang=target_lang,
+        error=str(error),
+        status=STATUS_FAILED,
+        error_class=type(error).__name__,
+    )
 
 
 def _translate_file(
-    source: Path,
+    source_file: SourceFile | Path,
     engine: Engine,
     opts: TranslatorOptions,
     config: AbersetzConfig,
+    writer: OutputWriter | None = None,
+    checkpoint: FileCheckpoint | None = None,
 ) -> TranslationResult:
-    text = source.read_text(encoding="utf-8")
+    if isinstance(source_file, Path):
+        source_file = SourceFile(source_file)
+    source = source_file.path
+    try:
+        with tracing.span("read") as read_span:
+            text, file_size = read_source(source_file)
+            read_span.set(bytes=file_size)
+    except (OSError, UnicodeDecodeError) as e:
+        raise SourceReadError(f"Cannot read {source}: {e}") from e
 
     engine_selector = opts.engine or config.defaults.engine
     engine_selector = normalize_selector(engine_selector) or engine_selector
@@ -233,6 +653,7 @@ def _translate_file(
             TextFormat.PLAIN,
             opts,
             opts.to_lang or config.defaults.to_lang,
+            writer,
         )
         return TranslationResult(
             source=source,
@@ -244,35 +665,44 @@ def _translate_file(
             source_lang=source_lang,
             target_lang=target_lang,
             chunk_size=0,
+            status=STATUS_SKIPPED,
+            chars=len(text),
         )
 
     # Warn about very large files (>10MB)
-    file_size = source.stat().st_size
     if file_size > 10 * 1024 * 1024:  # 10MB
         from loguru import logger
 
         logger.warning(f"Large file detected ({file_size / 1024 / 1024:.1f}MB): {source}")
 
-    fmt = detect_format(text)
+    with tracing.span("detect") as detect_span:
+        fmt = detect_format(text)
+        detect_span.set(format=fmt.value)
     if fmt is TextFormat.HTML:
-        merged_text, total_chunks, voc = _translate_html(text, engine, opts, config)
+        merged_text, total_chunks, voc = _translate_html(text, engine, opts, config, checkpoint)
         chunk_size = _select_chunk_size(fmt, engine, opts, config)
     else:
         chunk_size = _select_chunk_size(fmt, engine, opts, config)
-        chunks = chunk_text(text, chunk_size, fmt)
+        with tracing.span("chunk", chunk_size=chunk_size) as chunk_span:
+            chunks = chunk_text(text, chunk_size, fmt)
+            chunk_span.set(chunks=len(chunks))
         # logger.debug("%s: %s chunk(s) of size %s", source, len(chunks) or 1, chunk_size)
-        results, voc = _apply_engine(engine, chunks, fmt, opts, config)
+        results, voc = _apply_engine(engine, chunks, fmt, opts, config, checkpoint)
         merged_text = "".join(item.text for item in results)
         total_chunks = len(chunks) or 1
 
-    destination = _persist_output(
-        source,
-        merged_text,
-        voc,
-        fmt,
-        opts,
-        opts.to_lang or config.defaults.to_lang,
-    )
+    with tracing.span(
+        "write", chars=len(merged_text), dry_run=opts.dry_run, background=opts.background_write
+    ):
+        destination = _persist_output(
+            source,
+            merged_text,
+            voc,
+            fmt,
+            opts,
+            opts.to_lang or config.defaults.to_lang,
+            writer,
+        )
     return TranslationResult(
         source=source,
         destination=destination,
@@ -283,6 +713,7 @@ def _translate_file(
         source_lang=source_lang,
         target_lang=target_lang,
         chunk_size=chunk_size,
+        chars=len(text),
     )
 
 
@@ -291,15 +722,33 @@ def _translate_html(
     engine: Engine,
     opts: TranslatorOptions,
     config: AbersetzConfig,
+    checkpoint: FileCheckpoint | None = None,
 ) -> tuple[str, int, dict[str, str]]:
     """Translate HTML using htmladapt for structured preservation."""
+    from htmladapt import HTMLExtractMergeTool
+
+    chunk_size = _select_chunk_size(TextFormat.HTML, engine, opts, config)
+    with tracing.span("html_extract", chars=len(text)) as extract_span:
+        tool = HTMLExtractMergeTool()
+        map_html, comp_html = tool.extract(text)
+        chunk_htmls = _html_chunks(comp_html, chunk_size)
+        extract_span.set(chunks=len(chunk_htmls))
+
+    if not chunk_htmls:
+        return text, 1, {}
+
+    results, voc = _apply_engine(engine, chunk_htmls, TextFormat.HTML, opts, config, checkpoint)
+
+    with tracing.span("html_merge", chunks=len(results)):
+        final_html = _merge_html(tool, results, comp_html, map_html, text)
+    return final_html, len(chunk_htmls), voc
+
+
+def _html_chunks(comp_html: str, chunk_size: int) -> list[str]:
+    """Group the top-level elements of the compressed HTML into chunk documents."""
     import copy
 
     from bs4 import BeautifulSoup
-    from htmladapt import HTMLExtractMergeTool
-
-    tool = HTMLExtractMergeTool()
-    map_html, comp_html = tool.extract(text)
 
     soup = BeautifulSoup(comp_html, "html.parser")
     body = soup.body
@@ -307,9 +756,8 @@ def _translate_html(
     elements = [el for el in elements if getattr(el, "name", None) is not None]
 
     if not elements:
-        return text, 1, {}
+        return []
 
-    chunk_size = _select_chunk_size(TextFormat.HTML, engine, opts, config)
     chunks: list[list[Any]] = []
     current_chunk: list[Any] = []
     current_size = 0
@@ -333,8 +781,16 @@ def _translate_html(
         for el in chunk_els:
             chunk_soup.body.append(copy.copy(el))
         chunk_htmls.append(str(chunk_soup))
+    return chunk_htmls
+
 
-    results, voc = _apply_engine(engine, chunk_htmls, TextFormat.HTML, opts, config)
+def _merge_html(
+    tool: Any, results: list[EngineResult], comp_html: str, map_html: str, text: str
+) -> str:
+    """Reassemble translated chunk documents and merge them back into the original HTML."""
+    import copy
+
+    from bs4 import BeautifulSoup
 
     translated_elements = []
     for r in results:
@@ -353,44 +809,165 @@ def _translate_html(
         final_comp_soup.body.append(copy.copy(el))
     final_comp_html = str(final_comp_soup)
 
-    final_html = tool.merge(final_comp_html, comp_html, map_html, text)
-    return final_html, len(chunks), voc
+    return tool.merge(final_comp_html, comp_html, map_html, text)
 
 
 _active_engine = threading.local()
 
 
-@bcache(folder_name="abersetz_chunk_translations")
-def _cached_translate_call(
+class _StreamSink:
+    """Forward a cache miss's streamed deltas to ``on_text`` as they arrive.
+
+    ``emitted`` tells ``_apply_engine`` whether the chunk already reached the
+    caller; cache hits and resumed chunks are passed on whole instead."""
+
+    def __init__(self, on_text: Callable[[str], None]) -> None:
+        self.on_text = on_text
+        self.emitted = False
+
+    def drain(self, stream: Generator[str, None, EngineResult]) -> EngineResult:
+        while True:
+            try:
+                delta = next(stream)
+            except StopIteration as stop:
+                return stop.value
+            self.emitted = True
+            self.on_text(delta)
+
+
+def _translate_chunk(
     engine_name: str,
     model_name: str | None,
     text: str,
     source_lang: str,
     target_lang: str,
     is_html: bool,
-    voc_json: str,
-    prolog_json: str,
+    voc_digest: str,
+    prolog_digest: str,
     temperature: float | None,
 ) -> tuple[str, str]:
-    print(
-        f"\n[CACHE MISS] engine={engine_name} text={text!r} src={source_lang} tgt={target_lang} voc={voc_json} prolog={prolog_json}"
+    """Translate one chunk; keyed on the digests of its prompt vocabulary and prolog.
+
+    ``voc_digest`` covers only the terms the engine puts in this chunk's prompt
+    (see :func:`_voc_digest`). The :class:`Vocabulary` objects themselves
+    travel in ``_active_engine``
+    (``voc``, ``prolog``) so a lookup never serializes them. Returns the text
+    and, as JSON, only the entries the engine added or changed."""
+    from loguru import logger
+
+    logger.debug(
+        f"Cache miss: engine={engine_name} text={text!r} src={source_lang} tgt={target_lang} "
+        f"voc={voc_digest[:12]} prolog={prolog_digest[:12]}"
     )
+    # Only reached on a cache miss; ``_apply_engine`` counts every lookup.
+    _file_stats.misses = getattr(_file_stats, "misses", 0) + 1
     engine = getattr(_active_engine, "current", None)
     if not engine:
         raise RuntimeError("No active engine configured in thread-local storage")
+    ledger = _ledger.get()
+    reserved = 0.0
+    if ledger is not None:
+        claim = ledger.reserve(len(text))
+        if claim is None:
+            raise BudgetExceeded(
+                f"Stopping before the ${ledger.budget:g} budget is exceeded "
+                f"(${ledger.spent:.4f} spent)"
+            )
+        reserved = claim
 
+    voc: Vocabulary = _active_engine.voc
     request = EngineRequest(
         text=text,
         source_lang=source_lang,
         target_lang=target_lang,
         is_html=is_html,
-        voc=json.loads(voc_json),
-        prolog=json.loads(prolog_json),
+        voc=voc,
+        prolog=_active_engine.prolog,
         chunk_index=0,
         total_chunks=1,
     )
-    result = engine.translate(request)
-    return result.text, json.dumps(result.voc, ensure_ascii=False)
+    sink: _StreamSink | None = getattr(_active_engine, "sink", None)
+    stream = getattr(engine, "translate_stream", None)
+    labels = metrics.engine_labels(engine)
+    metrics.CHARS_IN.inc(len(text), **labels)
+    outcome = "error"
+    usage: Usage | None = None
+    started = time.perf_counter()
+    try:
+        with (
+            metrics.engine_scope(labels),
+            tracing.span(
+                "engine_call", engine=engine_name, model=model_name, chars_in=len(text)
+            ) as call_span,
+        ):
+            if sink is not None and stream is not None:
+                result = sink.drain(stream(request))
+            else:
+                result = engine.translate(request)
+            call_span.set(chars_out=len(result.text))
+        usage = result.usage
+        outcome = "ok"
+    except Exception as error:
+        if metrics.is_rate_limited(error):
+            metrics.RATE_LIMITED.inc(**labels)
+        raise
+    finally:
+        cost = ledger.settle(reserved, usage) if ledger is not None else None
+        metrics.ENGINE_REQUESTS.inc(outcome=outcome, **labels)
+        metrics.CHUNK_SECONDS.observe(time.perf_counter() - started, **labels)
+    metrics.CHARS_OUT.inc(len(result.text), **labels)
+    _record_usage(labels, usage, cost)
+    return result.text, json.dumps(voc.changes(result.voc), ensure_ascii=False)
+
+
+_cached_translate_call = bcache(folder_name="abersetz_chunk_translations")(_translate_chunk)
+# Set for a run that must neither read nor fill the persistent chunk cache (``abersetz bench``).
+_chunk_call: ContextVar[Callable[..., tuple[str, str]] | None] = ContextVar(
+    "abersetz_chunk_call", default=None
+)
+
+
+def _record_usage(labels: dict[str, str], usage: Usage | None, cost: float | None) -> None:
+    """Add one engine call's usage and cost to the file totals and the metrics."""
+    _add_file_usage(usage, cost)
+    if usage is not None:
+        metrics.record_tokens(labels, usage.prompt_tokens, usage.completion_tokens)
+        if usage.billed_chars:
+            metrics.BILLED_CHARS.inc(usage.billed_chars, **labels)
+    if cost:
+        metrics.COST_DOLLARS.inc(cost, **labels)
+
+
+def _add_file_usage(usage: Usage | None, cost: float | None) -> None:
+    totals = getattr(_file_stats, "usage", None)
+    if totals is None:
+        totals = _file_stats.usage = Usage()
+    totals.add(usage)
+    if cost is not None:
+        _file_stats.cost = (getattr(_file_stats, "cost", None) or 0.0) + cost
+
+
+def _engine_model_name(engine: Engine) -> str | None:
+    model_val = getattr(engine, "_model_name", None) or getattr(engine, "_model", None)
+    if model_val is None:
+        return None
+    if isinstance(model_val, str):
+        return model_val
+    return getattr(model_val, "name", None) or model_val.__class__.__name__
+
+
+def _voc_digest(engine: Engine, text: str, voc: Vocabulary) -> str:
+    """Return the digest of the vocabulary entries a request for ``text`` sends.
+
+    Keying chunks on the whole vocabulary would miss the cache for every chunk
+    as soon as one new term is learned anywhere, e.g. in a seeded termbase."""
+    prompt_voc = getattr(engine, "prompt_voc", None)
+    if prompt_voc is None:
+        return voc.digest
+    sent = prompt_voc(text, voc)
+    if len(sent) == len(voc):
+        return voc.digest
+    return sent.digest if isinstance(sent, Vocabulary) else Vocabulary(sent).digest
 
 
 def _apply_engine(
@@ -399,49 +976,174 @@ def _apply_engine(
     fmt: TextFormat,
     opts: TranslatorOptions,
     config: AbersetzConfig,
+    checkpoint: FileCheckpoint | None = None,
+    on_text: Callable[[str], None] | None = None,
 ) -> tuple[list[EngineResult], dict[str, str]]:
-    voc = dict(opts.initial_voc)
-    prolog = dict(opts.prolog)
+    voc = Vocabulary(opts.initial_voc)
+    prolog = Vocabulary(opts.prolog)
     results: list[EngineResult] = []
     chunk_list = list(chunks)
-    len(chunk_list) or 1
+    call = functools.partial(
+        _chunk_call.get() or _cached_translate_call,
+        engine_name=engine.name,
+        model_name=_engine_model_name(engine),
+        source_lang=opts.from_lang or "auto",
+        target_lang=opts.to_lang or config.defaults.to_lang,
+        is_html=(fmt is TextFormat.HTML),
+        prolog_digest=prolog.digest,
+        temperature=getattr(engine, "_temperature", None),
+    )
+
+    labels = metrics.engine_labels(engine)
+    concurrency = max(int(getattr(engine, "max_concurrency", 1) or 1), 1)
+    parallel = concurrency > 1 and getattr(engine, "static_voc", False) and len(chunk_list) > 1
+    # Streaming shows chunks as they are produced, so it keeps them in order.
+    if parallel and on_text is None:
+        return _apply_engine_concurrently(
+            engine, chunk_list, call, voc, prolog, concurrency, checkpoint, labels
+        )
 
+    sink = _StreamSink(on_text) if on_text is not None else None
     _active_engine.current = engine
+    _active_engine.sink = sink
+    _active_engine.prolog = prolog
     try:
-        for _index, chunk in enumerate(chunk_list):
-            voc_json = json.dumps(voc, sort_keys=True, ensure_ascii=False)
-            prolog_json = json.dumps(prolog, sort_keys=True, ensure_ascii=False)
-
-            model_val = getattr(engine, "_model_name", None) or getattr(engine, "_model", None)
-            if model_val is not None:
-                if isinstance(model_val, str):
-                    model_name = model_val
-                else:
-                    model_name = getattr(model_val, "name", None) or model_val.__class__.__name__
-            else:
-                model_name = None
-            temperature = getattr(engine, "_temperature", None)
-
-            res_text, res_voc_json = _cached_translate_call(
-                engine_name=engine.name,
-                model_name=model_name,
-                text=chunk,
-                source_lang=opts.from_lang or "auto",
-                target_lang=opts.to_lang or config.defaults.to_lang,
-                is_html=(fmt is TextFormat.HTML),
-                voc_json=voc_json,
-                prolog_json=prolog_json,
-                temperature=temperature,
+        for index, chunk in enumerate(chunk_list):
+            resumed = checkpoint.lookup(index, chunk) if checkpoint is not None else None
+            if resumed is not None:
+                voc = voc.merge(resumed[1])
+                results.append(EngineResult(text=resumed[0], voc=voc))
+                if on_text is not None:
+                    on_text(resumed[0])
+                continue
+            _active_engine.voc = voc
+            _file_stats.calls = getattr(_file_stats, "calls", 0) + 1
+
+            if sink is not None:
+                sink.emitted = False
+            metrics.QUEUE_DEPTH.inc(**labels)
+            res_text, delta_json = _lookup_chunk(
+                call, labels, index, text=chunk, voc_digest=_voc_digest(engine, chunk, voc)
             )
-
-            new_voc = json.loads(res_voc_json)
-            voc = new_voc
-            results.append(EngineResult(text=res_text, voc=new_voc))
+            if sink is not None and not sink.emitted:
+                sink.on_text(res_text)
+
+            added = json.loads(delta_json) if delta_json != "{}" else {}
+            if added:
+                voc = voc.merge(added)
+            results.append(EngineResult(text=res_text, voc=voc))
+            if checkpoint is not None:
+                checkpoint.record(index, chunk, res_text, added)
     finally:
         if hasattr(_active_engine, "current"):
             del _active_engine.current
+        _active_engine.sink = None
+        _active_engine.voc = _active_engine.prolog = None
 
-    return results, voc
+    return results, voc.to_dict()
+
+
+def _apply_engine_concurrently(
+    engine: Engine,
+    chunk_list: list[str],
+    call: Callable[..., tuple[str, str]],
+    voc: Vocabulary,
+    prolog: Vocabulary,
+    concurrency: int,
+    checkpoint: FileCheckpoint | None,
+    labels: dict[str, str],
+) -> tuple[list[EngineResult], dict[str, str]]:
+    """Translate independent chunks in parallel, up to the engine's slot count.
+
+    Only used for ``static_voc`` engines: every chunk sees the same vocabulary,
+    so the cache keys and results match the sequential path exactly."""
+    texts: list[str] = [""] * len(chunk_list)
+    pending: list[int] = []
+    for index, chunk in enumerate(chunk_list):
+        resumed = checkpoint.lookup(index, chunk) if checkpoint is not None else None
+        if resumed is None:
+            pending.append(index)
+        else:
+            texts[index] = resumed[0]
+
+    if pending:
+        _file_stats.calls = getattr(_file_stats, "calls", 0) + len(pending)
+        pool = ThreadPoolExecutor(
+            max_workers=min(concurrency, len(pending)), thread_name_prefix="abersetz-chunk"
+        )
+        metrics.QUEUE_DEPTH.inc(len(pending), **labels)
+        futures: dict[int, Future[tuple[str, int, int, Usage, float | None]]] = {}
+        try:
+            # Each task runs in a copy of this context so its spans nest under the file.
+            for index in pending:
+                futures[index] = pool.submit(
+                    contextvars.copy_context().run,
+                    _call_on_worker,
+                    engine,
+                    call,
+                    labels,
+                    index,
+                    (voc, prolog),
+                    text=chunk_list[index],
+                    voc_digest=_voc_digest(engine, chunk_list[index], voc),
+                )
+            # Collect in order so the checkpoint journal stays sequential.
+            for index in pending:
+                text, misses, retries, usage, cost = futures[index].result()
+                texts[index] = text
+                _file_stats.misses = getattr(_file_stats, "misses", 0) + misses
+                _file_stats.worker_retries = getattr(_file_stats, "worker_retries", 0) + retries
+                _add_file_usage(usage, cost)
+                if checkpoint is not None:
+                    checkpoint.record(index, chunk_list[index], text, {})
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            # Chunks that never ran leave the queue here; the others left it themselves.
+            never_ran = len(pending) - len(futures) + sum(f.cancelled() for f in futures.values())
+            if never_ran:
+                metrics.QUEUE_DEPTH.dec(never_ran, **labels)
+
+    return [EngineResult(text=text, voc=voc) for text in texts], voc.to_dict()
+
+
+def _lookup_chunk(
+    call: Callable[..., tuple[str, str]], labels: dict[str, str], index: int, **kwargs: Any
+) -> tuple[str, str]:
+    """Run one cached engine call for a queued chunk, tracing and counting the lookup."""
+    misses = getattr(_file_stats, "misses", 0)
+    hit = False
+    try:
+        with tracing.span("cache_lookup", index=index) as lookup:
+            result = call(**kwargs)
+            hit = _file_stats.misses == misses
+            lookup.set(hit=hit)
+    finally:
+        metrics.QUEUE_DEPTH.dec(**labels)
+        metrics.CACHE_LOOKUPS.inc(result="hit" if hit else "miss", **labels)
+    return result
+
+
+def _call_on_worker(
+    engine: Engine,
+    call: Callable[..., tuple[str, str]],
+    labels: dict[str, str],
+    index: int,
+    vocabularies: tuple[Vocabulary, Vocabulary],
+    **kwargs: Any,
+) -> tuple[str, int, int, Usage, float | None]:
+    """Run one cached engine call on a pool thread and report its thread-local stats."""
+    _active_engine.current = engine
+    _active_engine.voc, _active_engine.prolog = vocabularies
+    _file_stats.misses = 0
+    _file_stats.usage = Usage()
+    _file_stats.cost = None
+    reset_retry_count()
+    try:
+        text, _delta_json = _lookup_chunk(call, labels, index, **kwargs)
+    finally:
+        del _active_engine.current
+        _active_engine.voc = _active_engine.prolog = None
+    return text, _file_stats.misses, retry_count(), _file_stats.usage, _file_stats.cost
 
 
 def _build_request(
@@ -481,6 +1183,13 @@ def _select_chunk_size(
     return max(plain_size, 1)
 
 
+def _destination_for(source: Path, opts: TranslatorOptions, target_lang: str) -> Path:
+    if opts.write_over:
+        return source
+    base = opts.output_dir or source.parent / target_lang
+    return base / source.name
+
+
 def _persist_output(
     source: Path,
     content: str,
@@ -488,23 +1197,29 @@ def _persist_output(
     fmt: TextFormat,
     opts: TranslatorOptions,
     target_lang: str,
+    writer: OutputWriter | None = None,
 ) -> Path:
-    if opts.write_over:
-        destination = source
-    else:
-        base = opts.output_dir or source.parent / target_lang
-        base.mkdir(parents=True, exist_ok=True)
-        destination = base / source.name
+    out = writer or OutputWriter()
+    destination = _destination_for(source, opts, target_lang)
     if not opts.dry_run:
-        destination.write_text(content, encoding="utf-8")
+        # Atomic replace: a crash mid-write never truncates the destination,
+        # which with ``write_over`` is the source file itself.
+        out.write_text(destination, content)
         if opts.save_voc:
+            # Only the file's own terms: the termbase already holds its seed.
+            seed = _termbase_seed.get()
+            if seed:
+                voc = {term: value for term, value in voc.items() if seed.get(term) != value}
             vocab_path = destination.with_suffix(destination.suffix + ".voc.json")
-            vocab_path.write_text(json.dumps(voc, indent=2, ensure_ascii=False), encoding="utf-8")
+            out.write_json(vocab_path, voc)
     return destination
 
 
 __all__ = [
+    "BudgetExceeded",
+    "FailureLimitExceeded",
     "PipelineError",
+    "SourceReadError",
     "TranslationResult",
     "TranslatorOptions",
     "translate_path",
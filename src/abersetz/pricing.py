@@ -0,0 +1,89 @@
+"""Spend tracking for priced engines and the ``--budget`` cap.
+
+Prices come from the ``[pricing]`` table of ``config.toml``, keyed by model
+name, provider or engine selector::
+
+    [pricing."gpt-4o-mini"]
+    input = 0.15     # dollars per million prompt tokens
+    output = 0.60    # dollars per million completion tokens
+
+    [pricing.deepl]
+    chars = 25.0     # dollars per million billed characters
+
+A :class:`Ledger` follows one run: before each engine call it sets aside an
+estimate (about four characters per token, output as long as the input),
+and after the call it books what the provider reported instead, or the
+estimate itself when the provider reported nothing. A call whose
+estimate would take the run over the budget is refused, so a run stops
+before it overspends rather than after."""
+# this_file: src/abersetz/pricing.py
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+
+from .config import Price
+from .providers.base import Usage
+
+CHARS_PER_TOKEN = 4
+"""Rough characters per token used to estimate a call before it is made."""
+
+
+def find_price(pricing: Mapping[str, Price], *keys: str | None) -> Price | None:
+    """Return the price of the first of ``keys`` listed in ``pricing``."""
+    for key in keys:
+        if key and key in pricing:
+            return pricing[key]
+    return None
+
+
+def cost_of(price: Price, usage: Usage) -> float:
+    """Return what ``usage`` costs at ``price``, in dollars."""
+    return price.cost(usage.prompt_tokens, usage.completion_tokens, usage.billed_chars)
+
+
+def estimate(price: Price, chars: int) -> float:
+    """Return the expected cost of translating ``chars`` characters."""
+    tokens = -(-chars // CHARS_PER_TOKEN)
+    return price.cost(tokens, tokens, chars)
+
+
+class Ledger:
+    """Spend of one run, checked against an optional ``budget`` in dollars.
+
+    Thread-safe: parallel chunk workers reserve and settle concurrently, and
+    reservations in flight count against the budget."""
+
+    def __init__(self, price: Price | None, budget: float | None = None) -> None:
+        self.price = price
+        self.budget = budget
+        self.spent = 0.0
+        self._reserved = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, chars: int) -> float | None:
+        """Set aside the estimated cost of a call; ``None`` if it would break the budget."""
+        expected = estimate(self.price, chars) if self.price is not None else 0.0
+        with self._lock:
+            if self.budget is not None and self.spent + self._reserved + expected > self.budget:
+                return None
+            self._reserved += expected
+        return expected
+
+    def settle(self, reserved: float, usage: Usage | None) -> float | None:
+        """Replace a reservation with the reported cost; ``None`` when nothing is priced.
+
+        Without ``usage`` the reservation itself is booked, so calls the provider
+        does not report on (e.g. streams without usage) still count against the budget."""
+        if self.price is None:
+            cost = 0.0
+        else:
+            cost = cost_of(self.price, usage) if usage is not None else reserved
+        with self._lock:
+            self._reserved -= reserved
+            self.spent += cost
+        return cost if self.price is not None else None
+
+
+__all__ = ["CHARS_PER_TOKEN", "Ledger", "cost_of", "estimate", "find_price"]
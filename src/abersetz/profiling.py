@@ -0,0 +1,308 @@
+"""Whole-command CPU and allocation profiling (``--profile=cpu|sample|alloc``).
+
+Three profilers from the standard library, usable alone or together:
+
+* ``cpu`` — deterministic :mod:`cProfile` over every thread, chunk workers
+  included; writes ``PREFIX.pstats`` (``python -m pstats``, snakeviz) and
+  prints the functions with the most self time;
+* ``sample`` — a wall-clock stack sampler with little overhead; writes
+  ``PREFIX.collapsed`` (one ``frame;frame;frame count`` line per stack, the
+  input of flamegraph.pl and speedscope) and prints the hottest frames;
+* ``alloc`` — :mod:`tracemalloc`; writes a ``PREFIX.tracemalloc`` snapshot
+  (``tracemalloc.Snapshot.load``) and prints the allocation peak and the
+  lines that hold the most memory at the end.
+
+``stages`` (plain ``--profile``) is the per-stage timing of
+:class:`~abersetz.tracing.StageProfile` and is not handled here."""
+# this_file: src/abersetz/profiling.py
+
+from __future__ import annotations
+
+import contextlib
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    import cProfile
+    import pstats
+    import tracemalloc
+    from types import FrameType
+
+MODES = ("stages", "cpu", "sample", "alloc")
+DEFAULT_OUTPUT = "abersetz-profile"
+DEFAULT_TOP = 20
+SAMPLE_INTERVAL = 0.005
+"""Seconds between two stack samples."""
+
+
+def parse_modes(value: object) -> frozenset[str]:
+    """Turn a ``--profile`` value into a set of :data:`MODES`.
+
+    A bare flag means ``stages``; strings may list several modes separated by commas."""
+    if value is True:
+        return frozenset({"stages"})
+    if value is False or value is None or value == "":
+        return frozenset()
+    items = value.split(",") if isinstance(value, str) else value
+    if not isinstance(items, Iterable):
+        raise ValueError(f"Invalid --profile value {value!r}")
+    modes = frozenset(str(item).strip().lower() for item in items if str(item).strip())
+    unknown = modes - set(MODES)
+    if unknown:
+        raise ValueError(
+            f"Unknown --profile mode(s): {', '.join(sorted(unknown))} (use {', '.join(MODES)})"
+        )
+    return modes
+
+
+class CpuProfiler:
+    """cProfile across all threads.
+
+    From Python 3.12 one profiler sees every thread; before that each thread
+    started while profiling gets its own, merged into the result."""
+
+    def __init__(self) -> None:
+        import cProfile
+
+        self._main = cProfile.Profile()
+        self._threads: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._per_thread = sys.version_info < (3, 12)
+
+    def _start_thread(self, frame: Any, event: str, arg: Any) -> None:
+        import cProfile
+
+        profile = cProfile.Profile()
+        with self._lock:
+            self._threads.append(profile)
+        profile.enable()
+
+    def start(self) -> None:
+        if self._per_thread:
+            threading.setprofile(self._start_thread)
+        self._main.enable()
+
+    def stop(self) -> pstats.Stats:
+        import pstats
+
+        self._main.disable()
+        if self._per_thread:
+            threading.setprofile(None)  # type: ignore[arg-type]
+        stats = pstats.Stats(self._main)
+        with self._lock:
+            for profile in self._threads:
+                stats.add(profile)
+        return stats
+
+
+def _function_label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # a built-in, e.g. "<method 'dumps' ...>"
+    path = Path(filename)
+    where = f"{path.parent.name}/{path.name}" if path.parent.name else path.name
+    return f"{where}:{line}({name})"
+
+
+def format_cpu(stats: pstats.Stats, top: int = DEFAULT_TOP) -> str:
+    """Return the ``top`` functions by self time, with calls and cumulative time."""
+    entries = stats.stats  # type: ignore[attr-defined]
+    total = sum(entry[2] for entry in entries.values()) or 1.0
+    ranked = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)[:top]
+    lines = [f"{'self s':>9}{'self %':>8}{'cum s':>9}{'calls':>10}  function"]
+    for func, (_, calls, self_time, cumulative, _) in ranked:
+        lines.append(
+            f"{self_time:>9.3f}{self_time * 100 / total:>8.1f}{cumulative:>9.3f}"
+            f"{calls:>10}  {_function_label(func)}"
+        )
+    return "\n".join(lines)
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or Path(code.co_filename).name
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{module}:{name}".replace(";", ":")
+
+
+class StackSampler:
+    """Sample the stacks of all other threads every ``interval`` seconds.
+
+    Samples are wall-clock: a thread blocked on a lock or a socket is counted
+    where it waits, which is what shows up as time in a slow run."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="abersetz-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names: dict[int | None, str] = {}
+        frame: FrameType | None
+        while not self._stop.wait(self.interval):
+            names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def collapsed(self) -> str:
+        """Return the samples in collapsed-stack format."""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+def format_samples(stacks: Counter[str], top: int = DEFAULT_TOP) -> str:
+    """Return the ``top`` frames by self samples, with their inclusive share."""
+    self_counts: Counter[str] = Counter()
+    inclusive: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")[1:]  # the first entry is the thread name
+        if not frames:
+            continue
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            inclusive[frame] += count
+    total = sum(stacks.values()) or 1
+    lines = [f"{'self %':>8}{'total %':>9}  frame"]
+    for frame, count in self_counts.most_common(top):
+        lines.append(f"{count * 100 / total:>8.1f}{inclusive[frame] * 100 / total:>9.1f}  {frame}")
+    return "\n".join(lines)
+
+
+class AllocTracker:
+    """tracemalloc from :meth:`start` to :meth:`stop`, keeping ``frames`` frames per trace."""
+
+    def __init__(self, frames: int = 10) -> None:
+        self.frames = frames
+        self.peak = 0
+        self._was_tracing = False
+
+    def start(self) -> None:
+        import tracemalloc
+
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+
+    def stop(self) -> tracemalloc.Snapshot:
+        import tracemalloc
+
+        _, self.peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            )
+        )
+        if not self._was_tracing:
+            tracemalloc.stop()
+        return snapshot
+
+
+def format_alloc(snapshot: tracemalloc.Snapshot, peak: int, top: int = DEFAULT_TOP) -> str:
+    """Return the allocation peak and the ``top`` lines by memory still held."""
+    statistics = snapshot.statistics("lineno")
+    held = sum(stat.size for stat in statistics)
+    lines = [
+        f"allocation peak: {peak / 2**20:.1f} MiB ({held / 2**20:.1f} MiB still held at the end)",
+        f"{'KiB':>10}{'blocks':>9}  line",
+    ]
+    for stat in statistics[:top]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"{stat.size / 1024:>10.1f}{stat.count:>9}  {Path(frame.filename).name}:{frame.lineno}"
+        )
+    return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profiled(
+    modes: Iterable[str],
+    output: Path | str = DEFAULT_OUTPUT,
+    *,
+    top: int = DEFAULT_TOP,
+    stream: TextIO | None = None,
+) -> Iterator[None]:
+    """Run the block under the ``cpu``/``sample``/``alloc`` profilers in ``modes``.
+
+    When the block ends, also with an error, each profiler writes
+    ``output`` plus its suffix and prints its summary to ``stream`` (stderr).
+    Profilers run together see each other's overhead; the sampler is started
+    first and tracemalloc last, so at least cProfile skips the sampler thread
+    (before Python 3.12) and tracemalloc's snapshot precedes the pstats data."""
+    wanted = set(modes)
+    alloc = AllocTracker() if "alloc" in wanted else None
+    cpu = CpuProfiler() if "cpu" in wanted else None
+    sampler = StackSampler() if "sample" in wanted else None
+    prefix = Path(output).resolve()
+    prefix.parent.mkdir(parents=True, exist_ok=True)
+    out = stream or sys.stderr
+    started = time.perf_counter()
+    for profiler in (sampler, cpu, alloc):
+        if profiler is not None:
+            profiler.start()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        reports: list[str] = []
+        if alloc is not None:
+            snapshot = alloc.stop()
+            path = prefix.with_name(prefix.name + ".tracemalloc")
+            snapshot.dump(str(path))
+            reports.append(f"Allocations -> {path}\n" + format_alloc(snapshot, alloc.peak, top))
+        if cpu is not None:
+            stats = cpu.stop()
+            path = prefix.with_name(prefix.name + ".pstats")
+            stats.dump_stats(path)
+            reports.insert(0, f"CPU profile -> {path}\n" + format_cpu(stats, top))
+        if sampler is not None:
+            stacks = sampler.stop()
+            path = prefix.with_name(prefix.name + ".collapsed")
+            path.write_text(sampler.collapsed(), encoding="utf-8")
+            reports.insert(
+                0,
+                f"Stack samples: {sampler.samples} over {seconds:.2f} s -> {path}\n"
+                + format_samples(stacks, top),
+            )
+        for report in reports:
+            print(report, file=out)
+
+
+__all__ = [
+    "DEFAULT_OUTPUT",
+    "DEFAULT_TOP",
+    "MODES",
+    "SAMPLE_INTERVAL",
+    "AllocTracker",
+    "CpuProfiler",
+    "StackSampler",
+    "format_alloc",
+    "format_cpu",
+    "format_samples",
+    "parse_modes",
+    "profiled",
+]
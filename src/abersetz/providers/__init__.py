@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from .base import Engine, EngineBase, EngineError, EngineRequest, EngineResult
+from .base import Engine, EngineBase, EngineError, EngineRequest, EngineResult, Usage
 from .deep_translator import DeepTranslatorEngine
 from .gguf import LocalGgufEngine
 from .llm import LlmEngine
 from .lmstudio import LmstudioEngine
 from .mlx import LocalMlxEngine
+from .mock import MockEngine
 from .translators import TranslatorsEngine
 
 __all__ = [
@@ -16,10 +17,12 @@ __all__ = [
     "EngineError",
     "EngineRequest",
     "EngineResult",
+    "Usage",
     "DeepTranslatorEngine",
     "LocalGgufEngine",
     "LmstudioEngine",
     "LlmEngine",
     "LocalMlxEngine",
+    "MockEngine",
     "TranslatorsEngine",
 ]
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import threading
+from collections.abc import Generator, Mapping
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Protocol
 
+from .. import metrics, tracing
 from ..chunking import TextFormat
 
 
@@ -12,6 +15,39 @@ class EngineError(RuntimeError):
     """Raised when an engine cannot be constructed or invoked."""
 
 
+_retry_counter = threading.local()
+
+
+def note_retry(retry_state: Any) -> None:
+    """``tenacity`` ``before_sleep`` hook counting retries on the calling thread.
+
+    The pipeline resets the counter per file and reads it back for run reports.
+    Each retry also counts in the retry and rate-limit metrics and, with
+    tracing on, is a ``retry`` event on the engine-call span."""
+    _retry_counter.value = getattr(_retry_counter, "value", 0) + 1
+    outcome = getattr(retry_state, "outcome", None)
+    error = outcome.exception() if outcome is not None and outcome.failed else None
+    metrics.record_retry(error)
+    if tracing.enabled():
+        next_action = getattr(retry_state, "next_action", None)
+        tracing.add_event(
+            "retry",
+            attempt=getattr(retry_state, "attempt_number", None),
+            wait=getattr(next_action, "sleep", None),
+            error=None if error is None else f"{type(error).__name__}: {error}",
+        )
+
+
+def reset_retry_count() -> None:
+    """Zero the retry counter for the current thread."""
+    _retry_counter.value = 0
+
+
+def retry_count() -> int:
+    """Return retries recorded on the current thread since the last reset."""
+    return getattr(_retry_counter, "value", 0)
+
+
 @dataclass(slots=True)
 class EngineRequest:
     """Payload passed to engines."""
@@ -20,18 +56,49 @@ class EngineRequest:
     source_lang: str
     target_lang: str
     is_html: bool
-    voc: dict[str, str]
-    prolog: dict[str, str]
+    voc: Mapping[str, str]
+    prolog: Mapping[str, str]
     chunk_index: int
     total_chunks: int
 
 
+@dataclass(slots=True)
+class Usage:
+    """What one engine call consumed, as far as the provider reports it.
+
+    Token-billed APIs fill in the token counts from their ``usage`` field;
+    character-billed ones (DeepL, Microsoft) set ``billed_chars``."""
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    billed_chars: int = 0
+
+    @classmethod
+    def from_openai(cls, usage: Any) -> Usage | None:
+        """Read an OpenAI-style ``usage`` mapping or object; ``None`` if absent."""
+        if not usage:
+            return None
+
+        def field_value(name: str) -> int:
+            value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+            return int(value or 0)
+
+        return cls(field_value("prompt_tokens"), field_value("completion_tokens"))
+
+    def add(self, other: Usage | None) -> None:
+        if other is not None:
+            self.prompt_tokens += other.prompt_tokens
+            self.completion_tokens += other.completion_tokens
+            self.billed_chars += other.billed_chars
+
+
 @dataclass(slots=True)
 class EngineResult:
     """Normalized engine output."""
 
     text: str
-    voc: dict[str, str]
+    voc: Mapping[str, str]
+    usage: Usage | None = None
 
 
 class Engine(Protocol):
@@ -49,7 +116,14 @@ class Engine(Protocol):
 
 
 class EngineBase:
-    """Shared helpers for engines."""
+    """Shared helpers for engines.
+
+    ``max_concurrency`` is how many chunks the engine can translate at once;
+    ``static_voc`` marks engines that return the request vocabulary unchanged,
+    whose chunks therefore do not depend on each other."""
+
+    max_concurrency: int = 1
+    static_voc: bool = False
 
     def __init__(
         self,
@@ -61,6 +135,24 @@ class EngineBase:
         self.chunk_size = chunk_size
         self.html_chunk_size = html_chunk_size
 
+    def translate_stream(self, request: EngineRequest) -> Generator[str, None, EngineResult]:
+        """Yield the translation as text deltas, then return the final result.
+
+        Engines that can stream override this; the default translates the whole
+        chunk and yields it at once."""
+        result: EngineResult = self.translate(request)  # type: ignore[attr-defined]
+        if result.text:
+            yield result.text
+        return result
+
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        """Return the entries of ``voc`` that a request for ``text`` puts in the prompt.
+
+        The pipeline keys its chunk cache on them, so terms a chunk never sees
+        do not change its key. Engines that send less than the whole
+        vocabulary override this; the result must be a subset of ``voc``."""
+        return voc
+
     def chunk_size_for(self, fmt: TextFormat) -> int | None:
         if fmt is TextFormat.HTML and self.html_chunk_size:
             return self.html_chunk_size
@@ -7,7 +7,7 @@ from collections.abc import Mapping
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import EngineConfig
-from .base import EngineBase, EngineError, EngineRequest, EngineResult
+from .base import EngineBase, EngineError, EngineRequest, EngineResult, Usage, note_retry
 
 
 class DeepTranslatorEngine(EngineBase):
@@ -32,6 +32,8 @@ class DeepTranslatorEngine(EngineBase):
     """
 
     PROVIDERS: Mapping[str, type] | None = None
+    CHAR_BILLED = frozenset({"deepl", "microsoft"})
+    """Providers that bill per source character; their results report ``billed_chars``."""
 
     @classmethod
     def _get_providers(cls) -> Mapping[str, type]:
@@ -145,7 +147,12 @@ class DeepTranslatorEngine(EngineBase):
                 return code
         return lang
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, max=10), reraise=True)
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, max=10),
+        reraise=True,
+        before_sleep=note_retry,
+    )
     def _translate_with_retry(self, text: str, source_lang: str, target_lang: str) -> str:
         """Internal method with retry logic for network failures."""
         resolved_source = self._resolve_lang(source_lang)
@@ -153,6 +160,10 @@ class DeepTranslatorEngine(EngineBase):
         translator = self._provider_class(source=resolved_source, target=resolved_target)
         return translator.translate(text)
 
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        return {}  # the vocabulary is never sent to the translation service
+
     def translate(self, request: EngineRequest) -> EngineResult:
         text = self._translate_with_retry(request.text, request.source_lang, request.target_lang)
-        return EngineResult(text=text, voc=dict(request.voc))
+        usage = Usage(billed_chars=len(request.text)) if self.provider in self.CHAR_BILLED else None
+        return EngineResult(text=text, voc=request.voc, usage=usage)
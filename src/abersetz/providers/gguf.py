@@ -2,12 +2,106 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import functools
+from collections.abc import Callable, Generator, Mapping
 from typing import Any
 
 from ..config import EngineConfig
+from ..glossary import DEFAULT_LIMIT as DEFAULT_GLOSSARY_LIMIT
+from ..glossary import Glossary, relevant_terms
 from .base import EngineBase, EngineError, EngineRequest, EngineResult
-from .mlx import _resolve_mthy_language, build_mthy_prompt, resolve_and_download_model
+from .guardrails import FAMILY_STOPS, GenerationLimits, RepetitionGuard
+from .loader import ModelLoader
+from .mlx import (
+    _resolve_mthy_language,
+    build_mthy_prompt,
+    model_cache_name,
+    resolve_and_download_model,
+)
+from .scheduler import SlotPool, threads_per_slot
+from .speculative import DEFAULT_DRAFT_TOKENS, CountingDraft, GgufDraftModel, SpeculationStats
+from .streaming import DeltaFilter, filter_deltas
+from .workers import ProcessWorkerPool
+
+
+def _load_context(
+    n_threads: int | None,
+    *,
+    model_path: str,
+    n_gpu_layers: int,
+    n_ctx: int,
+    prompt_cache_mb: int,
+    draft_path: str | None = None,
+    draft_tokens: int = DEFAULT_DRAFT_TOKENS,
+    prompt_lookup: int = 0,
+) -> Any:
+    import llama_cpp
+
+    context: dict[str, Any] = {"n_gpu_layers": n_gpu_layers, "n_ctx": n_ctx, "n_threads": n_threads}
+    extra: dict[str, Any] = {}
+    if draft_path:
+        draft_llm = llama_cpp.Llama(model_path=draft_path, verbose=False, **context)
+        extra["draft_model"] = CountingDraft(GgufDraftModel(draft_llm, draft_tokens))
+    elif prompt_lookup > 0:
+        from llama_cpp.llama_speculative import LlamaPromptLookupDecoding
+
+        lookup = LlamaPromptLookupDecoding(num_pred_tokens=prompt_lookup)
+        extra["draft_model"] = CountingDraft(lookup)
+    llm = llama_cpp.Llama(model_path=model_path, **context, verbose=False, **extra)
+    if prompt_cache_mb > 0:
+        # One cache per slot: LlamaRAMCache is not safe to share across threads.
+        llm.set_cache(llama_cpp.LlamaRAMCache(capacity_bytes=prompt_cache_mb << 20))
+    return llm
+
+
+def _stop_on_loop(llm: Any, guard: RepetitionGuard) -> Callable[[Any, Any], Any]:
+    """Logits processor that forces end-of-sequence once ``guard`` sees a loop."""
+    prompt_length: list[int] = []
+
+    def process(input_ids: Any, scores: Any) -> Any:
+        if not prompt_length:
+            prompt_length.append(len(input_ids))
+        generated = list(input_ids[prompt_length[0] :][-guard.window :])
+        if guard.looping(generated):
+            scores[:] = float("-inf")
+            scores[llm.token_eos()] = 0.0
+        return scores
+
+    return process
+
+
+def _generation_kwargs(
+    llm: Any, limits: GenerationLimits, source_text: str, target_lang: str
+) -> dict[str, Any]:
+    source_tokens = llm.tokenize(source_text.encode("utf-8"), add_bos=False)
+    kwargs: dict[str, Any] = {"max_tokens": limits.budget(len(source_tokens), target_lang)}
+    if limits.stops:
+        kwargs["stop"] = list(limits.stops)
+    if limits.repetition_guard:
+        kwargs["logits_processor"] = _stop_on_loop(llm, RepetitionGuard(source_tokens))
+    return kwargs
+
+
+def _draft_counts(llm: Any, generated: int) -> tuple[int, int, int] | None:
+    draft = getattr(llm, "draft_model", None)
+    return draft.take(generated) if isinstance(draft, CountingDraft) else None
+
+
+def _complete(
+    llm: Any,
+    messages: list[dict[str, Any]],
+    source_text: str,
+    target_lang: str,
+    limits: GenerationLimits,
+    temperature: float,
+) -> tuple[str, tuple[int, int, int] | None]:
+    output = llm.create_chat_completion(
+        messages=messages,
+        temperature=temperature,
+        **_generation_kwargs(llm, limits, source_text, target_lang),
+    )
+    generated = int((output.get("usage") or {}).get("completion_tokens", 0))
+    return output["choices"][0]["message"]["content"], _draft_counts(llm, generated)
 
 
 class LocalGgufEngine(EngineBase):
@@ -33,8 +127,44 @@ class LocalGgufEngine(EngineBase):
       a matching build of ``llama-cpp-python``.
     **Model size**: Q8_0 quantisation gives good quality at ~8 GB for 7 B models;
       Q4_K_M halves that at a modest quality cost.
+    **Concurrency**: ``slots > 1`` keeps that many llama.cpp contexts over the
+      same mmap-ed weights and decodes independent chunks in parallel, splitting
+      ``n_threads`` between them. Each slot adds one ``n_ctx`` KV cache.
+    **Prompt cache**: llama.cpp already skips re-evaluating the token prefix a
+      context shares with its previous prompt. ``prompt_cache_mb`` adds a RAM
+      cache of saved context states per slot, so the instruction and glossary
+      prefix is restored instead of recomputed even after a different prompt
+      (or another file's glossary) has passed through the slot.
+    **Worker processes**: ``workers > 1`` runs the model in that many processes
+      instead, each pinned to its own slice of the CPUs with ``n_threads`` set
+      to the slice size, fed from one shared queue. This scales CPU inference
+      past the point where one llama.cpp thread pool stops helping; the mmap-ed
+      weights are shared through the page cache. ``workers`` takes precedence
+      over ``slots`` (each worker holds one context).
+    **Loading**: The model is resolved and loaded on the first translation that
+      misses the cache, so fully cached reruns never load it. ``warmup=True``
+      starts loading in a background thread as soon as the engine is built.
+    **Guardrails**: Each chunk may generate at most its own token count times
+      an expansion ratio for the target language (``expansion`` overrides it),
+      capped by ``max_tokens``. Generation ends at the family's end-of-turn
+      marker, and ``repetition_guard`` ends it early once the output keeps
+      repeating a short token run that the source does not contain.
+    **Speculative decoding**: ``draft`` names a smaller GGUF model of the same
+      tokenizer family (``1.8b-gguf`` for ``7b-gguf``). It drafts
+      ``draft_tokens`` tokens greedily per step, and the target model verifies
+      them in one batch. Output is unchanged; acceptance is tracked in
+      :attr:`speculation`.
+    **Prompt lookup**: ``prompt_lookup=N`` drafts up to ``N`` tokens by
+      finding the latest generated n-gram in the prompt and proposing what
+      followed it there. Translations copy identifiers, numbers, names, URLs
+      and markup verbatim, so this speeds up decoding without a second model.
+      A ``draft`` model takes precedence.
     """
 
+    # Hy-MT2/Gemma prompts carry the vocabulary but never extend it, so chunks
+    # are independent and the pipeline may dispatch them concurrently.
+    static_voc = True
+
     def __init__(
         self,
         family: str,
@@ -46,36 +176,88 @@ class LocalGgufEngine(EngineBase):
         n_gpu_layers: int,
         n_ctx: int,
         n_threads: int | None = None,
+        slots: int = 1,
+        prompt_cache_mb: int = 0,
+        workers: int = 1,
+        warmup: bool = False,
+        expansion: float | None = None,
+        repetition_guard: bool = True,
+        glossary_limit: int = DEFAULT_GLOSSARY_LIMIT,
+        draft: str | None = None,
+        draft_tokens: int = DEFAULT_DRAFT_TOKENS,
+        prompt_lookup: int = 0,
     ) -> None:
         super().__init__(config.name, config.chunk_size, config.html_chunk_size)
         self._family = family
         self._max_tokens = max_tokens
+        self._limits = GenerationLimits(
+            max_tokens=max_tokens,
+            expansion=expansion,
+            repetition_guard=repetition_guard,
+            stops=FAMILY_STOPS.get(family, ()),
+        )
         self._temperature = temperature
+        self._glossary_limit = max(int(glossary_limit), 0)
+        self._glossary = Glossary()
+        self._workers = max(int(workers), 1)
+        self._slot_count = max(int(slots), 1)
+        self.max_concurrency = self._workers if self._workers > 1 else self._slot_count
+        self._model_path = model_path
+        self._n_threads = n_threads
+        self._loader_kwargs = {
+            "n_gpu_layers": n_gpu_layers,
+            "n_ctx": n_ctx,
+            "prompt_cache_mb": prompt_cache_mb,
+        }
+        self._draft = draft or None
+        self._draft_tokens = draft_tokens
+        self._prompt_lookup = max(int(prompt_lookup), 0)
+        speculative = bool(self._draft or self._prompt_lookup)
+        self.speculation: SpeculationStats | None = SpeculationStats() if speculative else None
+        self._model_name = model_cache_name(model_path, "gguf")
+        self._loader: ModelLoader[SlotPool[Any] | ProcessWorkerPool] = ModelLoader(
+            self._load, warm=warmup
+        )
 
-        resolved_path = resolve_and_download_model(model_path, "gguf")
-        self._model_name = Path(resolved_path).name
+    def _load(self) -> SlotPool[Any] | ProcessWorkerPool:
+        resolved_path = resolve_and_download_model(self._model_path, "gguf")
         try:
-            from llama_cpp import Llama
+            import llama_cpp  # noqa: F401
         except Exception as exc:  # pragma: no cover
             raise EngineError("llama-cpp-python is required for GGUF engines") from exc
-        self._llm = Llama(
+        draft_path = resolve_and_download_model(self._draft, "gguf") if self._draft else None
+        loader = functools.partial(
+            _load_context,
             model_path=resolved_path,
-            n_gpu_layers=n_gpu_layers,
-            n_ctx=n_ctx,
-            n_threads=n_threads,
-            verbose=False,
+            draft_path=draft_path,
+            draft_tokens=self._draft_tokens,
+            prompt_lookup=self._prompt_lookup,
+            **self._loader_kwargs,
         )
+        if self._workers > 1:
+            return ProcessWorkerPool(loader, self._workers, n_threads=self._n_threads)
+        slot_threads = threads_per_slot(self._n_threads, self._slot_count)
+        return SlotPool(functools.partial(loader, slot_threads), self._slot_count)
 
-    def translate(self, request: EngineRequest) -> EngineResult:
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        if self._family != "mthy":
+            return {}  # only the Hy-MT prompt lists vocabulary terms
+        return relevant_terms(text, voc, limit=self._glossary_limit, glossary=self._glossary)
+
+    def _messages(self, request: EngineRequest) -> list[dict[str, Any]]:
         if self._family == "mthy":
+            # The source text comes last so consecutive chunks share the longest
+            # possible token prefix (see ``mthy_prompt_prefix``).
             prompt = build_mthy_prompt(
                 source_text=request.text,
                 target_language=_resolve_mthy_language(request.target_lang),
                 voc=request.voc,
+                limit=self._glossary_limit,
+                glossary=self._glossary,
             )
             mthy_messages: list[dict[str, Any]] = [{"role": "user", "content": prompt}]
-            chat_messages = mthy_messages
-        elif self._family == "gemma":
+            return mthy_messages
+        if self._family == "gemma":
             source_lang = request.source_lang if request.source_lang != "auto" else "en"
             gemma_messages: list[dict[str, Any]] = [
                 {
@@ -90,13 +272,49 @@ class LocalGgufEngine(EngineBase):
                     ],
                 }
             ]
-            chat_messages = gemma_messages
+            return gemma_messages
+        raise EngineError(f"Unsupported GGUF family '{self._family}'")
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        chat_messages = self._messages(request)
+        pool = self._loader.get()
+        args = (chat_messages, request.text, request.target_lang, self._limits, self._temperature)
+        if isinstance(pool, ProcessWorkerPool):
+            chunk_result, counts = pool.call(_complete, *args)
         else:
-            raise EngineError(f"Unsupported GGUF family '{self._family}'")
-        output = self._llm.create_chat_completion(
-            messages=chat_messages,
-            max_tokens=self._max_tokens,
-            temperature=self._temperature,
-        )
-        chunk_result = output["choices"][0]["message"]["content"]
-        return EngineResult(text=chunk_result, voc=dict(request.voc))
+            with pool.acquire() as llm:
+                chunk_result, counts = _complete(llm, *args)
+        self._record(counts)
+        return EngineResult(text=chunk_result, voc=request.voc)
+
+    def translate_stream(self, request: EngineRequest) -> Generator[str, None, EngineResult]:
+        """Stream tokens with ``stream=True``; worker processes return whole chunks."""
+        chat_messages = self._messages(request)
+        pool = self._loader.get()
+        if isinstance(pool, ProcessWorkerPool):
+            return (yield from super().translate_stream(request))
+        with pool.acquire() as llm:
+            stream = llm.create_chat_completion(
+                messages=chat_messages,
+                temperature=self._temperature,
+                stream=True,
+                **_generation_kwargs(llm, self._limits, request.text, request.target_lang),
+            )
+            deltas = (
+                chunk["choices"][0]["delta"].get("content") or ""
+                for chunk in stream
+                if chunk["choices"]
+            )
+            text = yield from filter_deltas(deltas, DeltaFilter())
+            generated = len(llm.tokenize(text.encode("utf-8"), add_bos=False))
+            self._record(_draft_counts(llm, generated))
+        return EngineResult(text=text, voc=request.voc)
+
+    def _record(self, counts: tuple[int, int, int] | None) -> None:
+        if counts is None or self.speculation is None:
+            return
+        self.speculation.record(*counts)
+        from loguru import logger
+
+        drafted, accepted, generated = counts
+        logger.debug(f"{self.name}: accepted {accepted}/{drafted} draft tokens ({generated} total)")
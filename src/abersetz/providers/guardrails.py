@@ -0,0 +1,151 @@
+# this_file: src/abersetz/providers/guardrails.py
+"""Output-length guardrails for local generation.
+
+Small quantised translation models occasionally fall into a loop and keep
+generating until ``max_tokens``, which turns one bad chunk into the slowest
+part of a run. Three limits keep a chunk's worst case close to its normal cost:
+
+* :func:`token_budget` caps new tokens at the chunk's own token count times an
+  expansion ratio for the target language, never above the configured
+  ``max_tokens``;
+* :class:`RepetitionGuard` spots a generated tail that keeps repeating one
+  short token sequence, unless the source itself contains that repetition,
+  so the engine can end generation early;
+* :data:`FAMILY_STOPS` lists the end-of-turn markers each prompt family emits,
+  so generation ends there instead of being trimmed afterwards."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+DEFAULT_EXPANSION = 2.0
+"""New tokens allowed per source token when the target has no entry below."""
+
+EXPANSION_RATIOS: dict[str, float] = {
+    # Scripts that common tokenizers split into many short pieces.
+    "bo": 4.0,
+    "gu": 3.0,
+    "hi": 3.0,
+    "km": 4.0,
+    "mr": 3.0,
+    "my": 4.0,
+    "ta": 3.0,
+    "te": 3.0,
+    "th": 3.0,
+}
+"""Per-target-language overrides of :data:`DEFAULT_EXPANSION`."""
+
+BUDGET_FLOOR = 32
+"""Minimum new tokens, so very short chunks still have room for a reply."""
+
+FAMILY_STOPS: dict[str, tuple[str, ...]] = {
+    "gemma": ("<end_of_turn>",),
+    "mthy": (),
+}
+
+
+def expansion_ratio(target_lang: str, expansion: float | None = None) -> float:
+    """Return the expansion ratio for ``target_lang`` (``expansion`` wins if set)."""
+    if expansion is not None:
+        return float(expansion)
+    code = target_lang.lower().split("-")[0]
+    return EXPANSION_RATIOS.get(code, DEFAULT_EXPANSION)
+
+
+def token_budget(
+    source_tokens: int,
+    target_lang: str,
+    ceiling: int,
+    *,
+    expansion: float | None = None,
+) -> int:
+    """Return the new-token budget for a chunk of ``source_tokens`` tokens."""
+    wanted = math.ceil(source_tokens * expansion_ratio(target_lang, expansion))
+    return max(min(ceiling, max(wanted, BUDGET_FLOOR)), 1)
+
+
+def _contains(haystack: Sequence[int], needle: Sequence[int]) -> bool:
+    size = len(needle)
+    first = needle[0]
+    return any(
+        haystack[index] == first and list(haystack[index : index + size]) == list(needle)
+        for index in range(len(haystack) - size + 1)
+    )
+
+
+@dataclass(frozen=True)
+class GenerationLimits:
+    """Per-engine generation limits, picklable for worker processes.
+
+    ``max_tokens`` is the hard ceiling; :meth:`budget` narrows it per chunk.
+    ``stops`` are the family's end-of-turn markers."""
+
+    max_tokens: int
+    expansion: float | None = None
+    repetition_guard: bool = True
+    stops: tuple[str, ...] = ()
+
+    def budget(self, source_tokens: int, target_lang: str) -> int:
+        """Return the new-token budget for one chunk."""
+        return token_budget(source_tokens, target_lang, self.max_tokens, expansion=self.expansion)
+
+
+class RepetitionGuard:
+    """Detect generation stuck repeating one short token sequence.
+
+    A tail made of at least ``min_repeats`` back-to-back copies of a unit of up
+    to ``max_period`` tokens, covering at least ``min_span`` tokens, counts as
+    a loop, unless the same run already occurs in ``source_tokens`` (tables,
+    rulers and other legitimately repetitive input)."""
+
+    def __init__(
+        self,
+        source_tokens: Sequence[int] = (),
+        *,
+        max_period: int = 32,
+        min_repeats: int = 4,
+        min_span: int = 16,
+    ) -> None:
+        self._source = list(source_tokens)
+        self._max_period = max_period
+        self._min_repeats = min_repeats
+        self._min_span = min_span
+        self.tripped = False
+
+    @property
+    def window(self) -> int:
+        """How many trailing tokens :meth:`looping` needs to see."""
+        return self._max_period * self._min_repeats + self._min_span
+
+    def looping(self, generated: Sequence[int]) -> bool:
+        """Return whether the tail of ``generated`` is a loop (and remember it)."""
+        if self.tripped:
+            return True
+        count = len(generated)
+        for period in range(1, self._max_period + 1):
+            repeats = max(self._min_repeats, math.ceil(self._min_span / period))
+            span = period * repeats
+            if span > count:
+                break
+            tail = generated[count - span :]
+            unit = tail[-period:]
+            if all(tail[offset] == unit[offset % period] for offset in range(span)):
+                if self._source and _contains(self._source, tail):
+                    continue
+                self.tripped = True
+                return True
+        return False
+
+
+__all__ = [
+    "BUDGET_FLOOR",
+    "DEFAULT_EXPANSION",
+    "EXPANSION_RATIOS",
+    "FAMILY_STOPS",
+    "GenerationLimits",
+    "RepetitionGuard",
+    "expansion_ratio",
+    "token_budget",
+]
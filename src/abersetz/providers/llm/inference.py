@@ -3,13 +3,16 @@ from __future__ import annotations
 
 import json
 import re
-from collections.abc import Mapping
+from collections.abc import Generator, Mapping
 from typing import Any
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ...config import EngineConfig
-from ..base import EngineBase, EngineRequest, EngineResult
+from ...glossary import DEFAULT_LIMIT, Glossary, relevant_terms
+from ...vocabulary import Vocabulary
+from ..base import EngineBase, EngineRequest, EngineResult, Usage, note_retry
+from ..streaming import DeltaFilter, filter_deltas
 
 
 class LlmEngine(EngineBase):
@@ -45,37 +48,83 @@ class LlmEngine(EngineBase):
         model: str,
         temperature: float,
         static_prolog: Mapping[str, str] | None = None,
+        glossary_limit: int = DEFAULT_LIMIT,
     ) -> None:
         super().__init__(config.name, config.chunk_size, config.html_chunk_size)
         self._client = client
         self._model = model
         self._temperature = temperature
         self._static_prolog = dict(static_prolog or {})
+        self._glossary_limit = max(int(glossary_limit), 0)
+        self._glossary = Glossary()
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1), reraise=True)
-    def _invoke(self, messages: list[dict[str, str]]) -> str:
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1),
+        reraise=True,
+        before_sleep=note_retry,
+    )
+    def _invoke(self, messages: list[dict[str, str]]) -> tuple[str, Usage | None]:
         response = self._client.chat.completions.create(
             model=self._model,
             messages=messages,
             temperature=self._temperature,
         )
-        return response.choices[0].message.content or ""
+        usage = Usage.from_openai(getattr(response, "usage", None))
+        return response.choices[0].message.content or "", usage
+
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        return relevant_terms(text, voc, limit=self._glossary_limit, glossary=self._glossary)
 
     def translate(self, request: EngineRequest) -> EngineResult:
         voc = dict(self._static_prolog)
         voc.update(request.prolog)
-        merged = dict(request.voc)
-        messages = self._build_messages(request, voc, merged)
-        raw = self._invoke(messages)
+        current = Vocabulary(request.voc)
+        messages = self._build_messages(request, voc, current)
+        raw, usage = self._invoke(messages)
+        text, new_vocab = self._parse_payload(raw)
+        return EngineResult(text=text, voc=current.merge(new_vocab), usage=usage)
+
+    def translate_stream(self, request: EngineRequest) -> Generator[str, None, EngineResult]:
+        """Stream the ``<output>`` body as it arrives, then parse the full reply.
+
+        The request is sent with ``stream=True`` and is not retried once sent.
+        Token usage is reported only if the server adds it to a chunk."""
+        voc = dict(self._static_prolog)
+        voc.update(request.prolog)
+        current = Vocabulary(request.voc)
+        messages = self._build_messages(request, voc, current)
+        stream = self._client.chat.completions.create(
+            model=self._model,
+            messages=messages,
+            temperature=self._temperature,
+            stream=True,
+            # OpenAI-style servers only report usage on a stream when asked.
+            stream_options={"include_usage": True},
+        )
+        usage: list[Usage] = []
+
+        def deltas() -> Generator[str, None, None]:
+            for chunk in stream:
+                reported = Usage.from_openai(getattr(chunk, "usage", None))
+                if reported is not None:
+                    usage[:] = [reported]
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+
+        raw = yield from filter_deltas(
+            deltas(), DeltaFilter(start="<output>", stops=("</output>",), strip=True)
+        )
         text, new_vocab = self._parse_payload(raw)
-        merged.update(new_vocab)
-        return EngineResult(text=text, voc=merged)
+        return EngineResult(
+            text=text, voc=current.merge(new_vocab), usage=usage[0] if usage else None
+        )
 
     def _build_messages(
         self,
         request: EngineRequest,
         voc: Mapping[str, str],
-        merged: Mapping[str, str],
+        merged: Vocabulary,
     ) -> list[dict[str, str]]:
         """Build the chat-completion message list for a single chunk.
 
@@ -85,9 +134,11 @@ class LlmEngine(EngineBase):
            explanatory commentary around its answer.
         2. **Vocabulary continuity** — ``<prolog>`` carries the running vocabulary
            dictionary forward across chunks so the model honours consistent term
-           choices made in earlier chunks.  ``<voc>`` in the response lets the
-           model propose new terminology entries that get merged into the next
-           chunk's prolog.
+           choices made in earlier chunks.  Only the terms that occur in this
+           chunk are sent (at most ``glossary_limit``, see :mod:`abersetz.glossary`),
+           so the prompt does not grow with the vocabulary.  ``<voc>`` in the
+           response lets the model propose new terminology entries that get
+           merged into the next chunk's prolog.
         3. **Context for streaming multi-chunk docs** — ``<meta>`` tells the model
            which chunk of how many it is seeing, and whether the content is HTML,
            which helps it avoid escaping or restructuring markup unnecessarily.
@@ -98,13 +149,21 @@ class LlmEngine(EngineBase):
         but clean XML is faster and more accurate.
         """
         vocab_payload: dict[str, str] = dict(voc)
-        if merged:
+        if not self._glossary_limit:
+            # Unlimited: the whole vocabulary, whose JSON is cached on the object.
+            current = merged.to_json() if merged else ""
+        else:
+            terms = relevant_terms(
+                request.text, merged, limit=self._glossary_limit, glossary=self._glossary
+            )
+            current = json.dumps(terms, ensure_ascii=False) if terms else ""
+        if current:
             # Inject the accumulated cross-chunk vocabulary so the model can
             # respect earlier terminology choices within the same document.
-            vocab_payload.setdefault("__current__", json.dumps(merged, ensure_ascii=False))
+            vocab_payload.setdefault("__current__", current)
         prolog = json.dumps(vocab_payload, ensure_ascii=False) if vocab_payload else "{}"
         meta = {
-            "chunk": request.chunk_index + 1,   # 1-based for human readability
+            "chunk": request.chunk_index + 1,  # 1-based for human readability
             "total": request.total_chunks,
             "is_html": str(request.is_html).lower(),
         }
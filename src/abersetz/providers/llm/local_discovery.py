@@ -1,14 +1,17 @@
 # this_file: src/abersetz/providers/llm/local_discovery.py
 from __future__ import annotations
 
+import contextlib
 import json
 import os
 import shutil
 import subprocess
 import tempfile
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 import fire
 
@@ -41,6 +44,16 @@ class LocalModelFinder:
         # Bundle formats (directories)
         self.target_bundles = {"CoreML": [".mlpackage"]}
 
+        # Modification times of the directories the last scan looked at; a
+        # model index compares them to tell whether a rescan is needed.
+        self.scanned_dirs: dict[str, float] = {}
+
+        # Per-directory listings of the last scan, reused by the next one.
+        self.listings: dict[str, Any] = {}
+
+        # The model index that stores the listings between runs (``None``: under config_dir()).
+        self.index_path: Path | None = None
+
     def _get_lmstudio_path(self) -> Path:
         """Determine LM Studio models path gracefully."""
         pointer_path = self.home / ".lmstudio-home-pointer"
@@ -72,12 +85,37 @@ class LocalModelFinder:
         # Only return paths that actually exist on this system
         return {app: path for app, path in paths.items() if path.exists()}
 
-    def _get_dir_size(self, path: Path) -> int:
-        """Calculate total size of a directory recursively."""
-        try:
-            return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
-        except Exception:
-            return 0
+    def _get_dir_size(self, path: Path | str) -> int:
+        """Calculate total size of a directory recursively (one ``scandir`` per directory)."""
+        total = 0
+        pending = [str(path)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file():
+                            total += entry.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    @staticmethod
+    def _newest_dir_mtime(path: str) -> float:
+        """Return the newest mtime of ``path`` and the directories below it."""
+        newest = os.stat(path).st_mtime
+        pending = [path]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            newest = max(newest, entry.stat(follow_symlinks=False).st_mtime)
+            except OSError:
+                continue
+        return newest
 
     def _format_matches(self, format_name: str, format_filter: str | None) -> bool:
         """Return whether a discovered model format passes the CLI filter."""
@@ -148,113 +186,221 @@ class LocalModelFinder:
             )
         return models
 
+    def _file_record(
+        self, app_name: str, directory: str, entry: os.DirEntry[str]
+    ) -> dict[str, Any] | None:
+        """Describe a model file, or return ``None`` for files of no interest."""
+        name = entry.name
+        model_format: str | None
+        # Ollama stores GGUF weights as extensionless sha256 blobs.
+        in_blobs = os.path.basename(directory) == "blobs"
+        if app_name == "Ollama" and in_blobs and name.startswith("sha256-"):
+            model_format, kind = "GGUF", "blob"
+        else:
+            ext = os.path.splitext(name)[1].lower()
+            labels = (label for label, exts in self.target_extensions.items() if ext in exts)
+            model_format, kind = next(labels, None), "file"
+            if model_format is None:
+                return None
+        size = entry.stat().st_size
+        return {
+            "path": entry.path,
+            "name": name,
+            "format": model_format,
+            "size": size,
+            "kind": kind,
+        }
+
+    def _bundle_record(self, path: str, previous: Mapping[str, Any] | None) -> dict[str, Any]:
+        """Describe a bundle directory, reusing its size while the bundle is unchanged.
+
+        The size is keyed on the newest mtime of any directory in the bundle, so
+        weights added or replaced under ``Data/`` are noticed; like elsewhere in
+        the index, a file rewritten in place keeps its size until then."""
+        mtime = self._newest_dir_mtime(path)
+        if previous is not None and previous.get("mtime") == mtime:
+            size = int(previous["size"])
+        else:
+            size = self._get_dir_size(path)
+        return {
+            "path": path,
+            "name": os.path.basename(path),
+            "format": "CoreML",
+            "size": size,
+            "kind": "bundle",
+            "mtime": mtime,
+        }
+
+    def _list_directory(
+        self, app_name: str, directory: str, mtime: float, previous: Mapping[str, Any] | None
+    ) -> dict[str, Any]:
+        """List one directory: the models directly in it and the subdirectories to visit."""
+        bundles = {
+            record["path"]: record
+            for record in (previous or {}).get("models", [])
+            if record.get("kind") == "bundle"
+        }
+        models: list[dict[str, Any]] = []
+        subdirs: list[str] = []
+        with os.scandir(directory) as iterator:
+            entries = list(iterator)
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    if any(entry.name.endswith(ext) for ext in self.target_bundles["CoreML"]):
+                        # Don't recurse into the bundle
+                        models.append(self._bundle_record(entry.path, bundles.get(entry.path)))
+                    elif not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
+                record = self._file_record(app_name, directory, entry)
+            except OSError:
+                continue
+            if record is not None:
+                models.append(record)
+        return {"mtime": mtime, "models": models, "dirs": subdirs}
+
+    def _refresh_bundles(self, listing: dict[str, Any]) -> dict[str, Any]:
+        """Return a reused ``listing`` with its bundles re-measured if they changed inside."""
+        if not any(record.get("kind") == "bundle" for record in listing["models"]):
+            return listing
+        models: list[dict[str, Any]] = []
+        for record in listing["models"]:
+            if record.get("kind") == "bundle":
+                with contextlib.suppress(OSError):
+                    record = self._bundle_record(record["path"], record)
+            models.append(record)
+        return {**listing, "models": models}
+
+    def _scan_tree(
+        self, app_name: str, root: Path, previous: Mapping[str, Any]
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        """Walk ``root`` top-down, re-listing only directories whose mtime changed.
+
+        Adding, removing or renaming an entry updates its directory's mtime, so
+        an unchanged directory costs one ``stat`` and its stored listing is
+        reused; only the bundles in it are checked again. Files rewritten in
+        place keep their recorded size until their directory changes."""
+        listings: dict[str, Any] = {}
+        records: list[dict[str, Any]] = []
+        pending = [str(root)]
+        while pending:
+            directory = pending.pop()
+            try:
+                mtime = os.stat(directory).st_mtime
+                listing = previous.get(directory)
+                if not isinstance(listing, dict) or listing.get("mtime") != mtime:
+                    listing = self._list_directory(app_name, directory, mtime, listing)
+                else:
+                    listing = self._refresh_bundles(listing)
+            except OSError:
+                continue
+            listings[directory] = listing
+            records.extend(listing["models"])
+            pending.extend(reversed(listing["dirs"]))
+        return records, listings
+
+    @staticmethod
+    def _filter_key(record: Mapping[str, Any]) -> str:
+        """Return what a format filter is compared with: a file's extension, else its format."""
+        if record["kind"] == "file":
+            return os.path.splitext(record["name"])[1].lower().lstrip(".")
+        return str(record["format"]).lower().replace(".", "")
+
+    def _directory_mtimes(self, *paths: Path) -> dict[str, float]:
+        mtimes: dict[str, float] = {}
+        for path in paths:
+            with contextlib.suppress(OSError):
+                mtimes[str(path)] = os.stat(path).st_mtime
+        return mtimes
+
+    def _scan_app(
+        self, app_name: str, app_path: Path, previous: Mapping[str, Any]
+    ) -> tuple[list[tuple[LocalModel, str]], dict[str, Any], dict[str, float]]:
+        """Scan one app root; return its models with their filter keys, listings and mtimes."""
+        if app_name == "LMStudio":
+            lmstudio_models = self._discover_lmstudio_cli_models(None, 0)
+            if lmstudio_models:
+                # LM Studio keeps models at <root>/<publisher>/<model>.
+                try:
+                    publishers = [path for path in app_path.iterdir() if path.is_dir()]
+                except OSError:
+                    publishers = []
+                keyed = [
+                    (model, model.format.lower().replace(".", "")) for model in lmstudio_models
+                ]
+                return keyed, {}, self._directory_mtimes(app_path, *publishers)
+
+        records, listings = self._scan_tree(app_name, app_path, previous)
+        models = [
+            (
+                LocalModel(
+                    path=Path(record["path"]),
+                    name=record["name"],
+                    app=app_name,
+                    format=record["format"],
+                    size=record["size"],
+                ),
+                self._filter_key(record),
+            )
+            for record in records
+        ]
+        mtimes = {directory: listing["mtime"] for directory, listing in listings.items()}
+        return models, listings, mtimes
+
+    def scan_directories(self) -> list[tuple[LocalModel, str]]:
+        """Scan every app root, reusing :attr:`listings`, and return all models found.
+
+        Each model comes with the key a format filter is compared with. App
+        roots are scanned concurrently; afterwards :attr:`listings` and
+        :attr:`scanned_dirs` describe this scan."""
+        search_paths = self._get_search_paths()
+        previous = self.listings
+        with ThreadPoolExecutor(
+            max_workers=max(len(search_paths), 1), thread_name_prefix="abersetz-discover"
+        ) as pool:
+            scans = [
+                pool.submit(self._scan_app, app, path, previous)
+                for app, path in search_paths.items()
+            ]
+            results = [scan.result() for scan in scans]
+
+        found: list[tuple[LocalModel, str]] = []
+        self.listings = {}
+        self.scanned_dirs = {}
+        for models, app_listings, mtimes in results:
+            found.extend(models)
+            self.listings.update(app_listings)
+            self.scanned_dirs.update(mtimes)
+        return found
+
     def discover_models(
         self, format_filter: str | None = None, min_size_mb: float = 100.0
     ) -> list[LocalModel]:
         """Scan for AI models on disk.
 
+        The scan goes through the persistent model index, which keeps the
+        directory listings next to the models found in them: a warm scan only
+        lists the directories that changed since the previous one, and the
+        index is rebuilt from the same scan.
+
         Args:
             format_filter: (Optional) Filter by a specific extension, e.g. 'gguf' or 'safetensors'.
             min_size_mb: Minimum file size in MB to filter out small configs (default: 100.0).
         """
-        search_paths = self._get_search_paths()
-        min_size_bytes = int(min_size_mb * 1024 * 1024)
-        discovered: list[LocalModel] = []
+        from ..model_index import ModelIndex
 
-        for app_name, app_path in search_paths.items():
-            if app_name == "LMStudio":
-                lmstudio_models = self._discover_lmstudio_cli_models(format_filter, min_size_bytes)
-                if lmstudio_models:
-                    discovered.extend(lmstudio_models)
-                    continue
-
-            for root, dirs, files in os.walk(app_path):
-                root_path = Path(root)
-
-                # 1. Check for Directory Bundles (like CoreML .mlpackage)
-                # We iterate backwards to safely remove items from the list during iteration
-                for i in range(len(dirs) - 1, -1, -1):
-                    d = dirs[i]
-                    if any(d.endswith(ext) for ext in self.target_bundles["CoreML"]):
-                        bundle_path = root_path / d
-
-                        if format_filter and format_filter.lower() != "coreml":
-                            del dirs[i]
-                            continue
-
-                        size = self._get_dir_size(bundle_path)
-                        if size >= min_size_bytes:
-                            discovered.append(
-                                LocalModel(
-                                    path=bundle_path,
-                                    name=d,
-                                    app=app_name,
-                                    format="CoreML",
-                                    size=size,
-                                )
-                            )
-                        # Don't recurse into the mlpackage bundle
-                        del dirs[i]
-
-                # 2. Check for Standard Model Files
-                for f in files:
-                    file_path = root_path / f
-
-                    # Special handling for Ollama (stored as extensionless sha256 blobs)
-                    if (
-                        app_name == "Ollama"
-                        and root_path.name == "blobs"
-                        and f.startswith("sha256-")
-                    ):
-                        if format_filter and format_filter.lower() != "gguf":
-                            continue
-                        try:
-                            size = file_path.stat().st_size
-                            if size >= min_size_bytes:
-                                discovered.append(
-                                    LocalModel(
-                                        path=file_path,
-                                        name=f,
-                                        app=app_name,
-                                        format="GGUF",
-                                        size=size,
-                                    )
-                                )
-                        except OSError:
-                            pass
-                        continue
-
-                    # General extension matching
-                    ext = file_path.suffix.lower()
-                    if format_filter:
-                        fmt_clean = format_filter.lower().replace(".", "")
-                        if f".{fmt_clean}" != ext:
-                            continue
-
-                    # Identify the format label
-                    matched_format = None
-                    for fmt_label, extensions in self.target_extensions.items():
-                        if ext in extensions:
-                            matched_format = fmt_label
-                            break
-
-                    if matched_format:
-                        try:
-                            size = file_path.stat().st_size
-                            if size >= min_size_bytes:
-                                discovered.append(
-                                    LocalModel(
-                                        path=file_path,
-                                        name=f,
-                                        app=app_name,
-                                        format=matched_format,
-                                        size=size,
-                                    )
-                                )
-                        except OSError:
-                            pass
-
-        return discovered
+        index = ModelIndex(self.index_path)
+        index.load()
+        found = index.rebuild(self)
+        index.save()
+        min_size_bytes = int(min_size_mb * 1024 * 1024)
+        wanted = (format_filter or "").lower().replace(".", "")
+        return [
+            model
+            for model, key in found
+            if model.size >= min_size_bytes and (not wanted or key == wanted)
+        ]
 
     def scan(self, format: str | None = None, min_size_mb: float = 100.0) -> None:
         """CLI wrapper for scan visualization."""
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+from collections.abc import Generator, Mapping
+
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import EngineConfig
-from .base import EngineBase, EngineError, EngineRequest, EngineResult
+from .base import EngineBase, EngineError, EngineRequest, EngineResult, note_retry
+from .streaming import DeltaFilter, filter_deltas
 
 
 class LmstudioEngine(EngineBase):
@@ -103,21 +106,41 @@ class LmstudioEngine(EngineBase):
         except Exception as e:
             logger.warning(f"Failed to start LM Studio daemon: {e}")
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1), reraise=True)
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1),
+        reraise=True,
+        before_sleep=note_retry,
+    )
     def _invoke(self, prompt: str) -> str:
-        config = {}
-        if self._temperature is not None:
-            config["temperature"] = self._temperature
-        return str(self._model.respond(prompt, config=config))
+        return str(self._model.respond(prompt, config=self._config()))
 
-    def translate(self, request: EngineRequest) -> EngineResult:
+    def _prompt(self, request: EngineRequest) -> str:
         language_name = self._language_name(request.target_lang)
-        prompt = (
+        return (
             f"Translate the following segment into {language_name}, without additional explanation.\n\n"
             f"{request.text}"
         )
-        text = self._invoke(prompt).strip()
-        return EngineResult(text=text, voc=dict(request.voc))
+
+    def _config(self) -> dict[str, float]:
+        config: dict[str, float] = {}
+        if self._temperature is not None:
+            config["temperature"] = self._temperature
+        return config
+
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        return {}  # the vocabulary is never sent to the model
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        text = self._invoke(self._prompt(request)).strip()
+        return EngineResult(text=text, voc=request.voc)
+
+    def translate_stream(self, request: EngineRequest) -> Generator[str, None, EngineResult]:
+        """Stream prediction fragments via ``respond_stream`` (not retried once started)."""
+        stream = self._model.respond_stream(self._prompt(request), config=self._config())
+        deltas = (fragment.content for fragment in stream)
+        raw = yield from filter_deltas(deltas, DeltaFilter(strip=True))
+        return EngineResult(text=raw.strip(), voc=request.voc)
 
     @staticmethod
     def _language_name(code: str) -> str:
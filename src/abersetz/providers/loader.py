@@ -0,0 +1,71 @@
+# this_file: src/abersetz/providers/loader.py
+"""Deferred model loading for local inference engines.
+
+Resolving, downloading and loading a multi-GB model can take far longer than
+discovering and chunking the files it will translate, and a rerun whose
+chunks all hit the translation cache never needs the model at all. A
+:class:`ModelLoader` runs the load on first use instead of at engine
+construction; with ``warm=True`` it starts the load in a background thread
+right away, so discovery, chunking and cache lookups overlap with it and the
+first cache miss only waits for whatever is left."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class ModelLoader(Generic[T]):
+    """Call ``load`` at most once, on first :meth:`get` or in a warm-up thread.
+
+    Concurrent callers share the one load. A failed load is not retried: every
+    later :meth:`get` re-raises the same error, so a missing model fails each
+    file fast instead of reloading per chunk."""
+
+    def __init__(self, load: Callable[[], T], *, warm: bool = False) -> None:
+        self._load = load
+        self._lock = threading.Lock()
+        self._future: Future[T] | None = None
+        if warm:
+            self.start()
+
+    @property
+    def started(self) -> bool:
+        """Whether the load has begun (or finished)."""
+        return self._future is not None
+
+    def start(self) -> None:
+        """Begin loading in a background thread unless a load already began."""
+        with self._lock:
+            if self._future is not None:
+                return
+            future: Future[T] = Future()
+            self._future = future
+        threading.Thread(
+            target=self._run, args=(future,), name="abersetz-model-warmup", daemon=True
+        ).start()
+
+    def get(self) -> T:
+        """Return the loaded model, loading it in this thread if nobody has yet."""
+        with self._lock:
+            future = self._future
+            owner = future is None
+            if future is None:
+                future = self._future = Future()
+        if owner:
+            self._run(future)
+        return future.result()
+
+    def _run(self, future: Future[T]) -> None:
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(self._load())
+        except BaseException as exc:
+            future.set_exception(exc)
+
+
+__all__ = ["ModelLoader"]
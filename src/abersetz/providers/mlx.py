@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from ..config import EngineConfig
+from ..glossary import DEFAULT_LIMIT as DEFAULT_GLOSSARY_LIMIT
+from ..glossary import Glossary, relevant_terms
 from .base import EngineBase, EngineError, EngineRequest, EngineResult
+from .guardrails import FAMILY_STOPS, GenerationLimits, RepetitionGuard
+from .loader import ModelLoader
+from .speculative import DEFAULT_DRAFT_TOKENS, SpeculationStats
+from .streaming import DeltaFilter, filter_deltas
 
 MTHY_LANGUAGE_DATA = """
 Chinese	zh	中文
@@ -65,15 +73,119 @@ def _resolve_mthy_language(code: str) -> str:
     return resolved
 
 
-def build_mthy_prompt(
-    source_text: str, target_language: str, voc: dict[str, str] | None = None
-) -> str:
-    """Build prompting format for Hy-MT2 with optional terminology intervention."""
+def mthy_prompt_prefix(target_language: str, voc: Mapping[str, str] | None = None) -> str:
+    """Return the part of a Hy-MT2 prompt before the source text (glossary + instruction).
+
+    Chunks that list the same terms share this prefix, so local engines can
+    reuse its KV cache and evaluate only the source text that follows."""
     terms_part = ""
     if voc:
         terms = "".join(f"{src}翻译成{tgt}" for src, tgt in sorted(voc.items()))
         terms_part = f"参考下面的翻译：{terms}"
-    return f"{terms_part}将以下文本翻译为{target_language}，注意只需要输出翻译后的结果，不要额外解释：{source_text}"
+    return (
+        f"{terms_part}将以下文本翻译为{target_language}，注意只需要输出翻译后的结果，不要额外解释："
+    )
+
+
+def build_mthy_prompt(
+    source_text: str,
+    target_language: str,
+    voc: Mapping[str, str] | None = None,
+    *,
+    limit: int = DEFAULT_GLOSSARY_LIMIT,
+    glossary: Glossary | None = None,
+) -> str:
+    """Build prompting format for Hy-MT2 with optional terminology intervention.
+
+    Only the ``voc`` terms that occur in ``source_text`` are listed, at most
+    ``limit`` of them (``0`` lists all); ``glossary`` is the engine's term index."""
+    terms = relevant_terms(source_text, voc, limit=limit, glossary=glossary) if voc else None
+    return f"{mthy_prompt_prefix(target_language, terms)}{source_text}"
+
+
+def _common_prefix_length(left: list[int], right: list[int]) -> int:
+    length = 0
+    for a, b in zip(left, right, strict=False):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
+class _MlxPromptCache:
+    """Keep one ``mlx_lm`` KV cache and reuse its longest shared token prefix.
+
+    Before each call the cache is trimmed back to the tokens the new prompt has
+    in common with the previous one (the instruction and glossary), so only
+    the chunk-specific suffix is evaluated. After the call the generated
+    tokens are trimmed off again, leaving exactly the prompt in the cache.
+    With a ``draft_model`` the cache holds the target layers followed by the
+    draft layers, as speculative generation expects; each part is trimmed by
+    its own length."""
+
+    def __init__(self, model: Any, api: Any, draft_model: Any | None = None) -> None:
+        self._model = model
+        self._draft_model = draft_model
+        self._api = api
+        self._cache: list[Any] | None = None
+        self._split = 0
+        self._tokens: list[int] = []
+
+    def prepare(self, tokens: list[int]) -> tuple[list[int], list[Any]]:
+        """Return the tokens still to evaluate and the cache to evaluate them into."""
+        if self._cache is None:
+            self._reset()
+        assert self._cache is not None
+        # ``generate`` needs at least one fresh token to produce logits from.
+        common = min(_common_prefix_length(self._tokens, tokens), len(tokens) - 1)
+        for part in self._parts():
+            stale = _cached_length(part) - common
+            if stale <= 0:
+                continue
+            if self._api.can_trim_prompt_cache(part):
+                self._api.trim_prompt_cache(part, stale)
+            else:
+                self._reset()
+                common = 0
+                break
+        self._tokens = list(tokens)
+        assert self._cache is not None
+        return list(tokens[common:]), self._cache
+
+    def settle(self) -> None:
+        """Drop generated tokens so the cache again ends at the prompt."""
+        for part in self._parts():
+            extra = _cached_length(part) - len(self._tokens)
+            if extra > 0 and self._api.can_trim_prompt_cache(part):
+                self._api.trim_prompt_cache(part, extra)
+            elif extra != 0:
+                self._cache = None
+                return
+
+    def discard(self) -> None:
+        """Forget the cache after a failed call left it in an unknown state."""
+        self._cache = None
+        self._tokens = []
+
+    def _reset(self) -> None:
+        self._cache = self._api.make_prompt_cache(self._model)
+        self._split = len(self._cache)
+        if self._draft_model is not None:
+            self._cache = self._cache + self._api.make_prompt_cache(self._draft_model)
+        self._tokens = []
+
+    def _parts(self) -> list[list[Any]]:
+        if not self._cache:
+            return []
+        if self._draft_model is None:
+            return [self._cache]
+        return [self._cache[: self._split], self._cache[self._split :]]
+
+
+def _cached_length(cache: list[Any]) -> int:
+    if not cache:
+        return 0
+    return int(getattr(cache[0], "offset", 0))
 
 
 # Known models and their details
@@ -147,67 +259,37 @@ ALIASES = {
 }
 
 
+DEFAULT_MODELS = {
+    "mlx": "p0we7/Hy-MT2-1.8B-oQ8-fp16",
+    "gguf": "tencent/Hy-MT2-1.8B-GGUF",
+}
+
+
 def find_local_model_path(model_identifier: str, backend: str) -> str | None:
-    """Query LocalModelFinder to locate the model locally on disk."""
+    """Look the model up in the persistent local model index (see ``model_index``)."""
     try:
-        from .llm.local_discovery import LocalModelFinder
-
-        finder = LocalModelFinder()
-
-        # Determine format filter for discovery
-        fmt_filter = "gguf" if backend == "gguf" else None
-        discovered = finder.discover_models(format_filter=fmt_filter)
-
-        target = model_identifier.replace("\\", "/").strip().lower()
-        target_parts = [p for p in target.split("/") if p]
-
-        for m in discovered:
-            path_str = str(m.path).replace("\\", "/").lower()
-
-            def get_return_path(p: Path) -> str:
-                if backend == "mlx" and p.is_file():
-                    return str(p.parent)
-                return str(p)
-
-            # 1. Direct containment match (e.g. "p0we7/hy-mt2-1.8b-oq8-fp16")
-            if target in path_str:
-                return get_return_path(m.path)
-
-            # 2. Hugging Face snapshot path style (replaces / with --)
-            hf_target = target.replace("/", "--")
-            if hf_target in path_str:
-                return get_return_path(m.path)
-
-            # 3. Match suffix parts if multiple parts present
-            if len(target_parts) >= 2:
-                subtarget = "/".join(target_parts[-2:])
-                if subtarget in path_str:
-                    return get_return_path(m.path)
-                hf_subtarget = "--".join(target_parts[-2:])
-                if hf_subtarget in path_str:
-                    return get_return_path(m.path)
-
-            # 4. Match by exact model name
-            if target_parts and target_parts[-1] == m.name.lower():
-                return get_return_path(m.path)
-    except Exception:
-        pass
-    return None
+        from .model_index import ModelIndex
 
+        return ModelIndex.open().lookup(model_identifier, backend)
+    except Exception:
+        return None
 
-def resolve_and_download_model(model_name_or_path: str | None, backend: str) -> str:
-    """Resolve local path or LMStudio path, downloading via huggingface_hub if needed."""
-    if not model_name_or_path:
-        model_name_or_path = (
-            "p0we7/Hy-MT2-1.8B-oQ8-fp16" if backend == "mlx" else "tencent/Hy-MT2-1.8B-GGUF"
-        )
 
+def _reject_legacy_model(model_name_or_path: str) -> None:
     normalized_path = str(model_name_or_path).replace("\\", "/")
     if any(
         legacy in normalized_path for legacy in ["Hunyuan-MT-7B", "Hunyuan-MT1", "Hy-MT1", "HY-MT1"]
     ):
         raise EngineError("Hy-MT1.x models are no longer supported. Please upgrade to Hy-MT2.")
 
+
+def resolve_and_download_model(model_name_or_path: str | None, backend: str) -> str:
+    """Resolve local path or LMStudio path, downloading via huggingface_hub if needed."""
+    if not model_name_or_path:
+        model_name_or_path = DEFAULT_MODELS[backend]
+
+    _reject_legacy_model(model_name_or_path)
+
     # 1. Direct path that exists
     p = Path(model_name_or_path)
     if p.exists():
@@ -266,6 +348,53 @@ def resolve_and_download_model(model_name_or_path: str | None, backend: str) ->
     raise EngineError(f"Model path/identifier not found: {model_name_or_path}")
 
 
+def model_cache_name(model_name_or_path: str | None, backend: str) -> str:
+    """Return the model name used in translation cache keys, without loading anything.
+
+    Engines load lazily, so the name must come from the identifier rather
+    than from :func:`resolve_and_download_model`, which may search the disk or
+    download. Paths give their final component (as the resolved path would),
+    known repos their GGUF filename, and other identifiers their last segment."""
+    identifier = str(model_name_or_path or DEFAULT_MODELS[backend])
+    _reject_legacy_model(identifier)
+    path = Path(identifier)
+    if path.exists():
+        return path.resolve().name
+    key = ALIASES.get(identifier.lower(), identifier)
+    info = KNOWN_MAPPING.get(key)
+    if info and "filename" in info:
+        return info["filename"]
+    return key.replace("\\", "/").rstrip("/").rsplit("/", 1)[-1]
+
+
+@dataclass(slots=True)
+class _MlxModel:
+    model: Any
+    tokenizer: Any
+    generate: Callable[..., str]
+    prompt_cache: _MlxPromptCache | None
+    stream_generate: Callable[..., Iterator[Any]] | None = None
+    draft_model: Any = None
+
+
+def _stop_on_loop(tokenizer: Any, guard: RepetitionGuard) -> Callable[[Any, Any], Any]:
+    """``mlx_lm`` logits processor that forces end-of-sequence once ``guard`` sees a loop."""
+    prompt_length: list[int] = []
+
+    def process(tokens: Any, logits: Any) -> Any:
+        if not prompt_length:
+            prompt_length.append(len(tokens))
+        generated = tokens[prompt_length[0] :][-guard.window :].tolist()
+        if not guard.looping(generated):
+            return logits
+        import mlx.core as mx
+
+        eos = mx.arange(logits.shape[-1]) == tokenizer.eos_token_id
+        return mx.where(eos, mx.zeros_like(logits), mx.full(logits.shape, -mx.inf))
+
+    return process
+
+
 class LocalMlxEngine(EngineBase):
     """Local translation engine using the ``mlx_lm`` framework (Apple Silicon only).
 
@@ -288,6 +417,22 @@ class LocalMlxEngine(EngineBase):
       Install with ``pip install abersetz[mlx]``.
     **Model download**: First-time use triggers a Hugging Face download (several GB).
       Subsequent runs use the cached snapshot.
+    **Prompt cache**: The KV cache of the prompt prefix shared by consecutive
+      chunks (instruction and glossary) is kept and reused; pass
+      ``prompt_cache=False`` to evaluate every prompt from scratch.
+    **Loading**: The model is resolved and loaded on the first translation that
+      misses the cache, so fully cached reruns never load it. ``warmup=True``
+      starts loading in a background thread as soon as the engine is built.
+    **Guardrails**: Each chunk may generate at most its own token count times
+      an expansion ratio for the target language (``expansion`` overrides it),
+      capped by ``max_tokens``. Generation ends at the family's end-of-turn
+      marker, and ``repetition_guard`` ends it early once the output keeps
+      repeating a short token run that the source does not contain.
+    **Speculative decoding**: ``draft`` names a smaller MLX model of the same
+      tokenizer family (``1.8b-mlx`` for the 7B). It proposes ``draft_tokens``
+      tokens per step through ``mlx_lm``'s ``draft_model`` support, and the
+      target model verifies them in one batch. Output is unchanged; acceptance
+      is tracked in :attr:`speculation`.
     """
 
     def __init__(
@@ -297,42 +442,159 @@ class LocalMlxEngine(EngineBase):
         model_path: str,
         *,
         max_tokens: int,
+        prompt_cache: bool = True,
+        warmup: bool = False,
+        expansion: float | None = None,
+        repetition_guard: bool = True,
+        glossary_limit: int = DEFAULT_GLOSSARY_LIMIT,
+        draft: str | None = None,
+        draft_tokens: int = DEFAULT_DRAFT_TOKENS,
     ) -> None:
         super().__init__(config.name, config.chunk_size, config.html_chunk_size)
         self._family = family
         self._max_tokens = max_tokens
-
-        resolved_path = resolve_and_download_model(model_path, "mlx")
-        self._model_name = Path(resolved_path).name
+        self._limits = GenerationLimits(
+            max_tokens=max_tokens,
+            expansion=expansion,
+            repetition_guard=repetition_guard,
+            stops=FAMILY_STOPS.get(family, ()),
+        )
+        self._model_path = model_path
+        self._use_prompt_cache = prompt_cache
+        self._glossary_limit = max(int(glossary_limit), 0)
+        self._glossary = Glossary()
+        self._draft = draft or None
+        self._draft_tokens = max(int(draft_tokens), 1)
+        self.speculation: SpeculationStats | None = SpeculationStats() if draft else None
+        self._model_name = model_cache_name(model_path, "mlx")
+        self._loader: ModelLoader[_MlxModel] = ModelLoader(self._load, warm=warmup)
+
+    def _load(self) -> _MlxModel:
+        resolved_path = resolve_and_download_model(self._model_path, "mlx")
         try:
             from mlx_lm import generate, load
         except Exception as exc:  # pragma: no cover
             raise EngineError("mlx-lm is required for MLX engines") from exc
-        self._generate = generate
-        self._model, self._tokenizer = load(resolved_path)
-
-    def translate(self, request: EngineRequest) -> EngineResult:
+        model, tokenizer = load(resolved_path)
+        if hasattr(tokenizer, "add_eos_token"):
+            for stop in self._limits.stops:
+                tokenizer.add_eos_token(stop)
+        draft_model = None
+        if self._draft:
+            draft_model, _ = load(resolve_and_download_model(self._draft, "mlx"))
+        prompt_cache: _MlxPromptCache | None = None
+        if self._use_prompt_cache:
+            try:
+                from mlx_lm.models import cache as cache_api
+            except Exception:  # older mlx-lm without reusable prompt caches
+                cache_api = None
+            if cache_api is not None:
+                prompt_cache = _MlxPromptCache(model, cache_api, draft_model)
+        try:
+            from mlx_lm import stream_generate
+        except ImportError:  # older mlx-lm: translate_stream falls back to whole chunks
+            stream_generate = None
+        return _MlxModel(model, tokenizer, generate, prompt_cache, stream_generate, draft_model)
+
+    @staticmethod
+    def _tokens(loaded: _MlxModel, prompt: str) -> list[int]:
+        # Tokenise the way ``mlx_lm.generate`` would, so only the suffix is fed.
+        bos = getattr(loaded.tokenizer, "bos_token", None)
+        add_special = bos is None or not prompt.startswith(bos)
+        return list(loaded.tokenizer.encode(prompt, add_special_tokens=add_special))
+
+    def _generation_kwargs(self, loaded: _MlxModel, request: EngineRequest) -> dict[str, Any]:
+        source_tokens = list(loaded.tokenizer.encode(request.text, add_special_tokens=False))
+        budget = self._limits.budget(len(source_tokens), request.target_lang)
+        kwargs: dict[str, Any] = {"max_tokens": budget}
+        if self._limits.repetition_guard:
+            guard = RepetitionGuard(source_tokens)
+            kwargs["logits_processors"] = [_stop_on_loop(loaded.tokenizer, guard)]
+        if loaded.draft_model is not None:
+            kwargs["draft_model"] = loaded.draft_model
+            kwargs["num_draft_tokens"] = self._draft_tokens
+        return kwargs
+
+    def _run(self, loaded: _MlxModel, prompt: str, limits: dict[str, Any]) -> str:
+        if loaded.draft_model is not None and loaded.stream_generate is not None:
+            # Streaming reports which tokens came from the draft.
+            return "".join(self._stream(loaded, prompt, limits))
+        if loaded.prompt_cache is None:
+            return loaded.generate(
+                loaded.model, loaded.tokenizer, prompt=prompt, verbose=False, **limits
+            )
+        suffix, cache = loaded.prompt_cache.prepare(self._tokens(loaded, prompt))
+        try:
+            text = loaded.generate(
+                loaded.model,
+                loaded.tokenizer,
+                prompt=suffix,
+                verbose=False,
+                prompt_cache=cache,
+                **limits,
+            )
+        except BaseException:
+            loaded.prompt_cache.discard()
+            raise
+        loaded.prompt_cache.settle()
+        return text
+
+    def _stream(self, loaded: _MlxModel, prompt: str, limits: dict[str, Any]) -> Iterator[str]:
+        assert loaded.stream_generate is not None
+        if loaded.prompt_cache is None:
+            responses = loaded.stream_generate(loaded.model, loaded.tokenizer, prompt, **limits)
+            yield from self._texts(responses)
+            return
+        suffix, cache = loaded.prompt_cache.prepare(self._tokens(loaded, prompt))
+        try:
+            responses = loaded.stream_generate(
+                loaded.model,
+                loaded.tokenizer,
+                suffix,
+                prompt_cache=cache,
+                **limits,
+            )
+            yield from self._texts(responses)
+        except BaseException:  # includes GeneratorExit when the consumer stops early
+            loaded.prompt_cache.discard()
+            raise
+        loaded.prompt_cache.settle()
+
+    def _texts(self, responses: Iterable[Any]) -> Iterator[str]:
+        generated = accepted = 0
+        for response in responses:
+            generated += 1
+            accepted += bool(getattr(response, "from_draft", False))
+            yield response.text
+        if self.speculation is not None:
+            # Every verification step ends with one token of the target's own,
+            # after proposing ``draft_tokens`` (fewer only near the end).
+            drafted = (generated - accepted) * self._draft_tokens
+            self.speculation.record(drafted, accepted, generated)
+
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        if self._family != "mthy":
+            return {}  # only the Hy-MT prompt lists vocabulary terms
+        return relevant_terms(text, voc, limit=self._glossary_limit, glossary=self._glossary)
+
+    def _prompt(self, loaded: _MlxModel, request: EngineRequest) -> str:
+        tokenizer = loaded.tokenizer
         if self._family == "mthy":
             prompt = build_mthy_prompt(
                 source_text=request.text,
                 target_language=_resolve_mthy_language(request.target_lang),
                 voc=request.voc,
+                limit=self._glossary_limit,
+                glossary=self._glossary,
             )
-            if hasattr(self._tokenizer, "apply_chat_template") and getattr(
-                self._tokenizer, "chat_template", None
+            if hasattr(tokenizer, "apply_chat_template") and getattr(
+                tokenizer, "chat_template", None
             ):
                 mthy_messages = [{"role": "user", "content": prompt}]
-                prompt = self._tokenizer.apply_chat_template(
+                prompt = tokenizer.apply_chat_template(
                     mthy_messages, tokenize=False, add_generation_prompt=True
                 )
-            text = self._generate(
-                self._model,
-                self._tokenizer,
-                prompt=prompt,
-                max_tokens=self._max_tokens,
-                verbose=False,
-            )
-            return EngineResult(text=text, voc=dict(request.voc))
+            return prompt
         if self._family == "gemma":
             source_lang = request.source_lang if request.source_lang != "auto" else "en"
             gemma_messages: list[dict[str, Any]] = [
@@ -348,17 +610,35 @@ class LocalMlxEngine(EngineBase):
                     ],
                 }
             ]
-            if not hasattr(self._tokenizer, "apply_chat_template"):
+            if not hasattr(tokenizer, "apply_chat_template"):
                 raise EngineError("Gemma MLX tokenizer missing chat template support")
-            prompt = self._tokenizer.apply_chat_template(
+            return tokenizer.apply_chat_template(
                 gemma_messages, tokenize=False, add_generation_prompt=True
             )
-            text = self._generate(
-                self._model,
-                self._tokenizer,
-                prompt=prompt,
-                max_tokens=self._max_tokens,
-                verbose=False,
-            )
-            return EngineResult(text=text.split("<end_of_turn>")[0].strip(), voc=dict(request.voc))
         raise EngineError(f"Unsupported MLX family '{self._family}'")
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        loaded = self._loader.get()
+        text = self._run(
+            loaded, self._prompt(loaded, request), self._generation_kwargs(loaded, request)
+        )
+        if self._family == "gemma":
+            text = text.split("<end_of_turn>")[0].strip()
+        return EngineResult(text=text, voc=request.voc)
+
+    def translate_stream(self, request: EngineRequest) -> Generator[str, None, EngineResult]:
+        """Stream tokens via ``mlx_lm.stream_generate`` when the installed version has it."""
+        loaded = self._loader.get()
+        if loaded.stream_generate is None:
+            return (yield from super().translate_stream(request))
+        prompt = self._prompt(loaded, request)
+        if self._family == "gemma":
+            delta_filter = DeltaFilter(stops=("<end_of_turn>",), strip=True)
+        else:
+            delta_filter = DeltaFilter()
+        limits = self._generation_kwargs(loaded, request)
+        yield from filter_deltas(self._stream(loaded, prompt, limits), delta_filter)
+        text = delta_filter.raw
+        if self._family == "gemma":
+            text = text.split("<end_of_turn>")[0].strip()
+        return EngineResult(text=text, voc=request.voc)
@@ -0,0 +1,148 @@
+# this_file: src/abersetz/providers/mock.py
+"""Offline, deterministic mock engine for benchmarks and tests.
+
+Selected as ``mk::key=value,...``, e.g.
+``mk::latency=50ms,jitter=10ms,fail=0.01,ratio=1.1``. Every call sleeps for
+``latency`` plus or minus up to ``jitter``, fails with probability ``fail``
+and otherwise returns the chunk stretched or cut to ``ratio`` times its
+length (HTML chunks come back unchanged so their structure survives the
+merge). Successful calls report token usage at four characters per token,
+so cost accounting and ``--budget`` can be exercised offline. The random
+draws are seeded from ``seed``, the chunk text and the attempt number, so a
+run behaves the same way at any concurrency. No network, model or API key is
+involved, which keeps pipeline measurements free of provider variance."""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, fields
+from typing import Any
+
+from ..config import EngineConfig
+from .base import EngineBase, EngineError, EngineRequest, EngineResult, Usage, note_retry
+
+_DURATION_UNITS = (("us", 1e-6), ("ms", 1e-3), ("s", 1.0))
+
+
+def parse_duration(value: str) -> float:
+    """Return seconds for ``150us``, ``50ms`` or ``0.2s``; bare numbers are milliseconds."""
+    text = value.strip().lower()
+    number, scale = text, 1e-3
+    for unit, unit_scale in _DURATION_UNITS:
+        if text.endswith(unit):
+            number, scale = text[: -len(unit)], unit_scale
+            break
+    seconds = float(number) * scale
+    if seconds < 0:
+        raise ValueError(f"negative duration '{value}'")
+    return seconds
+
+
+_PARSERS: dict[str, Callable[[str], Any]] = {
+    "latency": parse_duration,
+    "jitter": parse_duration,
+    "fail": float,
+    "ratio": float,
+    "retries": int,
+    "slots": int,
+    "seed": int,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class MockSpec:
+    """Behaviour of a :class:`MockEngine` (durations in seconds)."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    fail: float = 0.0
+    ratio: float = 1.0
+    retries: int = 0
+    slots: int = 1
+    seed: int = 0
+
+    @classmethod
+    def parse(cls, spec: str | None) -> MockSpec:
+        """Parse the ``key=value,...`` provider part of an ``mk::`` selector."""
+        values: dict[str, Any] = {}
+        for item in (spec or "").split(","):
+            if not item.strip():
+                continue
+            key, sep, raw = item.partition("=")
+            key = key.strip().lower()
+            if not sep or key not in _PARSERS:
+                known = ", ".join(_PARSERS)
+                raise EngineError(f"Invalid mock engine option '{item.strip()}' (known: {known})")
+            try:
+                values[key] = _PARSERS[key](raw)
+            except ValueError as exc:
+                raise EngineError(f"Invalid value for mock engine option '{key}': {exc}") from exc
+        parsed = cls(**values)
+        if not 0.0 <= parsed.fail <= 1.0:
+            raise EngineError("Mock engine option 'fail' must be between 0 and 1")
+        if parsed.ratio <= 0 or parsed.slots < 1 or parsed.retries < 0:
+            raise EngineError("Mock engine needs ratio > 0, slots >= 1 and retries >= 0")
+        return parsed
+
+    def describe(self) -> str:
+        """Return the canonical ``key=value`` form (part of the translation cache key)."""
+        return ",".join(f"{item.name}={getattr(self, item.name)}" for item in fields(self))
+
+
+def _stretch(text: str, ratio: float) -> str:
+    size = round(len(text) * ratio)
+    if not text or size <= len(text):
+        return text[:size]
+    return (text * -(-size // len(text)))[:size]
+
+
+def _approx_tokens(text: str) -> int:
+    return -(-len(text) // 4)
+
+
+class MockEngine(EngineBase):
+    """Engine that simulates latency, failures and output length without a provider.
+
+    **Cost**: Free.
+    **Offline**: Yes — nothing leaves the process.
+    **Concurrency**: ``slots`` chunks at once (the ``slots`` engine option wins).
+    """
+
+    static_voc = True
+
+    def __init__(
+        self,
+        spec: MockSpec,
+        config: EngineConfig | None = None,
+        *,
+        slots: int | None = None,
+    ) -> None:
+        cfg = config or EngineConfig(name="mock")
+        super().__init__(cfg.name, cfg.chunk_size, cfg.html_chunk_size)
+        self.spec = spec
+        self.max_concurrency = max(slots if slots is not None else spec.slots, 1)
+        self._model_name = spec.describe()
+
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        return {}  # the output does not depend on the vocabulary
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        spec = self.spec
+        attempts = spec.retries + 1
+        for attempt in range(attempts):
+            rng = random.Random(f"{spec.seed}:{attempt}:{request.text}")
+            delay = max(spec.latency + rng.uniform(-spec.jitter, spec.jitter), 0.0)
+            if delay:
+                time.sleep(delay)
+            if rng.random() >= spec.fail:
+                text = request.text if request.is_html else _stretch(request.text, spec.ratio)
+                usage = Usage(_approx_tokens(request.text), _approx_tokens(text))
+                return EngineResult(text=text, voc=request.voc, usage=usage)
+            if attempt + 1 < attempts:
+                note_retry(None)
+        raise EngineError(f"Mock engine: simulated failure after {attempts} attempt(s)")
+
+
+__all__ = ["MockEngine", "MockSpec", "parse_duration"]
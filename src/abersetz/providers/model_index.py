@@ -0,0 +1,232 @@
+# this_file: src/abersetz/providers/model_index.py
+"""Persistent index of locally discovered models.
+
+Resolving a model alias used to walk every model directory (Hugging Face
+cache, Ollama, LM Studio, Pinokio, GPT4All) and ask ``lms ls`` on each local
+engine construction, which takes seconds on machines with terabytes of
+models. :class:`ModelIndex` keeps the discovery result in
+``model_index.json`` under :func:`~abersetz.config.config_dir`, together with
+the modification times and listings of the directories the scan visited.
+Adding, removing or renaming a model changes the mtime of the directory
+holding it, so one ``stat`` per recorded directory (no listing) tells whether
+the index is still current; only then is the scan repeated, and it lists
+again only the directories that changed. Models, mtimes and listings come
+from the same scan and are written together, so they cannot disagree.
+Lookups go through a key table built from each model's name, repository id
+and known aliases."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ..config import config_dir
+
+INDEX_FILENAME = "model_index.json"
+INDEX_VERSION = 2
+MIN_MODEL_MB = 100.0
+"""Smaller files (configs, tokenizers) are left out of the index."""
+
+
+@dataclass(slots=True)
+class IndexedModel:
+    """One model file (or bundle directory) as recorded in the index."""
+
+    path: str
+    name: str
+    app: str
+    format: str
+    size: int
+    mtime: float
+    aliases: list[str] = field(default_factory=list)
+
+
+def _normalise(identifier: str) -> str:
+    return identifier.replace("\\", "/").strip().strip("/").lower()
+
+
+def _model_keys(path: str, name: str) -> list[str]:
+    """Return the lookup keys of a model: its name and repository ids."""
+    parts = [part for part in path.replace("\\", "/").split("/") if part]
+    keys = [name.lower()]
+    for part in parts:
+        # Hugging Face cache layout: models--<org>--<name>/snapshots/<rev>/...
+        if part.startswith("models--"):
+            keys.append(part[len("models--") :].replace("--", "/").lower())
+    # LM Studio layout: <publisher>/<model>/<file> (or the model directory itself).
+    tail = parts[-3:-1] if Path(path).suffix else parts[-2:]
+    if len(tail) == 2:
+        keys.append("/".join(tail).lower())
+    return list(dict.fromkeys(keys))
+
+
+def _path_matches(target: str, path: str, name: str) -> bool:
+    """Loose match of an identifier against a discovered model path or name."""
+    path_str = path.replace("\\", "/").lower()
+    target_parts = [part for part in target.split("/") if part]
+    if target in path_str or target.replace("/", "--") in path_str:
+        return True
+    if len(target_parts) >= 2:
+        subtarget = target_parts[-2:]
+        if "/".join(subtarget) in path_str or "--".join(subtarget) in path_str:
+            return True
+    return bool(target_parts) and target_parts[-1] == name.lower()
+
+
+def _backend_accepts(model: IndexedModel, backend: str) -> bool:
+    return backend != "gguf" or model.format == "GGUF"
+
+
+class ModelIndex:
+    """Local models by path, with a key table for constant-time lookups.
+
+    :meth:`open` loads the stored index and rescans only if a recorded
+    directory changed (or a model root appeared or vanished)."""
+
+    def __init__(self, path: Path | None = None, *, min_size_mb: float = MIN_MODEL_MB) -> None:
+        self.path = path or config_dir() / INDEX_FILENAME
+        self.min_size = int(min_size_mb * 1024 * 1024)
+        self.models: list[IndexedModel] = []
+        self.roots: dict[str, str] = {}
+        self.directories: dict[str, float] = {}
+        self.listings: dict[str, Any] = {}
+        self._keys: dict[str, list[int]] = {}
+
+    @classmethod
+    def open(
+        cls,
+        path: Path | None = None,
+        finder: Any | None = None,
+        *,
+        min_size_mb: float = MIN_MODEL_MB,
+    ) -> ModelIndex:
+        """Return the stored index, rebuilt first if the model directories changed."""
+        from .llm.local_discovery import LocalModelFinder
+
+        finder = finder or LocalModelFinder()
+        index = cls(path, min_size_mb=min_size_mb)
+        if not index.load() or not index.is_current(finder):
+            index.rebuild(finder)
+            index.save()
+        return index
+
+    def load(self) -> bool:
+        """Read the index file; return ``False`` if it is missing or unusable."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                return False
+            self.models = [IndexedModel(**item) for item in data["models"]]
+            self.roots = dict(data["roots"])
+            self.directories = {key: float(value) for key, value in data["directories"].items()}
+            self.listings = dict(data["listings"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        self._build_keys()
+        return True
+
+    def save(self) -> None:
+        """Write the index atomically; failures only cost the next lookup a rescan."""
+        payload = {
+            "version": INDEX_VERSION,
+            "roots": self.roots,
+            "directories": self.directories,
+            "listings": self.listings,
+            "models": [asdict(model) for model in self.models],
+        }
+        temporary = self.path.with_suffix(".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(temporary, self.path)
+        except OSError as exc:  # pragma: no cover - best effort
+            from loguru import logger
+
+            logger.debug(f"Could not write model index {self.path}: {exc}")
+
+    def is_current(self, finder: Any) -> bool:
+        """Return whether no recorded directory (or model root) has changed."""
+        roots = {app: str(path) for app, path in finder._get_search_paths().items()}
+        if roots != self.roots:
+            return False
+        for directory, mtime in self.directories.items():
+            try:
+                if os.stat(directory).st_mtime != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def rebuild(self, finder: Any) -> list[tuple[Any, str]]:
+        """Rescan the model directories with ``finder`` and rebuild the index.
+
+        The stored listings are handed to the finder, so only changed
+        directories are listed again. Returns every model the scan found,
+        with its format filter key, including those too small to index."""
+        from .mlx import ALIASES
+
+        self.roots = {app: str(path) for app, path in finder._get_search_paths().items()}
+        finder.listings = self.listings
+        found = finder.scan_directories()
+        self.listings = dict(finder.listings)
+        self.directories = dict(finder.scanned_dirs)
+        self.models = []
+        for model, _key in found:
+            if model.size < self.min_size:
+                continue
+            path = str(model.path)
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                mtime = 0.0
+            keys = _model_keys(path, model.name)
+            aliases = [alias for alias, repo in ALIASES.items() if repo.lower() in keys]
+            self.models.append(
+                IndexedModel(
+                    path=path,
+                    name=model.name,
+                    app=model.app,
+                    format=model.format,
+                    size=model.size,
+                    mtime=mtime,
+                    aliases=aliases,
+                )
+            )
+        self._build_keys()
+        return found
+
+    def lookup(self, identifier: str, backend: str) -> str | None:
+        """Return the local path for ``identifier`` usable by ``backend``, if indexed.
+
+        An exact name, repository id or alias is a dictionary hit; anything
+        else falls back to loose matching over the indexed paths."""
+        target = _normalise(identifier)
+        candidates = [self.models[i] for i in self._keys.get(target, [])]
+        match = next((m for m in candidates if _backend_accepts(m, backend)), None)
+        if match is None:
+            match = next(
+                (
+                    model
+                    for model in self.models
+                    if _backend_accepts(model, backend)
+                    and _path_matches(target, model.path, model.name)
+                ),
+                None,
+            )
+        if match is None:
+            return None
+        if backend == "mlx" and Path(match.path).is_file():
+            return str(Path(match.path).parent)
+        return match.path
+
+    def _build_keys(self) -> None:
+        self._keys = {}
+        for position, model in enumerate(self.models):
+            for key in [*_model_keys(model.path, model.name), *model.aliases]:
+                self._keys.setdefault(key, []).append(position)
+
+
+__all__ = ["INDEX_FILENAME", "MIN_MODEL_MB", "IndexedModel", "ModelIndex"]
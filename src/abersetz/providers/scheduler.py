@@ -0,0 +1,85 @@
+# this_file: src/abersetz/providers/scheduler.py
+"""Slot scheduling for local inference engines.
+
+A llama.cpp context owns a single KV cache and must not be driven by two
+threads at once, so one context translates one chunk at a time. A
+:class:`SlotPool` holds up to ``size`` independent contexts ("slots") over the
+same memory-mapped weights — each extra slot costs a KV cache, not another copy
+of the model — and hands them out to concurrent callers. Callers that find
+every slot busy wait in the queue until one is released. llama.cpp releases the
+GIL while it evaluates and decodes, so slots run truly in parallel on the CPU."""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+def threads_per_slot(n_threads: int | None, slots: int) -> int | None:
+    """Split a thread budget across ``slots`` so concurrent decodes don't oversubscribe.
+
+    With one slot the budget (or llama.cpp's own default) is used unchanged."""
+    if slots <= 1:
+        return n_threads
+    budget = n_threads if n_threads is not None else (os.cpu_count() or 1)
+    return max(budget // slots, 1)
+
+
+class SlotPool(Generic[T]):
+    """Hand out up to ``size`` lazily created slots to concurrent callers.
+
+    The first slot is built with the pool, which engines create through
+    :class:`~abersetz.providers.loader.ModelLoader` on first use, so load errors
+    surface on the first translation or warm-up; further slots are only built
+    once callers actually overlap.
+    Idle slots are reused most-recently-released first, which keeps the warmest
+    KV cache in use when load is light."""
+
+    def __init__(self, factory: Callable[[], T], size: int = 1) -> None:
+        self.size = max(int(size), 1)
+        self._factory = factory
+        self._idle: queue.LifoQueue[T] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._idle.put(factory())
+        self._created = 1
+
+    @property
+    def created(self) -> int:
+        """Number of slots built so far."""
+        return self._created
+
+    @contextmanager
+    def acquire(self) -> Iterator[T]:
+        """Borrow a slot for the duration of the ``with`` block."""
+        slot = self._take()
+        try:
+            yield slot
+        finally:
+            self._idle.put(slot)
+
+    def _take(self) -> T:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self._created < self.size
+            if grow:
+                self._created += 1
+        if not grow:
+            return self._idle.get()
+        try:
+            return self._factory()
+        except BaseException:
+            with self._lock:
+                self._created -= 1
+            raise
+
+
+__all__ = ["SlotPool", "threads_per_slot"]
@@ -0,0 +1,108 @@
+# this_file: src/abersetz/providers/speculative.py
+"""Speculative decoding for local engines.
+
+A small draft model from the same tokenizer family (Hy-MT2-1.8B for the 7B)
+proposes a few tokens; the target model checks them in one batched forward
+pass and keeps the prefix it agrees with. Translations track their source
+closely, so drafts are accepted often and each expensive pass of the large
+model yields several tokens. The output is the same as without a draft.
+
+:class:`SpeculationStats` counts drafted and accepted tokens across a run so
+the acceptance rate (and with it the speed-up) can be checked per model pair."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_DRAFT_TOKENS = 4
+"""Tokens the draft model proposes per verification step."""
+
+
+@dataclass
+class SpeculationStats:
+    """Running totals of drafted, accepted and generated tokens (thread-safe)."""
+
+    drafted: int = 0
+    accepted: int = 0
+    generated: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, drafted: int, accepted: int, generated: int) -> None:
+        """Add the counts of one chunk."""
+        with self._lock:
+            self.drafted += drafted
+            self.accepted += accepted
+            self.generated += generated
+
+    @property
+    def acceptance_rate(self) -> float:
+        """Share of drafted tokens the target model accepted."""
+        return self.accepted / self.drafted if self.drafted else 0.0
+
+    def summary(self) -> str:
+        """Return a one-line human-readable summary."""
+        return (
+            f"{self.accepted}/{self.drafted} draft tokens accepted "
+            f"({self.acceptance_rate:.0%}), {self.generated} tokens generated"
+        )
+
+
+class GgufDraftModel:
+    """``llama-cpp-python`` draft model that drafts greedily with a second ``Llama``.
+
+    ``Llama.generate`` keeps the longest token prefix already in the draft
+    context, so each call only evaluates the tokens accepted since the last."""
+
+    def __init__(self, llm: Any, num_pred_tokens: int = DEFAULT_DRAFT_TOKENS) -> None:
+        self._llm = llm
+        self.num_pred_tokens = max(int(num_pred_tokens), 1)
+
+    def __call__(self, input_ids: Any, /, **kwargs: Any) -> Any:
+        import numpy as np
+
+        eos = self._llm.token_eos()
+        tokens = self._llm.generate([int(token) for token in input_ids], temp=0.0)
+        drafted = list(
+            itertools.takewhile(
+                lambda token: token != eos, itertools.islice(tokens, self.num_pred_tokens)
+            )
+        )
+        tokens.close()
+        return np.array(drafted, dtype=np.intc)
+
+
+class CountingDraft:
+    """Wrap a llama.cpp ``draft_model`` and count the steps and tokens it drafts.
+
+    llama.cpp verifies one draft per step and every step also yields one token
+    of its own, so ``generated - steps - 1`` (the first token comes from the
+    prompt pass) estimates how many drafted tokens were accepted."""
+
+    def __init__(self, draft: Any) -> None:
+        self.draft = draft
+        self._steps = 0
+        self._drafted = 0
+
+    def __call__(self, input_ids: Any, /, **kwargs: Any) -> Any:
+        tokens = self.draft(input_ids, **kwargs)
+        self._steps += 1
+        self._drafted += len(tokens)
+        return tokens
+
+    def take(self, generated: int) -> tuple[int, int, int]:
+        """Return ``(drafted, accepted, generated)`` for the last call and reset."""
+        drafted, steps = self._drafted, self._steps
+        self._drafted = self._steps = 0
+        accepted = min(max(generated - steps - 1, 0), drafted)
+        return drafted, accepted, generated
+
+
+__all__ = [
+    "DEFAULT_DRAFT_TOKENS",
+    "CountingDraft",
+    "GgufDraftModel",
+    "SpeculationStats",
+]
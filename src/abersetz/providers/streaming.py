@@ -0,0 +1,112 @@
+# this_file: src/abersetz/providers/streaming.py
+"""Incremental clean-up of streamed model output.
+
+Engines post-process a finished reply: LLM replies are cut down to the body of
+``<output>…</output>``, Gemma replies end at ``<end_of_turn>``, most are
+stripped. A :class:`DeltaFilter` applies the same rules to a reply that
+arrives in pieces, emitting visible text as early as possible. It only holds
+back what it cannot decide yet: text before the start tag, a tail that might
+be the beginning of a stop marker, and trailing whitespace that might turn out
+to end the reply."""
+
+from __future__ import annotations
+
+from collections.abc import Generator, Iterable, Sequence
+
+
+def _partial_marker_length(text: str, markers: Sequence[str]) -> int:
+    """Length of the longest tail of ``text`` that starts one of ``markers``."""
+    longest = 0
+    for marker in markers:
+        for size in range(min(len(marker) - 1, len(text)), longest, -1):
+            if marker.startswith(text[-size:]):
+                longest = size
+                break
+    return longest
+
+
+class DeltaFilter:
+    """Turn raw reply deltas into the visible text, piece by piece.
+
+    ``start`` (matched case-insensitively) drops everything up to and including
+    the marker; if it never appears, :meth:`finish` returns the whole reply,
+    mirroring the non-streaming fallback. ``stops`` end the visible text.
+    ``strip`` trims leading and trailing whitespace of the visible text."""
+
+    def __init__(
+        self, *, start: str | None = None, stops: Sequence[str] = (), strip: bool = False
+    ) -> None:
+        self._start = start.lower() if start else None
+        self._stops = tuple(stop.lower() for stop in stops)
+        self._strip = strip
+        self._parts: list[str] = []
+        self._buffer = ""
+        self._started = start is None
+        self._stopped = False
+        self._emitted = False
+        self._pending_space = ""
+
+    @property
+    def raw(self) -> str:
+        """Everything fed so far, unfiltered."""
+        return "".join(self._parts)
+
+    def feed(self, delta: str) -> str:
+        """Consume one raw delta and return the text that is now safe to show."""
+        self._parts.append(delta)
+        if self._stopped:
+            return ""
+        self._buffer += delta
+        if not self._started:
+            assert self._start is not None
+            index = self._buffer.lower().find(self._start)
+            if index < 0:
+                return ""
+            self._buffer = self._buffer[index + len(self._start) :]
+            self._started = True
+        lowered = self._buffer.lower()
+        cuts = [index for index in (lowered.find(stop) for stop in self._stops) if index >= 0]
+        if cuts:
+            visible = self._buffer[: min(cuts)]
+            self._buffer = ""
+            self._stopped = True
+            return self._emit(visible, final=True)
+        hold = _partial_marker_length(lowered, self._stops)
+        visible = self._buffer[: len(self._buffer) - hold]
+        self._buffer = self._buffer[len(self._buffer) - hold :]
+        return self._emit(visible, final=False)
+
+    def finish(self) -> str:
+        """Return whatever visible text is left once the reply is complete."""
+        if self._stopped:
+            return ""
+        self._stopped = True
+        text, self._buffer = self._buffer, ""
+        return self._emit(text, final=True)
+
+    def _emit(self, text: str, *, final: bool) -> str:
+        if not self._strip:
+            return text
+        if not self._emitted:
+            text = text.lstrip()
+        text = self._pending_space + text
+        trimmed = text.rstrip()
+        self._pending_space = "" if final else text[len(trimmed) :]
+        if trimmed:
+            self._emitted = True
+        return trimmed
+
+
+def filter_deltas(deltas: Iterable[str], delta_filter: DeltaFilter) -> Generator[str, None, str]:
+    """Yield the visible pieces of ``deltas`` and return the full raw reply."""
+    for delta in deltas:
+        visible = delta_filter.feed(delta)
+        if visible:
+            yield visible
+    tail = delta_filter.finish()
+    if tail:
+        yield tail
+    return delta_filter.raw
+
+
+__all__ = ["DeltaFilter", "filter_deltas"]
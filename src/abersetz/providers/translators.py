@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import EngineConfig
-from .base import EngineBase, EngineRequest, EngineResult
+from .base import EngineBase, EngineRequest, EngineResult, note_retry
 
 
 class TranslatorsEngine(EngineBase):
@@ -31,7 +33,12 @@ class TranslatorsEngine(EngineBase):
 
         self._translators = translators
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, max=10), reraise=True)
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, max=10),
+        reraise=True,
+        before_sleep=note_retry,
+    )
     def _translate_with_retry(
         self, text: str, is_html: bool, source_lang: str, target_lang: str
     ) -> str:
@@ -51,8 +58,11 @@ class TranslatorsEngine(EngineBase):
                 to_language=target_lang,
             )
 
+    def prompt_voc(self, text: str, voc: Mapping[str, str]) -> Mapping[str, str]:
+        return {}  # the vocabulary is never sent to the translation service
+
     def translate(self, request: EngineRequest) -> EngineResult:
         text = self._translate_with_retry(
             request.text, request.is_html, request.source_lang, request.target_lang
         )
-        return EngineResult(text=text, voc=dict(request.voc))
+        return EngineResult(text=text, voc=request.voc)
@@ -0,0 +1,116 @@
+# this_file: src/abersetz/providers/workers.py
+"""Multi-process worker pool for CPU-bound local inference.
+
+One llama.cpp context tops out well below the core count of a large server:
+its thread pool stops scaling long before 64 cores. A :class:`ProcessWorkerPool`
+starts ``workers`` processes, pins each to its own contiguous slice of the
+CPUs the parent may use, and lets each load the model with ``n_threads`` equal
+to that slice. Requests go through one shared queue, so an idle worker picks up
+the next chunk. GGUF weights are memory-mapped, so all workers share one copy
+in the page cache; each worker only adds its own KV cache."""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import multiprocessing
+import os
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from .base import EngineError
+
+_worker_state: Any = None
+
+
+def available_cpus() -> list[int]:
+    """Return the CPUs this process may run on, in ascending order."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:  # macOS / Windows
+        return list(range(os.cpu_count() or 1))
+
+
+def cpu_groups(workers: int, cpus: list[int] | None = None) -> list[tuple[int, ...]]:
+    """Split ``cpus`` into ``workers`` contiguous, near-equal groups.
+
+    With more workers than CPUs the groups wrap around and share CPUs."""
+    pool = cpus if cpus is not None else available_cpus()
+    workers = max(int(workers), 1)
+    groups: list[tuple[int, ...]] = []
+    for index in range(workers):
+        start = index * len(pool) // workers
+        stop = (index + 1) * len(pool) // workers
+        groups.append(tuple(pool[start:stop]) or (pool[index % len(pool)],))
+    return groups
+
+
+def _init_worker(loader: Callable[[int], Any], cpu_queue: Any, n_threads: int | None) -> None:
+    global _worker_state
+    cpus = cpu_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        # A container or cgroup may forbid pinning.
+        with contextlib.suppress(OSError):
+            os.sched_setaffinity(0, cpus)
+    _worker_state = loader(n_threads or len(cpus))
+
+
+def _call_worker(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    return fn(_worker_state, *args, **kwargs)
+
+
+class ProcessWorkerPool:
+    """Run ``loader(n_threads)`` once in each of ``workers`` pinned processes.
+
+    :meth:`submit` schedules ``fn(state, *args, **kwargs)`` on whichever worker
+    is free, where ``state`` is what the loader returned in that worker. The
+    loader, ``fn`` and arguments must be picklable (module-level functions or
+    ``functools.partial`` of them). Workers are started with ``spawn`` so they
+    never inherit a forked copy of the parent's threads or locks."""
+
+    def __init__(
+        self,
+        loader: Callable[[int], Any],
+        workers: int,
+        *,
+        n_threads: int | None = None,
+    ) -> None:
+        self.workers = max(int(workers), 1)
+        context = multiprocessing.get_context("spawn")
+        cpu_queue = context.Queue()
+        for group in cpu_groups(self.workers):
+            cpu_queue.put(group)
+        per_worker = max(n_threads // self.workers, 1) if n_threads else None
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(loader, cpu_queue, per_worker),
+        )
+        self._finalizer = weakref.finalize(
+            self, functools.partial(self._executor.shutdown, wait=False, cancel_futures=True)
+        )
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future[Any]:
+        """Queue ``fn`` for the next free worker."""
+        try:
+            return self._executor.submit(_call_worker, fn, *args, **kwargs)
+        except BrokenProcessPool as exc:
+            raise EngineError(f"Local model worker pool is no longer usable: {exc}") from exc
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn`` on a worker and wait for its result."""
+        try:
+            return self.submit(fn, *args, **kwargs).result()
+        except BrokenProcessPool as exc:
+            raise EngineError(f"Local model worker died: {exc}") from exc
+
+    def close(self) -> None:
+        """Stop the workers, dropping queued requests."""
+        self._finalizer()
+
+
+__all__ = ["ProcessWorkerPool", "available_cpus", "cpu_groups"]
@@ -0,0 +1,174 @@
+"""Machine-readable run reports for file and directory translations.
+
+A report has one record per file the run touched — ``ok``, ``skipped`` or
+``failed`` with the error class — plus retries, wall time, characters, chunks,
+cache hits, reported tokens and billed characters and the estimated cost —
+and a closing summary. ``.ndjson``/``.jsonl`` paths get one
+JSON object per line, appended and flushed as each file finishes so a killed
+run still leaves a usable report; any other suffix gets a single JSON document
+written atomically at the end. :func:`failed_sources` reads either form back so
+a follow-up run can retry only the failures."""
+# this_file: src/abersetz/report.py
+
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from .fileio import atomic_write_text
+
+if TYPE_CHECKING:
+    from .pipeline import TranslationResult
+
+REPORT_VERSION = 1
+NDJSON_SUFFIXES = frozenset({".ndjson", ".jsonl"})
+
+STATUS_OK = "ok"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+_SUMMED_FIELDS = (
+    "retries",
+    "seconds",
+    "chars",
+    "chunks",
+    "cache_hits",
+    "prompt_tokens",
+    "completion_tokens",
+    "billed_chars",
+)
+
+
+def result_record(result: TranslationResult) -> dict[str, Any]:
+    """Return the report record for one translated (or failed) file."""
+    return {
+        "type": "file",
+        "source": str(result.source),
+        "destination": str(result.destination),
+        "status": result.status,
+        "engine": result.engine,
+        "source_lang": result.source_lang,
+        "target_lang": result.target_lang,
+        "format": result.format.value,
+        "error_class": result.error_class,
+        "error": result.error,
+        "retries": result.retries,
+        "seconds": round(result.seconds, 6),
+        "chars": result.chars,
+        "chunks": result.chunks,
+        "cache_hits": result.cache_hits,
+        "prompt_tokens": result.prompt_tokens,
+        "completion_tokens": result.completion_tokens,
+        "billed_chars": result.billed_chars,
+        "cost": None if result.cost is None else round(result.cost, 6),
+    }
+
+
+class RunReport:
+    """Collect per-file outcomes and write them to ``path`` as JSON or NDJSON."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.ndjson = self.path.suffix.lower() in NDJSON_SUFFIXES
+        self._started = time.time()
+        self._records: list[dict[str, Any]] = []
+        self._handle: IO[str] | None = None
+        if self.ndjson:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("w", encoding="utf-8")
+
+    def __enter__(self) -> RunReport:
+        return self
+
+    def __exit__(self, exc_type: object, exc: object, tb: object) -> None:
+        self.close(aborted=str(exc) if exc is not None else None)
+
+    def add(self, result: TranslationResult) -> None:
+        """Record one file outcome (flushed immediately in NDJSON mode)."""
+        record = result_record(result)
+        self._records.append(record)
+        if self._handle is not None:
+            self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._handle.flush()
+
+    def summary(self) -> dict[str, Any]:
+        """Return status counts and summed per-file metrics.
+
+        ``cost`` stays ``None`` unless at least one file was priced."""
+        counts = {STATUS_OK: 0, STATUS_SKIPPED: 0, STATUS_FAILED: 0}
+        totals: dict[str, float] = dict.fromkeys(_SUMMED_FIELDS, 0)
+        costs: list[float] = []
+        for record in self._records:
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            for name in _SUMMED_FIELDS:
+                totals[name] += record[name]
+            if record["cost"] is not None:
+                costs.append(record["cost"])
+        totals["seconds"] = round(totals["seconds"], 6)
+        cost = round(sum(costs), 6) if costs else None
+        return {"files": len(self._records), **counts, **totals, "cost": cost}
+
+    def close(self, *, aborted: str | None = None) -> None:
+        """Write the summary (and, in JSON mode, the whole report)."""
+        summary: dict[str, Any] = {
+            "type": "summary",
+            "version": REPORT_VERSION,
+            "started": self._started,
+            "finished": time.time(),
+            "aborted": aborted,
+            **self.summary(),
+        }
+        if self._handle is not None:
+            self._handle.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            self._handle.close()
+            self._handle = None
+            return
+        if self.ndjson:
+            return  # already closed
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        document = {"summary": summary, "files": self._records}
+        atomic_write_text(self.path, json.dumps(document, indent=2, ensure_ascii=False))
+
+
+def _iter_records(text: str) -> Iterable[dict[str, Any]]:
+    try:
+        document = json.loads(text)
+    except json.JSONDecodeError:
+        document = None
+    if isinstance(document, dict) and "files" in document:
+        yield from document["files"]
+        return
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # a torn final line from an interrupted run
+        if isinstance(record, dict) and record.get("type") == "file":
+            yield record
+
+
+def failed_sources(path: Path | str) -> frozenset[Path]:
+    """Return the sources recorded as failed in a JSON or NDJSON report."""
+    text = Path(path).read_text(encoding="utf-8")
+    return frozenset(
+        Path(record["source"])
+        for record in _iter_records(text)
+        if record.get("status") == STATUS_FAILED
+    )
+
+
+__all__ = [
+    "REPORT_VERSION",
+    "RunReport",
+    "STATUS_FAILED",
+    "STATUS_OK",
+    "STATUS_SKIPPED",
+    "failed_sources",
+    "result_record",
+]
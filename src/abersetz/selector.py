@@ -1,7 +1,7 @@
 """Engine selector grammar for abersetz.
 
 A *selector* names an engine, an optional subvariant, and an optional provider
-in the form ``engine[/subvariant]::provider``. The six engine codes are:
+in the form ``engine[/subvariant]::provider``. The seven engine codes are:
 
 | Code | Engine |
 |------|--------|
@@ -11,6 +11,7 @@ in the form ``engine[/subvariant]::provider``. The six engine codes are:
 | ``ll`` | OpenAI-compatible LLM API |
 | ``ml`` | local MLX model (``mlx_lm``) |
 | ``gg`` | local GGUF model (``llama.cpp``) |
+| ``mk`` | offline mock engine (benchmarks, tests) |
 
 Examples::
 
@@ -20,6 +21,7 @@ Examples::
     ll::siliconflow:Qwen/Qwen2.5-7B-Instruct
     ml/hy-mt2::/models/Hy-MT2-7B
     gg/gemma::/models/gemma.gguf
+    mk::latency=50ms,jitter=10ms,fail=0.01,ratio=1.1
 
 The legacy ``engine/provider`` form (``tr/google``, ``ll/default``) is still
 accepted so existing configs keep working; it is parsed into the same
@@ -33,7 +35,7 @@ import re
 from dataclasses import dataclass
 
 #: Canonical two-letter engine codes.
-ENGINE_CODES: frozenset[str] = frozenset({"tr", "dt", "lm", "ll", "ml", "gg"})
+ENGINE_CODES: frozenset[str] = frozenset({"tr", "dt", "lm", "ll", "ml", "gg", "mk"})
 
 #: Map every accepted spelling (legacy long names, old short codes) to a
 #: canonical engine code.
@@ -52,6 +54,8 @@ _ENGINE_ALIASES: dict[str, str] = {
     "mlx": "ml",
     "gg": "gg",
     "gguf": "gg",
+    "mk": "mk",
+    "mock": "mk",
 }
 
 #: Subvariant names for local engines collapse onto an internal prompt family.
@@ -0,0 +1,190 @@
+"""Terminology base shared across files and runs, one per language pair.
+
+LLM engines propose ``<voc>`` entries as they translate, but that
+vocabulary used to die with the file. A :class:`TermBase` keeps what every
+file learned under a directory (``--termbase`` or ``[defaults] termbase``),
+in one ``<from>-<to>.terms.jsonl`` file per language pair, and seeds the
+next run for the same pair with it.
+
+The file is an append-only log: a header line, then one line per term
+observed by a run, ``{"term": ..., "votes": {translation: count}}``. Each
+file that learns a term casts one vote for its translation. When files
+disagree, the translation with the most votes is used; the current choice
+keeps ties, so one stray file cannot flip an established term. When the log
+holds more than :data:`COMPACT_RATIO` lines per term it is rewritten as one
+line per term, sorted, with the chosen translation under ``"use"``."""
+# this_file: src/abersetz/termbase.py
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .fileio import atomic_write_text
+from .vocabulary import EMPTY, Vocabulary
+
+TERMBASE_SUFFIX = ".terms.jsonl"
+TERMBASE_VERSION = 1
+COMPACT_RATIO = 2
+"""Log lines per term above which :meth:`TermBase.save` rewrites the file."""
+
+
+def _slug(lang: str) -> str:
+    return re.sub(r"[^a-z0-9_-]+", "_", lang.strip().lower()) or "auto"
+
+
+def termbase_path(root: Path, source_lang: str, target_lang: str) -> Path:
+    """Return the file that holds the ``source_lang`` → ``target_lang`` terms under ``root``."""
+    return root / f"{_slug(source_lang)}-{_slug(target_lang)}{TERMBASE_SUFFIX}"
+
+
+@dataclass(slots=True)
+class _Term:
+    use: str
+    votes: dict[str, int] = field(default_factory=dict)
+
+    def vote(self, translation: str, count: int = 1) -> bool:
+        """Add ``count`` votes; return whether the chosen translation changed."""
+        self.votes[translation] = self.votes.get(translation, 0) + count
+        if translation != self.use and self.votes[translation] > self.votes.get(self.use, 0):
+            self.use = translation
+            return True
+        return False
+
+
+class TermBase:
+    """Terms of one language pair, loaded from and saved to ``root``.
+
+    Thread-safe; :meth:`save` appends only what was observed since the last
+    save. Two processes saving the same pair at once may lose one's votes."""
+
+    def __init__(self, root: Path, source_lang: str, target_lang: str) -> None:
+        self.path = termbase_path(root, source_lang, target_lang)
+        self._header = {
+            "kind": "termbase",
+            "version": TERMBASE_VERSION,
+            "from_lang": source_lang,
+            "to_lang": target_lang,
+        }
+        self._terms: dict[str, _Term] = {}
+        self._pending: dict[str, dict[str, int]] = {}
+        self._lines = 0
+        self._writable = True
+        self._vocabulary: Vocabulary | None = None
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def vocabulary(self) -> Vocabulary:
+        """Return ``{term: chosen translation}``; built once per change."""
+        with self._lock:
+            if self._vocabulary is None:
+                self._vocabulary = (
+                    Vocabulary({term: entry.use for term, entry in self._terms.items()})
+                    if self._terms
+                    else EMPTY
+                )
+            return self._vocabulary
+
+    def conflicts(self) -> dict[str, dict[str, int]]:
+        """Return the votes of every term that has more than one translation."""
+        with self._lock:
+            return {
+                term: dict(entry.votes)
+                for term, entry in self._terms.items()
+                if len(entry.votes) > 1
+            }
+
+    def observe(self, learned: Mapping[str, str]) -> None:
+        """Cast one vote for each ``term → translation`` in ``learned``."""
+        with self._lock:
+            for term, translation in learned.items():
+                term, translation = str(term).strip(), str(translation).strip()
+                if not term or not translation:
+                    continue
+                entry = self._terms.get(term)
+                if entry is None:
+                    self._terms[term] = _Term(translation, {translation: 1})
+                    self._vocabulary = None
+                elif entry.vote(translation):
+                    self._vocabulary = None
+                votes = self._pending.setdefault(term, {})
+                votes[translation] = votes.get(translation, 0) + 1
+
+    def record(self, seed: Mapping[str, str], voc: Mapping[str, str]) -> int:
+        """Observe the entries of a file's final ``voc`` that differ from its ``seed``.
+
+        Returns how many entries that was."""
+        learned = {term: value for term, value in voc.items() if seed.get(term) != value}
+        if learned:
+            self.observe(learned)
+        return len(learned)
+
+    def save(self) -> None:
+        """Append the votes observed since the last save, compacting the log if due."""
+        with self._lock:
+            if not self._pending or not self._writable:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            grown = self._lines + len(self._pending)
+            if not self.path.exists() or grown > COMPACT_RATIO * len(self._terms) + 1:
+                atomic_write_text(self.path, self._snapshot())
+                self._lines = len(self._terms) + 1
+            else:
+                lines = [
+                    json.dumps({"term": term, "votes": votes}, ensure_ascii=False) + "\n"
+                    for term, votes in sorted(self._pending.items())
+                ]
+                with self.path.open("a", encoding="utf-8") as handle:
+                    handle.writelines(lines)
+                self._lines += len(lines)
+            self._pending.clear()
+
+    def _load(self) -> None:
+        from loguru import logger
+
+        with self.path.open(encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+        records: list[dict[str, Any]] = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # torn last line from a killed run
+        header = records[0] if records else {}
+        if header.get("kind") != "termbase" or header.get("version") != TERMBASE_VERSION:
+            logger.warning(f"Ignoring terminology base {self.path}: unknown format")
+            self._writable = False
+            return
+        for record in records[1:]:
+            term = record.get("term")
+            votes = record.get("votes")
+            if not isinstance(term, str) or not isinstance(votes, dict) or not votes:
+                continue
+            entry = self._terms.get(term)
+            use = record.get("use")
+            if entry is None:
+                first = use if isinstance(use, str) else str(next(iter(votes)))
+                entry = self._terms[term] = _Term(first)
+            for translation, count in votes.items():
+                entry.vote(str(translation), int(count))
+            if isinstance(use, str):
+                entry.use = use
+        self._lines = len(lines)
+
+    def _snapshot(self) -> str:
+        lines = [self._header]
+        for term, entry in sorted(self._terms.items()):
+            lines.append({"term": term, "use": entry.use, "votes": entry.votes})
+        return "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+
+
+__all__ = ["COMPACT_RATIO", "TERMBASE_SUFFIX", "TermBase", "termbase_path"]
@@ -0,0 +1,387 @@
+"""Per-stage timing spans and the hooks that receive them.
+
+The pipeline opens a span around each stage of a run: discovery, reading,
+format detection, chunking, HTML extract/merge, every cache lookup, every
+engine call (retries are recorded as ``retry`` events on it) and the write.
+Spans nest through a context variable, also across the chunk worker pool.
+
+Nothing is recorded until a hook is installed with :func:`add_hook` or
+:func:`hooks`; without one, :func:`span` returns a shared no-op. Shipped hooks:
+
+* :class:`NdjsonExporter` — one JSON line per finished span;
+* :class:`OpenTelemetryExporter` — re-creates the spans through the
+  OpenTelemetry API (``pip install abersetz[otel]``);
+* :class:`StageProfile` — per-stage totals for ``--profile``."""
+# this_file: src/abersetz/tracing.py
+
+from __future__ import annotations
+
+import contextlib
+import json
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+STAGES = (
+    "run",
+    "engine_init",
+    "discover",
+    "file",
+    "read",
+    "detect",
+    "chunk",
+    "html_extract",
+    "cache_lookup",
+    "engine_call",
+    "html_merge",
+    "write",
+)
+"""Span names the pipeline emits, roughly in the order they occur."""
+
+_current: ContextVar[Span | None] = ContextVar("abersetz_span", default=None)
+_hooks: tuple[TraceHook, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+@dataclass(slots=True)
+class SpanEvent:
+    """Something that happened inside a span, e.g. a retry."""
+
+    name: str
+    time_ns: int
+    attributes: dict[str, Any]
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    """One timed stage. Times are Unix epoch nanoseconds."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    events: list[SpanEvent] = field(default_factory=list)
+    start_ns: int = 0
+    end_ns: int = 0
+    status: str = "ok"
+    error: str | None = None
+    thread: str = ""
+    _perf_start: int = 0
+    _token: Token[Span | None] | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes: Any) -> None:
+        """Add or replace attributes."""
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append(SpanEvent(name, time.time_ns(), attributes))
+
+    def __enter__(self) -> Span:
+        self.thread = threading.current_thread().name
+        self.start_ns = time.time_ns()
+        self._perf_start = time.perf_counter_ns()
+        self._token = _current.set(self)
+        _dispatch("on_start", self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, tb: Any) -> None:
+        self.end_ns = self.start_ns + time.perf_counter_ns() - self._perf_start
+        if exc is not None:
+            self.status = "error"
+            self.error = f"{type(exc).__name__}: {exc}"
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        _dispatch("on_end", self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the span as a JSON-friendly dict (the NDJSON line format)."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "thread": self.thread,
+            "attributes": self.attributes,
+            "events": [
+                {"name": e.name, "time_ns": e.time_ns, "attributes": e.attributes}
+                for e in self.events
+            ],
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned by :func:`span` while no hook is installed."""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, tb: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class TraceHook:
+    """Receives spans as they start and end. Subclass and override what you need.
+
+    Hooks are called on the thread that runs the stage, so they must be thread-safe."""
+
+    def on_start(self, span: Span) -> None:
+        """Called when ``span`` starts."""
+
+    def on_end(self, span: Span) -> None:
+        """Called when ``span`` ends, with its duration, status and events filled in."""
+
+    def close(self) -> None:
+        """Flush and release resources; called by :func:`hooks` on exit."""
+
+
+def _dispatch(method: str, span: Span) -> None:
+    for hook in _hooks:
+        try:
+            getattr(hook, method)(span)
+        except Exception as exc:  # a broken exporter must not fail a translation
+            from loguru import logger
+
+            logger.warning(f"Trace hook {type(hook).__name__}.{method} failed: {exc}")
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """Return a context manager timing stage ``name`` as a child of the current span."""
+    if not _hooks:
+        return _NOOP
+    parent = _current.get()
+    return Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else _new_id(128),
+        span_id=_new_id(64),
+        parent_id=parent.span_id if parent is not None else None,
+        attributes=attributes,
+    )
+
+
+def current_span() -> Span | None:
+    """Return the innermost open span of this context, if tracing is on."""
+    return _current.get()
+
+
+def add_event(name: str, **attributes: Any) -> None:
+    """Record an event on the current span (no-op when nothing is traced)."""
+    current = _current.get()
+    if current is not None:
+        current.add_event(name, **attributes)
+
+
+def enabled() -> bool:
+    return bool(_hooks)
+
+
+def add_hook(hook: TraceHook) -> None:
+    """Start sending spans to ``hook``."""
+    global _hooks
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: TraceHook) -> None:
+    """Stop sending spans to ``hook`` (it is not closed)."""
+    global _hooks
+    with _hooks_lock:
+        _hooks = tuple(existing for existing in _hooks if existing is not hook)
+
+
+@contextlib.contextmanager
+def hooks(*installed: TraceHook) -> Iterator[None]:
+    """Install ``installed`` for the duration of the block, then remove and close them."""
+    for hook in installed:
+        add_hook(hook)
+    try:
+        yield
+    finally:
+        for hook in installed:
+            remove_hook(hook)
+            hook.close()
+
+
+class NdjsonExporter(TraceHook):
+    """Append every finished span to ``path`` as one JSON line.
+
+    Children finish before their parents, so lines are in end order; use
+    ``parent_id`` to rebuild the tree."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self.path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self._handle.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+
+def _otel_value(value: Any) -> Any:
+    if isinstance(value, str | bool | int | float):
+        return value
+    return str(value)
+
+
+class OpenTelemetryExporter(TraceHook):
+    """Mirror spans into OpenTelemetry through ``opentelemetry-api``.
+
+    Uses ``tracer`` or the global tracer provider, so an SDK configured by the
+    host application (or ``opentelemetry-instrument``) decides where spans go.
+    Span events become OpenTelemetry events and failed spans get an error status."""
+
+    def __init__(self, tracer: Any | None = None) -> None:
+        try:
+            from opentelemetry import trace
+        except ImportError as err:
+            raise RuntimeError(
+                "OpenTelemetry tracing needs opentelemetry-api. "
+                "Install with: pip install abersetz[otel]"
+            ) from err
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("abersetz")
+        self._open: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span) -> None:
+        with self._lock:
+            parent = self._open.get(span.parent_id) if span.parent_id else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = self._tracer.start_span(
+            f"abersetz.{span.name}",
+            context=context,
+            start_time=span.start_ns,
+            attributes={key: _otel_value(value) for key, value in span.attributes.items()},
+        )
+        with self._lock:
+            self._open[span.span_id] = otel_span
+
+    def on_end(self, span: Span) -> None:
+        with self._lock:
+            otel_span = self._open.pop(span.span_id, None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            otel_span.set_attribute(key, _otel_value(value))
+        for event in span.events:
+            otel_span.add_event(
+                event.name,
+                {key: _otel_value(value) for key, value in event.attributes.items()},
+                timestamp=event.time_ns,
+            )
+        if span.status == "error":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error or ""))
+        otel_span.end(end_time=span.end_ns)
+
+
+@dataclass(slots=True)
+class StageTotals:
+    """Aggregate of all spans of one stage."""
+
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    errors: int = 0
+    retries: int = 0
+    retry_wait_ms: float = 0.0
+
+
+class StageProfile(TraceHook):
+    """Sum up span durations per stage for the ``--profile`` summary."""
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageTotals] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span) -> None:
+        duration = span.duration_ms
+        retries = [event for event in span.events if event.name == "retry"]
+        with self._lock:
+            totals = self.stages.setdefault(span.name, StageTotals())
+            totals.calls += 1
+            totals.total_ms += duration
+            totals.max_ms = max(totals.max_ms, duration)
+            totals.errors += span.status == "error"
+            totals.retries += len(retries)
+            totals.retry_wait_ms += sum(
+                float(event.attributes.get("wait") or 0.0) * 1000 for event in retries
+            )
+
+    def format(self) -> str:
+        """Return a table of calls, total, mean and max time per stage."""
+        with self._lock:
+            stages = dict(self.stages)
+        order = {name: index for index, name in enumerate(STAGES)}
+        run_ms = stages["run"].total_ms if "run" in stages else 0.0
+        lines = [
+            f"{'stage':<14}{'calls':>7}{'total ms':>12}{'mean ms':>10}{'max ms':>10}{'% run':>7}"
+        ]
+        for name in sorted(stages, key=lambda stage: (order.get(stage, len(order)), stage)):
+            totals = stages[name]
+            share = f"{totals.total_ms * 100 / run_ms:.0f}" if run_ms else "-"
+            lines.append(
+                f"{name:<14}{totals.calls:>7}{totals.total_ms:>12.1f}"
+                f"{totals.total_ms / totals.calls:>10.2f}{totals.max_ms:>10.1f}{share:>7}"
+            )
+        calls = stages.get("engine_call")
+        if calls is not None and calls.retries:
+            lines.append(f"engine retries: {calls.retries} ({calls.retry_wait_ms:.0f} ms waiting)")
+        lines.append("Nested stages count towards their parents; parallel chunks overlap.")
+        return "\n".join(lines)
+
+
+__all__ = [
+    "STAGES",
+    "NdjsonExporter",
+    "OpenTelemetryExporter",
+    "Span",
+    "SpanEvent",
+    "StageProfile",
+    "StageTotals",
+    "TraceHook",
+    "add_event",
+    "add_hook",
+    "current_span",
+    "enabled",
+    "hooks",
+    "remove_hook",
+    "span",
+]
@@ -0,0 +1,133 @@
+"""Immutable vocabulary that serializes itself once and hashes incrementally.
+
+The pipeline carries the running term → translation map from chunk to chunk
+and needs, per chunk, a cache key for it and, per engine call, its JSON. A
+:class:`Vocabulary` keeps a digest that :meth:`Vocabulary.merge` updates
+from the changed entries alone, and renders its JSON at most once. A chunk
+that leaves the vocabulary unchanged reuses it as is; one that changes it
+pays for a dict copy, but hashes only the changed entries.
+
+The digest is a sum of per-entry SHA-256 values modulo 2**256, so it does
+not depend on entry order, and replacing a term costs one subtraction and
+one addition."""
+# this_file: src/abersetz/vocabulary.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+_MODULUS = 1 << 256
+
+
+def _entry_hash(term: str, translation: str) -> int:
+    # The length prefix keeps ("ab", "c") and ("a", "bc") apart.
+    data = f"{len(term)}:{term}{translation}".encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.sha256(data).digest(), "big")
+
+
+class Vocabulary(Mapping[str, str]):
+    """Read-only ``{term: translation}`` mapping with a cached JSON form and digest."""
+
+    __slots__ = ("_entries", "_sum", "_json")
+
+    def __init__(self, entries: Mapping[str, str] | Iterable[tuple[str, str]] = ()) -> None:
+        if isinstance(entries, Vocabulary):
+            self._entries: dict[str, str] = entries._entries
+            self._sum: int = entries._sum
+            self._json: str | None = entries._json
+            return
+        self._entries = {str(term): str(value) for term, value in dict(entries).items()}
+        self._sum = sum(_entry_hash(*item) for item in self._entries.items()) % _MODULUS
+        self._json = None
+
+    @classmethod
+    def from_json(cls, text: str) -> Vocabulary:
+        """Parse a JSON object; a non-object or broken payload gives an empty vocabulary."""
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return EMPTY
+        return cls(data) if isinstance(data, dict) and data else EMPTY
+
+    def __getitem__(self, term: str) -> str:
+        return self._entries[term]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, term: object) -> bool:
+        return term in self._entries
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Vocabulary):
+            return self._sum == other._sum and self._entries == other._entries
+        if isinstance(other, Mapping):
+            return self._entries == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._sum
+
+    def __repr__(self) -> str:
+        return f"Vocabulary({self._entries!r})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (Vocabulary, (self._entries,))
+
+    @property
+    def digest(self) -> str:
+        """Hex digest of the entries, independent of their order."""
+        return f"{self._sum:064x}"
+
+    def to_json(self) -> str:
+        """Return the entries as a key-sorted JSON object (computed once)."""
+        if self._json is None:
+            self._json = json.dumps(self._entries, sort_keys=True, ensure_ascii=False)
+        return self._json
+
+    def to_dict(self) -> dict[str, str]:
+        return dict(self._entries)
+
+    def merge(self, updates: Mapping[str, str]) -> Vocabulary:
+        """Return the vocabulary with ``updates`` applied; ``self`` if nothing changes.
+
+        Hashing costs O(len(updates)); the new vocabulary still copies the
+        entries, an O(len(self)) dict copy done only when something changed."""
+        changed = {
+            str(term): str(value)
+            for term, value in updates.items()
+            if self._entries.get(str(term)) != str(value)
+        }
+        if not changed:
+            return self
+        entries = dict(self._entries)
+        total = self._sum
+        for term, value in changed.items():
+            old = entries.get(term)
+            if old is not None:
+                total -= _entry_hash(term, old)
+            total += _entry_hash(term, value)
+            entries[term] = value
+        merged = Vocabulary.__new__(Vocabulary)
+        merged._entries = entries
+        merged._sum = total % _MODULUS
+        merged._json = None
+        return merged
+
+    def changes(self, other: Mapping[str, str]) -> dict[str, str]:
+        """Return the entries of ``other`` that are new or different here."""
+        if other is self:
+            return {}
+        return {term: value for term, value in other.items() if self._entries.get(term) != value}
+
+
+EMPTY = Vocabulary()
+
+
+__all__ = ["EMPTY", "Vocabulary"]
@@ -0,0 +1,79 @@
+# this_file: tests/test_bench.py
+"""Tests for the offline pipeline benchmark."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from abersetz import pipeline
+from abersetz.bench import busy_time, percentile, run_bench, write_corpus
+from abersetz.chunking import TextFormat, detect_format
+from abersetz.cli import AbersetzCLI
+
+
+@pytest.mark.parametrize(
+    ("fmt", "expected"),
+    [("txt", TextFormat.PLAIN), ("md", TextFormat.PLAIN), ("html", TextFormat.HTML)],
+)
+def test_write_corpus_is_deterministic(tmp_path: Path, fmt: str, expected: TextFormat) -> None:
+    first = write_corpus(tmp_path / "a", files=3, size=1500, fmt=fmt, seed=4)
+    second = write_corpus(tmp_path / "b", files=3, size=1500, fmt=fmt, seed=4)
+
+    texts = [path.read_text(encoding="utf-8") for path in first]
+    assert texts == [path.read_text(encoding="utf-8") for path in second]
+    assert all(len(text) >= 1500 for text in texts)
+    assert detect_format(texts[0]) is expected
+    with pytest.raises(ValueError):
+        write_corpus(tmp_path / "c", files=1, size=10, fmt="pdf")
+
+
+def test_percentile_and_busy_time() -> None:
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == pytest.approx(2.5)
+    assert percentile([5.0, 1.0, 3.0], 100) == 5.0
+    assert busy_time([(0.0, 2.0), (1.0, 3.0), (5.0, 6.0)]) == pytest.approx(4.0)
+    assert busy_time([]) == 0.0
+
+
+@pytest.mark.parametrize("mode", ["path", "string"])
+def test_run_bench_reports_every_level_and_pass(mode: str) -> None:
+    rows = run_bench("mk::latency=1ms", files=2, size=1200, concurrency=(1, 3), passes=2, mode=mode)
+
+    assert [(row.concurrency, row.pass_index) for row in rows] == [(1, 0), (1, 1), (3, 0), (3, 1)]
+    for row in rows:
+        assert row.failed == 0
+        assert row.chunks >= 2
+        assert row.chars_per_second > 0
+        assert row.overhead_ms_per_chunk >= 0
+    for cold in rows[::2]:
+        assert cold.engine_calls == cold.chunks, "Each level starts with a cold cache"
+        assert cold.p50_ms >= 1.0
+        assert cold.p50_ms <= cold.p95_ms <= cold.p99_ms
+
+
+def test_run_bench_counts_failures_and_cache_hits(monkeypatch: pytest.MonkeyPatch) -> None:
+    def persistent_cache(**_: object) -> None:
+        raise AssertionError("The bench must not use the persistent chunk cache")
+
+    monkeypatch.setattr(pipeline, "_cached_translate_call", persistent_cache)
+
+    rows = run_bench("mk::fail=1", files=2, size=600, concurrency=(1,), passes=1)
+    assert rows[0].failed == 2
+
+    warm = run_bench("mk::", files=2, size=1200, concurrency=(2,), passes=2)
+    assert warm[0].cache_hit_rate == 0.0
+    assert warm[1].cache_hit_rate == 1.0
+    assert warm[1].engine_calls == 0
+
+
+def test_cli_bench_writes_report(tmp_path: Path) -> None:
+    report = tmp_path / "bench.json"
+
+    AbersetzCLI().bench("mk::latency=0", files=1, size=800, concurrency="1,2", report=str(report))
+
+    data = json.loads(report.read_text(encoding="utf-8"))
+    assert data["engine"] == "mk::latency=0"
+    assert [row["concurrency"] for row in data["passes"]] == [1, 2]
@@ -0,0 +1,150 @@
+"""Tests for the resumable-run checkpoint journal."""
+# this_file: tests/test_checkpoint.py
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from abersetz import fileio, pipeline
+from abersetz.checkpoint import JOURNAL_NAME, RunJournal
+from abersetz.fileio import SourceFile
+from abersetz.pipeline import TranslatorOptions, translate_path
+from abersetz.providers.base import EngineRequest, EngineResult
+
+SETTINGS = {"engine": "tr::google", "to_lang": "pl", "chunk_size": 10}
+
+
+class _EchoEngine:
+    name = "echo"
+    chunk_size = 100
+    html_chunk_size = None
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        return EngineResult(text=request.text, voc=request.voc)
+
+
+def _source(root: Path, name: str, text: str) -> SourceFile:
+    path = root / name
+    path.write_text(text, encoding="utf-8")
+    info = path.stat()
+    return SourceFile(path, info.st_size, info.st_mtime_ns)
+
+
+def test_journal_replays_chunks_and_finished_files(tmp_path: Path) -> None:
+    journal_path = tmp_path / "out" / "journal.ndjson"
+    done = _source(tmp_path, "done.txt", "x")
+    partial = _source(tmp_path, "partial.txt", "abc def")
+
+    with RunJournal(journal_path, tmp_path, SETTINGS) as journal:
+        journal.mark_done(done, tmp_path / "out" / "done.txt")
+        checkpoint = journal.file(partial)
+        checkpoint.record(0, "abc ", "ABC ", {"a": "A"})
+    with journal_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"kind": "chunk", "sou')  # torn write from a killed run
+
+    resumed = RunJournal(journal_path, tmp_path, SETTINGS, resume=True)
+    assert resumed.completed(done) == tmp_path / "out" / "done.txt"
+    checkpoint = resumed.file(partial)
+    assert checkpoint.lookup(0, "abc ") == ("ABC ", {"a": "A"})
+    assert checkpoint.lookup(0, "changed") is None
+    assert checkpoint.lookup(1, "def") is None
+    resumed.close()
+    lines = journal_path.read_text(encoding="utf-8").splitlines()
+    assert all(line.endswith("}") for line in lines), "Torn lines are dropped on compaction"
+    assert len(lines) == 3
+
+
+def test_journal_discards_progress_for_modified_sources(tmp_path: Path) -> None:
+    journal_path = tmp_path / "journal.ndjson"
+    source = _source(tmp_path, "a.txt", "abc")
+    with RunJournal(journal_path, tmp_path, SETTINGS) as journal:
+        journal.file(source).record(0, "abc", "ABC", {})
+        journal.mark_done(source, tmp_path / "out.txt")
+
+    info = source.path.stat()
+    os.utime(source.path, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    touched = SourceFile(source.path)
+    with RunJournal(journal_path, tmp_path, SETTINGS, resume=True) as journal:
+        assert journal.completed(touched) is None
+        assert journal.file(touched).lookup(0, "abc") is None
+
+
+def test_journal_ignores_runs_with_different_settings(tmp_path: Path) -> None:
+    journal_path = tmp_path / "journal.ndjson"
+    source = _source(tmp_path, "a.txt", "abc")
+    with RunJournal(journal_path, tmp_path, SETTINGS) as journal:
+        journal.mark_done(source, tmp_path / "out.txt")
+
+    other = {**SETTINGS, "to_lang": "de"}
+    with RunJournal(journal_path, tmp_path, other, resume=True) as journal:
+        assert journal.completed(source) is None
+
+
+def test_failed_background_write_is_not_journaled_as_done(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src_dir = tmp_path / "docs"
+    src_dir.mkdir()
+    (src_dir / "a.txt").write_text("alpha", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    options = dict(output_dir=out_dir, checkpoint=True, background_write=True)
+    monkeypatch.setattr(pipeline, "create_engine", lambda *_, **__: _EchoEngine())
+
+    def refuse(path: Path, content: str, **_: object) -> None:
+        if path.suffix == ".txt":
+            raise OSError("disk full")
+        real_write(path, content)
+
+    real_write = fileio.atomic_write_text
+    monkeypatch.setattr(fileio, "atomic_write_text", refuse)
+    with pytest.raises(OSError, match="disk full"):
+        translate_path(src_dir, TranslatorOptions(**options))
+    journal = (out_dir / JOURNAL_NAME).read_text(encoding="utf-8")
+    assert '"kind": "file"' not in journal
+
+    monkeypatch.setattr(fileio, "atomic_write_text", real_write)
+    (rerun,) = translate_path(src_dir, TranslatorOptions(**options, resume=True))
+    assert rerun.status == "ok", "The unwritten file is translated again"
+    assert (out_dir / "a.txt").read_text(encoding="utf-8") == "alpha"
+
+
+class _LearningEngine(_EchoEngine):
+    """Learns the first word of each chunk; fails on ``boom`` while ``crash`` is set."""
+
+    chunk_size = 5
+    crash = True
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        words = request.text.split()
+        if words == ["boom"] and self.crash:
+            raise RuntimeError("killed")
+        learned = {word: word.upper() for word in words}
+        return EngineResult(text=request.text, voc={**request.voc, **learned})
+
+
+def test_journal_stores_vocabulary_deltas_and_rebuilds_on_resume(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text("one two boom four", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    seed = {f"seed{index}": "x" for index in range(50)}
+    options = dict(output_dir=out_dir, chunk_size=4, checkpoint=True, initial_voc=seed)
+    engine = _LearningEngine()
+    monkeypatch.setattr(pipeline, "create_engine", lambda *_, **__: engine)
+
+    with pytest.raises(RuntimeError, match="killed"):
+        translate_path(source, TranslatorOptions(**options))
+    lines = [json.loads(line) for line in (out_dir / JOURNAL_NAME).read_text().splitlines()]
+    assert [line["voc"] for line in lines if line["kind"] == "chunk"] == [
+        {"one": "ONE"},
+        {"two": "TWO"},
+    ]
+
+    engine.crash = False
+    (result,) = translate_path(source, TranslatorOptions(**options, resume=True))
+    assert result.voc == {**seed, "one": "ONE", "two": "TWO", "boom": "BOOM", "four": "FOUR"}
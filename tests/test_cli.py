@@ -893,6 +893,21 @@ def test_cli_tr_string_prints_translation(monkeypatch: pytest.MonkeyPatch) -> No
     assert printed == ["hola"]
 
 
+def test_cli_tr_stream_writes_pieces_as_they_arrive(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def fake_translate_string(text: str, options: TranslatorOptions, *, on_text) -> str:
+        on_text("ho")
+        on_text("la")
+        return "hola"
+
+    monkeypatch.setattr("abersetz.cli.translate_string", fake_translate_string)
+
+    AbersetzCLI().tr(to_lang="es", text="hello", engine="tr::google", stream=True)
+
+    assert capsys.readouterr().out == "hola\n"
+
+
 def test_cli_tr_string_with_job(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     import json as _json
 
@@ -6,6 +6,7 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 from types import SimpleNamespace
+from typing import Any
 
 import pytest
 from langcodes import get as get_language
@@ -14,13 +15,15 @@ import abersetz.config as config_module
 import abersetz.engines as engines_module
 from abersetz.chunking import TextFormat
 from abersetz.engines import EngineBase, EngineError, EngineRequest, create_engine
+from abersetz.providers.base import Usage
 
 
 class DummyClient:
     """Simple stub mimicking OpenAI chat completions."""
 
-    def __init__(self, payload: str):
+    def __init__(self, payload: str, usage: dict[str, int] | None = None):
         self.payload = payload
+        self.usage = usage
         self.calls: list[dict[str, object]] = []
         self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
 
@@ -28,7 +31,7 @@ class DummyClient:
         self.calls.append(kwargs)
         message = SimpleNamespace(content=self.payload)
         choice = SimpleNamespace(message=message)
-        return SimpleNamespace(choices=[choice])
+        return SimpleNamespace(choices=[choice], usage=self.usage)
 
 
 def test_translators_engine_invokes_library(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -320,7 +323,8 @@ def test_create_engine_new_syntax_ml_path(monkeypatch: pytest.MonkeyPatch, tmp_p
 
     def fake_load(path, *args, **kwargs):
         captured["path"] = path
-        return object(), SimpleNamespace(chat_template="template")
+        tokenizer = SimpleNamespace(chat_template="template", encode=lambda text, **_: list(text))
+        return object(), tokenizer
 
     def fake_generate(*args, **kwargs):
         return "translated"
@@ -330,6 +334,19 @@ def test_create_engine_new_syntax_ml_path(monkeypatch: pytest.MonkeyPatch, tmp_p
     )
     engine = create_engine(f"ml/hy-mt2::{model_dir}", cfg)
     assert engine._family == "mthy"
+    assert "path" not in captured, "The model loads on first use"
+    engine.translate(
+        EngineRequest(
+            text="Hello",
+            source_lang="en",
+            target_lang="fr",
+            is_html=False,
+            voc={},
+            prolog={},
+            chunk_index=0,
+            total_chunks=1,
+        )
+    )
     assert str(model_dir) in str(captured["path"])
 
 
@@ -520,6 +537,98 @@ def _make_llm_engine() -> engines_module.LlmEngine:
     )
 
 
+def test_llm_engine_translate_stream_yields_output_body(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _make_llm_engine()
+    pieces = ["<output>Hal", "lo Welt</output>", '<voc>{"world": "Welt"}</voc>']
+    calls: list[dict[str, object]] = []
+
+    def fake_create(**kwargs: object) -> object:
+        calls.append(kwargs)
+        return iter(
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+            for piece in pieces
+        )
+
+    monkeypatch.setattr(engine._client.chat.completions, "create", fake_create)
+    stream = engine.translate_stream(_gemma_request("Hello world"))
+    deltas = []
+    while True:
+        try:
+            deltas.append(next(stream))
+        except StopIteration as stop:
+            result = stop.value
+            break
+
+    assert calls[0]["stream"] is True
+    assert deltas == ["Hal", "lo Welt"]
+    assert result.text == "Hallo Welt"
+    assert result.voc == {"world": "Welt"}
+
+
+def test_llm_engine_reports_usage_from_response() -> None:
+    usage = {"prompt_tokens": 40, "completion_tokens": 6}
+    client = DummyClient("<output>Hallo</output>", usage=usage)
+    engine = engines_module.LlmEngine(
+        config_module.EngineConfig(name="llm-test"), client, model="stub-model", temperature=0.0
+    )
+
+    result = engine.translate(_gemma_request("Hello"))
+
+    assert result.usage == Usage(prompt_tokens=40, completion_tokens=6)
+    client.usage = None
+    assert engine.translate(_gemma_request("Hello")).usage is None
+
+
+def test_llm_engine_translate_stream_keeps_usage_chunk(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = _make_llm_engine()
+    chunks = [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="<output>Hallo"))]),
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="</output>"))]),
+        SimpleNamespace(choices=[], usage={"prompt_tokens": 30, "completion_tokens": 4}),
+    ]
+    sent: dict[str, Any] = {}
+    monkeypatch.setattr(
+        engine._client.chat.completions,
+        "create",
+        lambda **kwargs: sent.update(kwargs) or iter(chunks),
+    )
+
+    stream = engine.translate_stream(_gemma_request("Hello"))
+    while True:
+        try:
+            next(stream)
+        except StopIteration as stop:
+            result = stop.value
+            break
+
+    assert result.text == "Hallo"
+    assert result.usage == Usage(prompt_tokens=30, completion_tokens=4)
+    assert sent["stream_options"] == {"include_usage": True}
+
+
+@pytest.mark.parametrize(("provider", "billed"), [("deepl", 5), ("google", None)])
+def test_deep_translator_engine_reports_billed_chars(provider: str, billed: int | None) -> None:
+    from abersetz.engines import DeepTranslatorEngine
+
+    class EchoTranslator:
+        def __init__(self, source: str, target: str):
+            pass
+
+        def translate(self, text: str) -> str:
+            return text.upper()
+
+    original_providers = dict(DeepTranslatorEngine._get_providers())
+    DeepTranslatorEngine.PROVIDERS = {**original_providers, provider: EchoTranslator}
+    try:
+        engine = DeepTranslatorEngine(provider, config_module.EngineConfig(name="deep-translator"))
+        result = engine.translate(_gemma_request("hello"))
+    finally:
+        DeepTranslatorEngine.PROVIDERS = original_providers
+
+    assert result.text == "HELLO"
+    assert (result.usage.billed_chars if result.usage else None) == billed
+
+
 def test_llm_engine_parse_payload_without_vocab() -> None:
     engine = _make_llm_engine()
 
@@ -580,7 +689,7 @@ def test_local_mthy_mlx_engine_translates_with_prompt(
             )
         },
     )
-    tokenizer = SimpleNamespace(chat_template="template")
+    tokenizer = SimpleNamespace(chat_template="template", encode=lambda text, **_: list(text))
     captured: dict[str, object] = {}
 
     def fake_apply_chat_template(messages: list[dict[str, str]], **_: object) -> str:
@@ -639,6 +748,9 @@ def test_local_gemma_gguf_engine_uses_structured_messages(
         def __init__(self, **kwargs: object) -> None:
             captured["init"] = kwargs
 
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
         def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
             captured["call"] = kwargs
             return {"choices": [{"message": {"content": "result"}}]}
@@ -664,6 +776,19 @@ def test_local_gemma_gguf_engine_uses_structured_messages(
     assert messages[0]["content"][0]["target_lang_code"] == "fr"
 
 
+def _gemma_request(text: str = "Hello") -> EngineRequest:
+    return EngineRequest(
+        text=text,
+        source_lang="en",
+        target_lang="fr",
+        is_html=False,
+        voc={},
+        prolog={},
+        chunk_index=0,
+        total_chunks=1,
+    )
+
+
 def test_local_gemma_gguf_engine_propagates_n_threads(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
@@ -684,17 +809,309 @@ def test_local_gemma_gguf_engine_propagates_n_threads(
         def __init__(self, **kwargs: object) -> None:
             captured["init"] = kwargs
 
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
         def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
             return {"choices": [{"message": {"content": "result"}}]}
 
     monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
 
-    create_engine("gemma/gguf", cfg, n_threads=8, n_gpu_layers=12, n_ctx=1024)
+    engine = create_engine("gemma/gguf", cfg, n_threads=8, n_gpu_layers=12, n_ctx=1024)
+    assert "init" not in captured, "The model loads on first use"
+    engine.translate(_gemma_request())
     assert captured["init"].get("n_threads") == 8
     assert captured["init"].get("n_gpu_layers") == 12
     assert captured["init"].get("n_ctx") == 1024
 
 
+def test_local_gguf_engine_slots_share_thread_budget(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    cfg = config_module.AbersetzConfig(
+        defaults=config_module.Defaults(engine="gemma/gguf"),
+        engines={
+            "gemma": config_module.EngineConfig(
+                name="gemma",
+                options={"backend": "gguf", "model_path": str(model_path), "slots": 2},
+            )
+        },
+    )
+    inits: list[dict[str, object]] = []
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            inits.append(kwargs)
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
+            return {"choices": [{"message": {"content": "result"}}]}
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
+
+    engine = create_engine("gemma/gguf", cfg, n_threads=8)
+    engine.translate(_gemma_request())
+
+    assert engine.max_concurrency == 2
+    assert engine.static_voc is True
+    assert [init["n_threads"] for init in inits] == [4], "Extra slots are built on demand"
+
+
+def test_local_gguf_engine_workers_dispatch_to_process_pool(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    cfg = config_module.AbersetzConfig(
+        defaults=config_module.Defaults(engine="gemma/gguf"),
+        engines={
+            "gemma": config_module.EngineConfig(
+                name="gemma",
+                options={"backend": "gguf", "model_path": str(model_path), "workers": 4},
+            )
+        },
+    )
+    inits: list[dict[str, object]] = []
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            inits.append(kwargs)
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
+            return {"choices": [{"message": {"content": "from worker"}}]}
+
+    class InlinePool:
+        """Runs the loader in-process, as a single worker would."""
+
+        def __init__(self, loader: Any, workers: int, *, n_threads: int | None = None) -> None:
+            self.workers = workers
+            self.state = loader((n_threads or workers) // workers)
+
+        def call(self, fn: Any, *args: Any) -> Any:
+            return fn(self.state, *args)
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
+    monkeypatch.setattr("abersetz.providers.gguf.ProcessWorkerPool", InlinePool)
+
+    engine = create_engine("gemma/gguf", cfg, n_threads=16, slots=3)
+    result = engine.translate(_gemma_request("hi"))
+
+    assert engine.max_concurrency == 4, "workers take precedence over slots"
+    assert result.text == "from worker"
+    assert [init["n_threads"] for init in inits] == [4]
+    assert inits[0]["model_path"] == str(model_path)
+
+
+def test_local_gguf_engine_streams_chat_completion(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    cfg = config_module.AbersetzConfig(
+        defaults=config_module.Defaults(engine="gemma/gguf"),
+        engines={
+            "gemma": config_module.EngineConfig(
+                name="gemma", options={"backend": "gguf", "model_path": str(model_path)}
+            )
+        },
+    )
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            pass
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def create_chat_completion(self, **kwargs: object) -> object:
+            assert kwargs["stream"] is True
+            return iter(
+                [
+                    {"choices": [{"delta": {"role": "assistant"}}]},
+                    {"choices": [{"delta": {"content": "Bon"}}]},
+                    {"choices": [{"delta": {"content": "jour"}}]},
+                    {"choices": []},
+                ]
+            )
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
+    engine = create_engine("gemma/gguf", cfg)
+
+    stream = engine.translate_stream(_gemma_request())
+    deltas = [next(stream), next(stream)]
+    with pytest.raises(StopIteration) as stop:
+        next(stream)
+
+    assert deltas == ["Bon", "jour"]
+    assert stop.value.value.text == "Bonjour"
+
+
+def test_local_gguf_engine_applies_output_guardrails(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    cfg = config_module.AbersetzConfig(
+        defaults=config_module.Defaults(engine="gemma/gguf"),
+        engines={
+            "gemma": config_module.EngineConfig(
+                name="gemma",
+                options={"backend": "gguf", "model_path": str(model_path), "expansion": 3},
+            )
+        },
+    )
+    captured: dict[str, object] = {}
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            pass
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def token_eos(self) -> int:
+            return 0
+
+        def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
+            captured.update(kwargs)
+            return {"choices": [{"message": {"content": "result"}}]}
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
+    engine = create_engine("gemma/gguf", cfg)
+    engine.translate(_gemma_request("x" * 40))
+
+    assert captured["max_tokens"] == 120
+    assert captured["stop"] == ["<end_of_turn>"]
+
+    class Scores(list):
+        """Stands in for the numpy row llama.cpp passes (scalar slice assignment)."""
+
+        def __setitem__(self, index, value):
+            if isinstance(index, slice):
+                value = [value] * len(self[index])
+            super().__setitem__(index, value)
+
+    process = captured["logits_processor"]
+    prompt = [7] * 10
+    assert process(prompt, Scores([1.0, 2.0, 3.0])) == [1.0, 2.0, 3.0]
+    assert process(prompt + [2] * 15, Scores([1.0, 2.0, 3.0])) == [1.0, 2.0, 3.0]
+    looped = process(prompt + [2] * 16, Scores([1.0, 2.0, 3.0]))
+    assert looped == [0.0, float("-inf"), float("-inf")]
+
+
+def test_local_gguf_engine_drafts_with_smaller_model(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    draft_path = tmp_path / "draft.gguf"
+    draft_path.write_text("stub", encoding="utf-8")
+    cfg = config_module.AbersetzConfig(
+        defaults=config_module.Defaults(engine="gemma/gguf"),
+        engines={
+            "gemma": config_module.EngineConfig(
+                name="gemma",
+                options={"backend": "gguf", "model_path": str(model_path), "draft_tokens": 3},
+            )
+        },
+    )
+    inits: list[dict[str, object]] = []
+
+    class FakeDraft:
+        def __init__(self, llm: object, num_pred_tokens: int) -> None:
+            self.llm = llm
+            self.num_pred_tokens = num_pred_tokens
+
+        def __call__(self, input_ids: object) -> list[int]:
+            return [1, 2, 3]
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            inits.append(kwargs)
+            self.draft_model = kwargs.get("draft_model")
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
+            self.draft_model([0])
+            self.draft_model([0])
+            return {
+                "choices": [{"message": {"content": "result"}}],
+                "usage": {"completion_tokens": 8},
+            }
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
+    monkeypatch.setattr("abersetz.providers.gguf.GgufDraftModel", FakeDraft)
+    engine = create_engine("gemma/gguf", cfg, draft=str(draft_path))
+    engine.translate(_gemma_request())
+
+    assert [init["model_path"] for init in inits] == [str(draft_path), str(model_path)]
+    assert inits[1]["draft_model"].draft.num_pred_tokens == 3
+    assert engine.speculation is not None
+    assert (engine.speculation.drafted, engine.speculation.accepted) == (6, 5)
+    assert engine.speculation.generated == 8
+
+
+def test_local_gguf_engine_prompt_lookup_drafts_from_prompt(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    cfg = config_module.AbersetzConfig(
+        defaults=config_module.Defaults(engine="gemma/gguf"),
+        engines={
+            "gemma": config_module.EngineConfig(
+                name="gemma", options={"backend": "gguf", "model_path": str(model_path)}
+            )
+        },
+    )
+    inits: list[dict[str, object]] = []
+
+    class FakeLookup:
+        def __init__(self, num_pred_tokens: int) -> None:
+            self.num_pred_tokens = num_pred_tokens
+
+        def __call__(self, input_ids: object) -> list[int]:
+            return [4] * self.num_pred_tokens
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            inits.append(kwargs)
+            self.draft_model = kwargs.get("draft_model")
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
+            self.draft_model([0])
+            return {
+                "choices": [{"message": {"content": "result"}}],
+                "usage": {"completion_tokens": 9},
+            }
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
+    monkeypatch.setitem(
+        sys.modules,
+        "llama_cpp.llama_speculative",
+        SimpleNamespace(LlamaPromptLookupDecoding=FakeLookup),
+    )
+    engine = create_engine("gemma/gguf", cfg, prompt_lookup=10)
+    engine.translate(_gemma_request())
+
+    assert len(inits) == 1, "No second model is loaded"
+    assert inits[0]["draft_model"].draft.num_pred_tokens == 10
+    assert engine.speculation is not None
+    assert (engine.speculation.drafted, engine.speculation.accepted) == (10, 7)
+
+
 def test_local_mthy_mlx_engine_hymt2_prompt_with_terminology(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
@@ -709,7 +1126,7 @@ def test_local_mthy_mlx_engine_hymt2_prompt_with_terminology(
             )
         },
     )
-    tokenizer = SimpleNamespace(chat_template="template")
+    tokenizer = SimpleNamespace(chat_template="template", encode=lambda text, **_: list(text))
     captured: dict[str, object] = {}
 
     def fake_apply_chat_template(messages: list[dict[str, str]], **_: object) -> str:
@@ -730,7 +1147,7 @@ def test_local_mthy_mlx_engine_hymt2_prompt_with_terminology(
 
     engine = create_engine("mthy", cfg)
     request = EngineRequest(
-        text="Hello",
+        text="Hello, apple",
         source_lang="en",
         target_lang="en",
         is_html=False,
@@ -833,7 +1250,8 @@ def test_create_engine_override_parameters(monkeypatch: pytest.MonkeyPatch, tmp_
 
     def fake_load(path, *args, **kwargs):
         loaded_args.append(path)
-        return object(), SimpleNamespace(chat_template="template")
+        tokenizer = SimpleNamespace(chat_template="template", encode=lambda text, **_: list(text))
+        return object(), tokenizer
 
     def fake_generate(*args, **kwargs):
         return "translated"
@@ -844,3 +1262,16 @@ def test_create_engine_override_parameters(monkeypatch: pytest.MonkeyPatch, tmp_
     # Create engine overriding max_tokens to 200
     engine = create_engine("mthy", cfg, max_tokens=200)
     assert engine._max_tokens == 200
+
+
+def test_model_cache_name_needs_no_resolution(tmp_path: Path) -> None:
+    from abersetz.providers.mlx import model_cache_name
+
+    model_file = tmp_path / "local.Q4.gguf"
+    model_file.write_text("stub", encoding="utf-8")
+
+    assert model_cache_name(str(model_file), "gguf") == "local.Q4.gguf"
+    assert model_cache_name("1.8b-gguf", "gguf") == "Hy-MT2-1.8B-Q8_0.gguf"
+    assert model_cache_name(None, "mlx") == "Hy-MT2-1.8B-oQ8-fp16"
+    with pytest.raises(EngineError, match="Hy-MT1"):
+        model_cache_name("tencent/Hy-MT1.5-7B", "gguf")
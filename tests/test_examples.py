@@ -1,4 +1,4 @@
-"""Tests for the job-driven translation benchmark example."""
+"""Tests for the benchmark examples."""
 # this_file: tests/test_examples.py
 
 from __future__ import annotations
@@ -24,6 +24,7 @@ def _load_module(name: str, filename: str) -> Any:
 
 benchmark_mod = _load_module("examples.benchmark", "benchmark.py")
 prep_mod = _load_module("examples.benchmark_prep", "benchmark_prep.py")
+startup_mod = _load_module("examples.startup_benchmark", "startup_benchmark.py")
 BenchmarkRunner = benchmark_mod.BenchmarkRunner
 main = benchmark_mod.main
 
@@ -163,3 +164,57 @@ def test_prep_generates_job(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) ->
     assert data["to_lang"] == "pl"
     selectors = {e["selector"] for e in data["entries"]}
     assert selectors == {"tr::google", "dt::google"}
+
+
+def test_startup_regressions_compare_with_thresholds() -> None:
+    results = {"import abersetz.cli": 180.0, "abersetz lang": 90.0, "import abersetz": 3.0}
+    limits = {"import abersetz.cli": 150.0, "abersetz lang": 100.0, "import missing": 1.0}
+
+    assert startup_mod.regressions(results, limits) == ["import abersetz.cli: 180.0 ms > 150.0 ms"]
+
+
+def test_startup_benchmark_writes_report_and_fails_on_regression(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(startup_mod, "measure_import", lambda module, runs: 10.0)
+    monkeypatch.setattr(startup_mod, "measure_command", lambda argv, runs: 500.0)
+    thresholds = tmp_path / "thresholds.json"
+    thresholds.write_text(json.dumps({"import abersetz.cli": 20.0, "abersetz lang": 400.0}))
+    report = tmp_path / "startup.json"
+
+    with pytest.raises(SystemExit) as exc:
+        startup_mod.StartupBenchmark().run(str(report), thresholds=str(thresholds), runs=1)
+
+    assert exc.value.code == 1
+    data = json.loads(report.read_text(encoding="utf-8"))
+    assert data["results_ms"]["import abersetz.pipeline"] == 10.0
+    assert data["results_ms"]["abersetz tr --help"] == 500.0
+    assert data["regressions"] == ["abersetz lang: 500.0 ms > 400.0 ms"]
+
+
+def test_startup_benchmark_update_rewrites_thresholds(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(startup_mod, "measure_import", lambda module, runs: 10.0)
+    monkeypatch.setattr(startup_mod, "measure_command", lambda argv, runs: 100.0)
+    thresholds = tmp_path / "thresholds.json"
+
+    startup_mod.StartupBenchmark().run(
+        str(tmp_path / "startup.json"), thresholds=str(thresholds), update=True
+    )
+
+    limits = json.loads(thresholds.read_text(encoding="utf-8"))
+    assert limits["import abersetz"] == 15.0
+    assert limits["abersetz lang"] == 150.0
+
+
+def test_startup_thresholds_cover_every_measurement() -> None:
+    limits = json.loads(startup_mod.DEFAULT_THRESHOLDS.read_text(encoding="utf-8"))
+    names = {f"import {m}" for m in startup_mod.IMPORT_TARGETS}
+    names |= {f"abersetz {label}" for label in startup_mod.COMMANDS}
+
+    assert set(limits) == names
+
+
+def test_startup_measure_import_reads_importtime() -> None:
+    assert startup_mod.measure_import("abersetz", runs=1) > 0
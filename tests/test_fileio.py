@@ -0,0 +1,110 @@
+"""Tests for atomic output writing."""
+# this_file: tests/test_fileio.py
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from abersetz.fileio import OutputWriter, SourceFile, atomic_write_text, read_source
+
+
+def test_atomic_write_text_replaces_content_and_keeps_mode(tmp_path: Path) -> None:
+    target = tmp_path / "note.txt"
+    target.write_text("old", encoding="utf-8")
+    target.chmod(0o640)
+
+    atomic_write_text(target, "new")
+
+    assert target.read_text(encoding="utf-8") == "new"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["note.txt"], "Temp file must not linger"
+
+
+def test_atomic_write_text_gives_new_files_the_umask_mode(tmp_path: Path) -> None:
+    plain = tmp_path / "plain.txt"
+    plain.write_text("x", encoding="utf-8")
+
+    atomic_write_text(tmp_path / "atomic.txt", "x")
+
+    assert (tmp_path / "atomic.txt").stat().st_mode & 0o777 == plain.stat().st_mode & 0o777
+
+
+def test_atomic_write_text_leaves_original_on_failure(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    target = tmp_path / "note.txt"
+    target.write_text("original", encoding="utf-8")
+
+    def failing_replace(src: str, dst: str) -> None:
+        raise OSError("disk on fire")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        atomic_write_text(target, "partial")
+
+    assert target.read_text(encoding="utf-8") == "original"
+    assert [p.name for p in tmp_path.iterdir()] == ["note.txt"]
+
+
+def test_output_writer_creates_each_directory_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[Path] = []
+    real_mkdir = Path.mkdir
+
+    def tracking_mkdir(self: Path, *args: object, **kwargs: object) -> None:
+        calls.append(self)
+        real_mkdir(self, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(Path, "mkdir", tracking_mkdir)
+    out_dir = tmp_path / "out"
+    with OutputWriter() as writer:
+        writer.write_text(out_dir / "a.txt", "a")
+        writer.write_text(out_dir / "b.txt", "b")
+        writer.write_json(out_dir / "b.txt.voc.json", {"k": "v"})
+
+    assert calls == [out_dir]
+    assert (out_dir / "b.txt.voc.json").read_text(encoding="utf-8") == '{\n  "k": "v"\n}'
+
+
+def test_output_writer_background_flushes_on_close(tmp_path: Path) -> None:
+    writer = OutputWriter(background=True, max_pending=2)
+    for index in range(10):
+        writer.write_text(tmp_path / "out" / f"{index}.txt", str(index))
+    writer.close()
+
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(
+        f"{index}.txt" for index in range(10)
+    )
+
+
+def test_output_writer_background_reraises_errors(tmp_path: Path) -> None:
+    blocker = tmp_path / "blocker"
+    blocker.write_text("not a directory", encoding="utf-8")
+
+    writer = OutputWriter(background=True)
+    writer.write_text(blocker / "child.txt", "data")
+    with pytest.raises(OSError):
+        writer.close()
+
+
+def test_read_source_normalises_newlines(tmp_path: Path) -> None:
+    source = tmp_path / "crlf.txt"
+    source.write_bytes("zażółć\r\ngęślą\rjaźń".encode())
+
+    text, size = read_source(SourceFile(source))
+
+    assert text == "zażółć\ngęślą\njaźń"
+    assert size == source.stat().st_size
+
+
+def test_read_source_trusts_discovered_size(tmp_path: Path) -> None:
+    source = tmp_path / "note.txt"
+    source.write_text("hello", encoding="utf-8")
+
+    _text, size = read_source(SourceFile(source, size=1234))
+
+    assert size == 1234
@@ -0,0 +1,106 @@
+# this_file: tests/test_glossary.py
+"""Tests for picking the vocabulary terms that occur in a chunk."""
+
+from __future__ import annotations
+
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from abersetz.config import EngineConfig, load_config
+from abersetz.engines import create_engine
+from abersetz.glossary import Glossary, normalize, relevant_terms
+from abersetz.providers.base import EngineRequest
+from abersetz.providers.llm import LlmEngine
+from abersetz.providers.mlx import build_mthy_prompt
+from abersetz.vocabulary import Vocabulary
+
+
+def _request(text: str, voc: dict[str, str]) -> EngineRequest:
+    return EngineRequest(
+        text=text,
+        source_lang="en",
+        target_lang="de",
+        is_html=False,
+        voc=Vocabulary(voc),
+        prolog={},
+        chunk_index=0,
+        total_chunks=1,
+    )
+
+
+def test_find_ignores_case_whitespace_and_short_inflections() -> None:
+    glossary = Glossary(["Widget", "company", "Katze", "cat", "New York", "翻译", "C++"])
+
+    hits = glossary.find(
+        "Our WIDGETS and companies: a Katzen cat, catalogue; new\n york 机器翻译 in c++ concat"
+    )
+
+    assert set(hits) == {"Widget", "company", "Katze", "cat", "New York", "翻译", "C++"}
+    assert hits["cat"] == 1, "catalogue is too long a suffix and concat is mid-word"
+    assert normalize("  New\tYork ") == "new york"
+
+
+def test_relevant_terms_ranks_by_frequency_and_caps() -> None:
+    voc = {"cat": "Katze", "dog": "Hund", "bird": "Vogel", "fish": "Fisch"}
+    text = "A dog, a cat and another cat. No fish here? One fish."
+
+    assert relevant_terms(text, voc) == {"cat": "Katze", "dog": "Hund", "fish": "Fisch"}
+    assert relevant_terms(text, voc, limit=2) == {"cat": "Katze", "fish": "Fisch"}
+    assert relevant_terms(text, voc, limit=0) == voc
+    assert relevant_terms(text, {}) == {}
+
+
+def test_shared_glossary_only_returns_terms_of_the_current_vocabulary() -> None:
+    glossary = Glossary()
+
+    assert relevant_terms("cat and dog", {"cat": "Katze"}, glossary=glossary) == {"cat": "Katze"}
+    assert relevant_terms("cat and dog", {"dog": "Hund"}, glossary=glossary) == {"dog": "Hund"}
+    assert len(glossary) == 2
+
+
+def test_llm_prompt_carries_only_relevant_vocabulary() -> None:
+    client = SimpleNamespace(calls=[])
+
+    def create(**kwargs: object) -> SimpleNamespace:
+        client.calls.append(kwargs)
+        message = SimpleNamespace(content="<output>ok</output>")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    client.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+    engine = LlmEngine(EngineConfig(name="llm-test"), client, model="m", temperature=0.0)
+    voc = {f"term{index}": f"Begriff{index}" for index in range(500)} | {"widget": "Dings"}
+
+    result = engine.translate(_request("Two widgets.", voc))
+
+    prompt = client.calls[0]["messages"][1]["content"]
+    prolog = json.loads(re.search(r"<prolog>(.*)</prolog>", prompt).group(1))
+    assert json.loads(prolog["__current__"]) == {"widget": "Dings"}
+    assert len(result.voc) == 501, "The vocabulary itself is kept whole"
+
+    unlimited = LlmEngine(
+        EngineConfig(name="llm-test"), client, model="m", temperature=0.0, glossary_limit=0
+    )
+    unlimited.translate(_request("Two widgets.", voc))
+    assert "term499" in client.calls[1]["messages"][1]["content"]
+
+
+def test_mthy_prompt_lists_only_terms_in_the_source() -> None:
+    voc = {"cat": "kot", "dog": "pies"}
+
+    prompt = build_mthy_prompt("The cats sleep.", "波兰语", voc)
+    assert prompt.startswith("参考下面的翻译：cat翻译成kot将")
+    assert not build_mthy_prompt("Nothing here.", "波兰语", voc).startswith("参考")
+    assert "dog翻译成pies" in build_mthy_prompt("Nothing here.", "波兰语", voc, limit=0)
+
+
+def test_glossary_limit_engine_option(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SILICONFLOW_API_KEY", "env-key")
+    config = load_config()
+    config.engines["ullm"].options["profiles"]["default"]["glossary_limit"] = 3
+
+    engine = create_engine("ullm/default", config, client=object())
+
+    assert engine._glossary_limit == 3  # type: ignore[attr-defined]
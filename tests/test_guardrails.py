@@ -0,0 +1,60 @@
+# this_file: tests/test_guardrails.py
+"""Tests for local-generation output guardrails."""
+
+from __future__ import annotations
+
+from abersetz.providers.guardrails import (
+    BUDGET_FLOOR,
+    GenerationLimits,
+    RepetitionGuard,
+    expansion_ratio,
+    token_budget,
+)
+
+
+def test_expansion_ratio_uses_language_table_and_override() -> None:
+    assert expansion_ratio("de") == 2.0
+    assert expansion_ratio("th") == 3.0
+    assert expansion_ratio("MY-mm") == 4.0
+    assert expansion_ratio("th", 1.5) == 1.5
+
+
+def test_token_budget_scales_with_source_and_respects_bounds() -> None:
+    assert token_budget(100, "de", 2048) == 200
+    assert token_budget(100, "hi", 2048) == 300
+    assert token_budget(100, "de", 150) == 150, "Never above the configured max_tokens"
+    assert token_budget(1, "de", 2048) == BUDGET_FLOOR
+    assert token_budget(0, "de", 8) == 8
+    assert GenerationLimits(max_tokens=2048, expansion=1.25).budget(100, "de") == 125
+
+
+def test_repetition_guard_detects_short_loops() -> None:
+    guard = RepetitionGuard()
+    prefix = [1, 2, 3, 4, 5, 6]
+
+    assert not guard.looping(prefix + [7, 8, 7, 8, 7, 8])
+    assert guard.looping(prefix + [7, 8] * 8)
+    assert guard.tripped
+
+
+def test_repetition_guard_detects_longer_units() -> None:
+    unit = list(range(10, 30))
+
+    assert not RepetitionGuard().looping(unit * 3)
+    assert RepetitionGuard().looping([1, 2] + unit * 4)
+
+
+def test_repetition_guard_allows_repetition_present_in_source() -> None:
+    ruler = [9] * 40
+    guard = RepetitionGuard(source_tokens=[1] + ruler + [2])
+
+    assert not guard.looping([3] + ruler)
+    assert guard.looping([3] + [9] * 60), "Longer than anything in the source"
+
+
+def test_repetition_guard_window_covers_longest_check() -> None:
+    guard = RepetitionGuard()
+    unit = list(range(100, 132))
+    generated = list(range(500)) + unit * 4
+
+    assert guard.looping(generated[-guard.window :])
@@ -0,0 +1,112 @@
+# this_file: tests/test_import_profile.py
+"""Tests for the CLI import-time profile and lazy CLI imports."""
+
+from __future__ import annotations
+
+import io
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from abersetz import cli_fast
+from abersetz.import_profile import (
+    cumulative_us,
+    format_report,
+    parse_importtime,
+    run,
+    total_us,
+)
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       500 |        900 | encodings
+warning: something unrelated
+import time:       300 |        300 |     fire.core
+import time:       200 |        500 |   fire
+import time:      1000 |       2000 | abersetz.cli
+"""
+
+
+def test_parse_importtime_reads_depth_and_keeps_other_lines() -> None:
+    records, other = parse_importtime(SAMPLE)
+
+    assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+        ("_io", 120, 120, 1),
+        ("encodings", 500, 900, 0),
+        ("fire.core", 300, 300, 2),
+        ("fire", 200, 500, 1),
+        ("abersetz.cli", 1000, 2000, 0),
+    ]
+    assert other == ["warning: something unrelated"]
+    assert total_us(records) == 2900
+    assert cumulative_us(records, "fire") == 500
+    assert cumulative_us(records, "httpx") is None
+
+
+def test_format_report_lists_slowest_shallow_imports() -> None:
+    records, _ = parse_importtime(SAMPLE)
+
+    report = format_report(records, top=2).splitlines()
+
+    assert report[0] == "import time: 2.9 ms total, 5 modules"
+    assert report[2].endswith(" abersetz.cli")
+    assert report[3].endswith(" encodings")
+    assert len(report) == 4
+
+
+def test_run_profiles_the_command_in_a_child_interpreter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[list[str]] = []
+
+    def fake_run(command, **kwargs):
+        calls.append(command)
+        return SimpleNamespace(returncode=3, stderr=SAMPLE)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    out = io.StringIO()
+
+    assert run(["lang"], stream=out) == 3
+    assert calls == [[sys.executable, "-X", "importtime", "-m", "abersetz", "lang"]]
+    assert "warning: something unrelated" in out.getvalue()
+    assert "abersetz.cli" in out.getvalue()
+
+
+def test_cli_fast_dispatches_import_profile_flag(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen: list[list[str]] = []
+    monkeypatch.setattr(sys, "argv", ["abersetz", "--import-profile", "lang"])
+    monkeypatch.setattr("abersetz.import_profile.run", lambda argv: seen.append(argv) or 0)
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli_fast.main()
+
+    assert excinfo.value.code == 0
+    assert seen == [["lang"]]
+
+
+def test_abtr_dispatches_import_profile_as_tr(monkeypatch: pytest.MonkeyPatch) -> None:
+    from abersetz import cli
+
+    seen: list[list[str]] = []
+    monkeypatch.setattr(sys, "argv", ["abtr", "--import-profile", "de", "Hello"])
+    monkeypatch.setattr("abersetz.import_profile.run", lambda argv: seen.append(argv) or 0)
+
+    with pytest.raises(SystemExit):
+        cli.abtr_main()
+
+    assert seen == [["tr", "de", "Hello"]]
+
+
+def test_cli_import_defers_pipeline_engines_and_rich() -> None:
+    probe = (
+        "import sys, abersetz.cli; "
+        "print(' '.join(m for m in ('abersetz.pipeline', 'abersetz.setup', "
+        "'abersetz.validation', 'httpx', 'rich.console') if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+
+    assert completed.stdout.strip() == ""
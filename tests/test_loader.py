@@ -0,0 +1,72 @@
+"""Tests for deferred and background model loading."""
+# this_file: tests/test_loader.py
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from abersetz.providers.loader import ModelLoader
+
+
+def test_model_loader_defers_until_first_get() -> None:
+    calls: list[int] = []
+    loader = ModelLoader(lambda: calls.append(1) or "model")
+
+    assert not loader.started
+    assert calls == []
+    assert loader.get() == "model"
+    assert loader.get() == "model"
+    assert calls == [1]
+
+
+def test_model_loader_warm_up_runs_in_background() -> None:
+    release = threading.Event()
+    threads: list[str] = []
+
+    def load() -> str:
+        threads.append(threading.current_thread().name)
+        release.wait(5)
+        return "model"
+
+    loader = ModelLoader(load, warm=True)
+    assert loader.started, "Construction returns while the load is still running"
+    release.set()
+
+    assert loader.get() == "model"
+    assert threads == ["abersetz-model-warmup"]
+
+
+def test_model_loader_shares_one_load_between_threads() -> None:
+    calls: list[int] = []
+    gate = threading.Barrier(4)
+
+    def load() -> str:
+        calls.append(1)
+        return "model"
+
+    loader = ModelLoader(load)
+
+    def fetch(_: int) -> str:
+        gate.wait(5)
+        return loader.get()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(fetch, range(4))) == ["model"] * 4
+    assert calls == [1]
+
+
+def test_model_loader_remembers_failure() -> None:
+    calls: list[int] = []
+
+    def load() -> str:
+        calls.append(1)
+        raise RuntimeError("model missing")
+
+    loader = ModelLoader(load)
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="model missing"):
+            loader.get()
+    assert calls == [1]
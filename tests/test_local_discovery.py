@@ -1,13 +1,16 @@
 # this_file: tests/test_local_discovery.py
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
 
+from abersetz.config import config_dir
 from abersetz.providers.llm.local_discovery import LocalModelFinder
 from abersetz.providers.mlx import EngineError, resolve_and_download_model
+from abersetz.providers.model_index import INDEX_FILENAME, ModelIndex
 
 
 def test_local_model_finder_scans_correctly(
@@ -84,33 +87,14 @@ def test_resolve_local_situation_model(tmp_path: Path, monkeypatch: pytest.Monke
     lm_models_path = mock_home / ".cache" / "lm-studio" / "models" / "tencent" / "Hy-MT2-1.8B-GGUF"
     lm_models_path.mkdir(parents=True)
     model_file = lm_models_path / "Hy-MT2-1.8B-Q8_0.gguf"
-    model_file.write_text("model weights", encoding="utf-8")
+    # Sparse file larger than the 100MB discovery threshold
+    with model_file.open("wb") as handle:
+        handle.truncate(200 * 1024 * 1024)
 
     # Monkeypatch Path.home so it queries mock_home
     monkeypatch.setattr(Path, "home", lambda: mock_home)
     monkeypatch.setattr("shutil.which", lambda _: None)
 
-    # Monkeypatch Path.stat to simulate files larger than 100MB
-    original_stat = Path.stat
-
-    def mock_stat(self, *args, **kwargs):
-        res = original_stat(self, *args, **kwargs)
-
-        class MockStat:
-            def __init__(self, orig):
-                self._orig = orig
-
-            @property
-            def st_size(self):
-                return 200 * 1024 * 1024
-
-            def __getattr__(self, name):
-                return getattr(self._orig, name)
-
-        return MockStat(res)
-
-    monkeypatch.setattr(Path, "stat", mock_stat)
-
     # Monkeypatch Path.exists to isolate tests from real filesystems
     original_exists = Path.exists
 
@@ -169,33 +153,13 @@ def test_resolve_local_mlx_situation_model(tmp_path: Path, monkeypatch: pytest.M
     )
     mlx_model_path.mkdir(parents=True)
     weights_file = mlx_model_path / "weights.safetensors"
-    weights_file.write_text("mlx model weights", encoding="utf-8")
+    with weights_file.open("wb") as handle:
+        handle.truncate(200 * 1024 * 1024)
 
     # Monkeypatch Path.home so it queries mock_home
     monkeypatch.setattr(Path, "home", lambda: mock_home)
     monkeypatch.setattr("shutil.which", lambda _: None)
 
-    # Monkeypatch Path.stat to simulate files larger than 100MB
-    original_stat = Path.stat
-
-    def mock_stat(self, *args, **kwargs):
-        res = original_stat(self, *args, **kwargs)
-
-        class MockStat:
-            def __init__(self, orig):
-                self._orig = orig
-
-            @property
-            def st_size(self):
-                return 200 * 1024 * 1024
-
-            def __getattr__(self, name):
-                return getattr(self._orig, name)
-
-        return MockStat(res)
-
-    monkeypatch.setattr(Path, "stat", mock_stat)
-
     # Monkeypatch Path.exists to isolate tests from real filesystems
     original_exists = Path.exists
 
@@ -256,3 +220,81 @@ def test_local_model_finder_uses_lmstudio_cli_grouped_models(
     assert models[0].app == "LMStudio"
     assert models[0].format == "Safetensors"
     assert models[0].path == lm_models_path / "publisher" / "qwen3-test"
+
+
+def _isolated_finder(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> LocalModelFinder:
+    mock_home = tmp_path / "home"
+    mock_home.mkdir(exist_ok=True)
+    finder = LocalModelFinder()
+    monkeypatch.setattr(finder, "home", mock_home)
+    monkeypatch.setattr("shutil.which", lambda _: None)
+    return finder
+
+
+def test_discovery_snapshot_skips_unchanged_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    finder = _isolated_finder(tmp_path, monkeypatch)
+    hub = finder.home / ".cache" / "huggingface" / "hub"
+    repo = hub / "models--tencent--Hy-MT2-1.8B-GGUF" / "snapshots" / "abc"
+    repo.mkdir(parents=True)
+    (repo / "Hy-MT2-1.8B-Q8_0.gguf").write_text("weights", encoding="utf-8")
+
+    cold = finder.discover_models(min_size_mb=0.0)
+    listed: list[str] = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path):
+        listed.append(str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", counting_scandir)
+    warm = LocalModelFinder()
+    monkeypatch.setattr(warm, "home", finder.home)
+
+    assert [m.path for m in warm.discover_models(min_size_mb=0.0)] == [m.path for m in cold]
+    assert listed == [], "A warm scan of an unchanged tree lists no directory"
+    assert warm.scanned_dirs == finder.scanned_dirs
+    assert [path.name for path in config_dir().iterdir()] == [INDEX_FILENAME]
+
+    new_repo = hub / "models--tencent--Hy-MT2-7B-GGUF" / "snapshots" / "def"
+    new_repo.mkdir(parents=True)
+    (new_repo / "Hy-MT2-7B-Q8_0.gguf").write_text("weights", encoding="utf-8")
+    models = warm.discover_models(format_filter="gguf", min_size_mb=0.0)
+
+    assert {m.name for m in models} == {"Hy-MT2-1.8B-Q8_0.gguf", "Hy-MT2-7B-Q8_0.gguf"}
+    assert str(repo) not in listed, "Only changed directories are listed again"
+    assert str(hub) in listed
+    index = ModelIndex()
+    assert index.load() and index.is_current(warm), "The index was rebuilt by the same scan"
+    assert index.listings == warm.listings
+
+
+def test_discovery_snapshot_caches_bundle_sizes_and_keeps_filters(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    finder = _isolated_finder(tmp_path, monkeypatch)
+    pinokio = finder.home / "pinokio"
+    bundle = pinokio / "my-model.mlpackage"
+    (bundle / "Data").mkdir(parents=True)
+    (bundle / "Data" / "weights.bin").write_bytes(b"x" * 2048)
+    (pinokio / "notes.txt").write_text("not a model", encoding="utf-8")
+
+    assert [m.size for m in finder.discover_models(min_size_mb=0.0)] == [2048]
+
+    sizes: list[object] = []
+    monkeypatch.setattr(finder, "_get_dir_size", lambda path: sizes.append(path) or 0)
+    (pinokio / "other.bin").write_bytes(b"y")
+    models = finder.discover_models(min_size_mb=0.0)
+
+    assert sizes == [], "The bundle is unchanged, so its size comes from the snapshot"
+    assert {(m.name, m.size) for m in models} == {("my-model.mlpackage", 2048), ("other.bin", 1)}
+    assert finder.discover_models(format_filter="gguf", min_size_mb=0.0) == []
+    coreml = finder.discover_models(format_filter="coreml", min_size_mb=0.001)
+    assert [m.name for m in coreml] == ["my-model.mlpackage"]
+
+    (bundle / "Data" / "weights.bin").unlink()
+    (bundle / "Data" / "weights-v2.bin").write_bytes(b"x" * 4096)
+    monkeypatch.delattr(finder, "_get_dir_size")
+    rebuilt = {m.name: m.size for m in finder.discover_models(min_size_mb=0.0)}
+    assert rebuilt["my-model.mlpackage"] == 4096, "New weights inside the bundle are measured"
@@ -0,0 +1,175 @@
+# this_file: tests/test_metrics.py
+"""Tests for the in-process Prometheus-style metrics."""
+
+from __future__ import annotations
+
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from abersetz import metrics
+from abersetz.cli import AbersetzCLI
+from abersetz.metrics import Registry
+from abersetz.pipeline import TranslatorOptions, translate_path
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry() -> None:
+    metrics.REGISTRY.clear()
+
+
+def test_exposition_renders_counters_gauges_and_histograms() -> None:
+    registry = Registry()
+    requests = registry.counter("x_requests_total", "Requests.", ("engine",))
+    depth = registry.gauge("x_depth", "Depth.")
+    latency = registry.histogram("x_seconds", "Latency.", ("engine",), buckets=(0.1, 1.0))
+
+    requests.inc(engine='say "hi"')
+    requests.inc(2, engine='say "hi"')
+    depth.inc(3)
+    depth.dec()
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, engine="tr")
+
+    assert registry.exposition().splitlines() == [
+        "# HELP x_requests_total Requests.",
+        "# TYPE x_requests_total counter",
+        'x_requests_total{engine="say \\"hi\\""} 3',
+        "# HELP x_depth Depth.",
+        "# TYPE x_depth gauge",
+        "x_depth 2",
+        "# HELP x_seconds Latency.",
+        "# TYPE x_seconds histogram",
+        'x_seconds_bucket{engine="tr",le="0.1"} 1',
+        'x_seconds_bucket{engine="tr",le="1"} 2',
+        'x_seconds_bucket{engine="tr",le="+Inf"} 3',
+        'x_seconds_sum{engine="tr"} 5.55',
+        'x_seconds_count{engine="tr"} 3',
+    ]
+    assert latency.count(engine="tr") == 3
+
+
+def test_metrics_reject_bad_labels_and_duplicates() -> None:
+    registry = Registry()
+    counter = registry.counter("x_total", "X.", ("engine",))
+    with pytest.raises(ValueError, match="takes labels"):
+        counter.inc(provider="google")
+    with pytest.raises(ValueError, match="only go up"):
+        counter.inc(-1, engine="tr")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("x_total", "Again.")
+
+
+def test_values_are_positional_so_any_label_name_works() -> None:
+    registry = Registry()
+    counter = registry.counter("x_total", "X.", ("amount",))
+    gauge = registry.gauge("x_level", "Level.", ("value",))
+
+    counter.inc(2, amount="large")
+    gauge.set(5, value="high")
+
+    assert counter.value(amount="large") == 2
+    assert gauge.value(value="high") == 5
+
+
+def test_is_rate_limited_detects_429s() -> None:
+    response_error = RuntimeError("Client error")
+    response_error.response = SimpleNamespace(status_code=429)  # type: ignore[attr-defined]
+
+    assert metrics.is_rate_limited(response_error)
+    assert metrics.is_rate_limited(RuntimeError("Rate limit reached for gpt-4o-mini"))
+    assert not metrics.is_rate_limited(RuntimeError("503 Service Unavailable"))
+    assert not metrics.is_rate_limited(None)
+
+
+def test_retries_are_attributed_to_the_engine_in_scope() -> None:
+    labels = {"engine": "ullm", "provider": "openai"}
+    with metrics.engine_scope(labels):
+        metrics.record_retry(RuntimeError("HTTP 429 Too Many Requests"))
+        metrics.record_retry(TimeoutError("read timeout"))
+    metrics.record_retry(None)
+
+    assert metrics.RETRIES.value(**labels) == 2
+    assert metrics.RATE_LIMITED.value(**labels) == 1
+    assert metrics.RETRIES.value(engine="", provider="") == 1
+
+
+@pytest.mark.parametrize("slots", [1, 3])
+def test_pipeline_records_engine_cache_and_file_metrics(tmp_path: Path, slots: int) -> None:
+    text = "".join(f"Line number {i}.\n\n" for i in range(30))
+    (tmp_path / "a.txt").write_text(text, encoding="utf-8")
+    spec = f"fail=0.4,retries=30,slots={slots}"
+    opts = TranslatorOptions(
+        engine=f"mk::{spec}",
+        to_lang="de",
+        chunk_size=50,
+        output_dir=tmp_path / "out",
+    )
+
+    (result,) = translate_path(tmp_path / "a.txt", opts)
+
+    labels = {"engine": "mock", "provider": "mock"}
+    assert metrics.ENGINE_REQUESTS.value(outcome="ok", **labels) == result.chunks
+    assert metrics.CACHE_LOOKUPS.value(result="miss", **labels) == result.chunks
+    assert metrics.CHUNK_SECONDS.count(**labels) == result.chunks
+    assert metrics.CHARS_IN.value(**labels) == result.chars
+    assert metrics.RETRIES.value(**labels) == result.retries > 0
+    assert metrics.QUEUE_DEPTH.value(**labels) == 0
+    assert metrics.FILES.value(status="ok") == 1
+
+
+def test_failed_engine_calls_and_rate_limits_are_counted(tmp_path: Path) -> None:
+    source = tmp_path / "a.txt"
+    source.write_text("Hello.", encoding="utf-8")
+
+    class Throttled:
+        name = "throttled"
+        provider = "api"
+        chunk_size = None
+        html_chunk_size = None
+
+        def chunk_size_for(self, fmt: object) -> None:
+            return None
+
+        def translate(self, request: object) -> object:
+            raise RuntimeError("429 Too Many Requests")
+
+    engine: Any = Throttled()
+    with pytest.raises(RuntimeError):
+        translate_path(source, TranslatorOptions(to_lang="de"), engine=engine)
+
+    labels = {"engine": "throttled", "provider": "api"}
+    assert metrics.ENGINE_REQUESTS.value(outcome="error", **labels) == 1
+    assert metrics.RATE_LIMITED.value(**labels) == 1
+    assert metrics.CACHE_LOOKUPS.value(result="miss", **labels) == 1
+    assert metrics.QUEUE_DEPTH.value(**labels) == 0
+    assert metrics.FILES.value(status="failed") == 1
+
+
+def test_http_server_serves_exposition() -> None:
+    metrics.FILES.inc(status="ok")
+    server = metrics.start_http_server(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert content_type == metrics.CONTENT_TYPE
+    assert 'abersetz_files_total{status="ok"} 1' in body
+
+
+def test_cli_metrics_flag_writes_textfile(tmp_path: Path) -> None:
+    target = tmp_path / "prom" / "abersetz.prom"
+
+    AbersetzCLI().tr("de", "Hello", engine="mk::", metrics=str(target))
+
+    text = target.read_text(encoding="utf-8")
+    assert "# TYPE abersetz_engine_requests_total counter" in text
+    assert 'abersetz_engine_requests_total{engine="mock"' in text
@@ -209,3 +209,256 @@ def test_marianmt_not_in_abersetz_engines() -> None:
     from abersetz.providers.mlx import LocalMlxEngine
 
     assert LocalMlxEngine.__name__ == "LocalMlxEngine"
+
+
+# ---------------------------------------------------------------------------
+# Prompt-prefix KV cache reuse
+# ---------------------------------------------------------------------------
+
+
+def _fake_mlx_with_prompt_cache(monkeypatch: pytest.MonkeyPatch) -> list[list[int]]:
+    """Install a fake ``mlx_lm`` whose KV cache tracks an ``offset`` like the real one."""
+    import sys
+    import types
+
+    evaluated: list[list[int]] = []
+
+    class FakeKVCache:
+        def __init__(self) -> None:
+            self.offset = 0
+
+    class FakeTokenizer:
+        bos_token = None
+        chat_template = None
+
+        def encode(self, text: str, add_special_tokens: bool = True) -> list[int]:
+            return [ord(char) for char in text]
+
+    def fake_generate(model, tokenizer, *, prompt, max_tokens, verbose, prompt_cache=None, **_):
+        evaluated.append(list(prompt))
+        generated = 3
+        for layer in prompt_cache:
+            layer.offset += len(prompt) + generated - 1
+        return "out"
+
+    def trim_prompt_cache(cache, count):
+        for layer in cache:
+            layer.offset -= count
+        return count
+
+    mlx_lm = types.ModuleType("mlx_lm")
+    mlx_lm.load = lambda path: (object(), FakeTokenizer())
+    mlx_lm.generate = fake_generate
+
+    def fake_stream_generate(model, tokenizer, prompt, *, max_tokens, prompt_cache=None, **_):
+        evaluated.append(list(prompt))
+        for layer in prompt_cache or []:
+            layer.offset += len(prompt) + 2
+        yield types.SimpleNamespace(text="o")
+        yield types.SimpleNamespace(text="ut")
+
+    mlx_lm.stream_generate = fake_stream_generate
+    models = types.ModuleType("mlx_lm.models")
+    cache = types.ModuleType("mlx_lm.models.cache")
+    cache.make_prompt_cache = lambda model: [FakeKVCache(), FakeKVCache()]
+    cache.can_trim_prompt_cache = lambda prompt_cache: True
+    cache.trim_prompt_cache = trim_prompt_cache
+    models.cache = cache
+    mlx_lm.models = models
+    monkeypatch.setitem(sys.modules, "mlx_lm", mlx_lm)
+    monkeypatch.setitem(sys.modules, "mlx_lm.models", models)
+    monkeypatch.setitem(sys.modules, "mlx_lm.models.cache", cache)
+    return evaluated
+
+
+def _mthy_request(text: str, voc: dict[str, str]):
+    from abersetz.providers.base import EngineRequest
+
+    return EngineRequest(
+        text=text,
+        source_lang="en",
+        target_lang="pl",
+        is_html=False,
+        voc=voc,
+        prolog={},
+        chunk_index=0,
+        total_chunks=1,
+    )
+
+
+def test_mlx_engine_reuses_shared_prompt_prefix(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    from abersetz.config import EngineConfig
+    from abersetz.providers.mlx import LocalMlxEngine, mthy_prompt_prefix
+
+    evaluated = _fake_mlx_with_prompt_cache(monkeypatch)
+    engine = LocalMlxEngine("mthy", EngineConfig(name="mthy"), str(tmp_path), max_tokens=8)
+    voc = {"cat": "kot"}
+    prefix = mthy_prompt_prefix("波兰语", voc)
+
+    engine.translate(_mthy_request("first cat", voc))
+    engine.translate(_mthy_request("second cat", voc))
+    engine.translate(_mthy_request("other dog", {"dog": "pies"}))
+
+    assert evaluated[0] == [ord(c) for c in prefix + "first cat"]
+    assert evaluated[1] == [ord(c) for c in "second cat"], "Shared prefix is not re-evaluated"
+    assert len(evaluated[2]) > len("other dog"), "A different glossary re-evaluates its prefix"
+
+
+def test_mlx_engine_streams_and_keeps_prompt_cache(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    from abersetz.config import EngineConfig
+    from abersetz.providers.mlx import LocalMlxEngine
+
+    evaluated = _fake_mlx_with_prompt_cache(monkeypatch)
+    engine = LocalMlxEngine("mthy", EngineConfig(name="mthy"), str(tmp_path), max_tokens=8)
+
+    first = list(engine.translate_stream(_mthy_request("first chunk", {})))
+    engine.translate(_mthy_request("second chunk", {}))
+
+    assert first == ["o", "ut"]
+    assert evaluated[1] == [ord(c) for c in "second chunk"], "Streaming leaves the cache reusable"
+
+
+def test_mlx_engine_drafts_speculatively_and_counts_acceptance(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    import sys
+    import types
+
+    from abersetz.config import EngineConfig
+    from abersetz.providers.mlx import LocalMlxEngine
+
+    _fake_mlx_with_prompt_cache(monkeypatch)
+    evaluated: list[list[int]] = []
+    calls: list[dict[str, object]] = []
+    draft_dir = tmp_path / "draft"
+    draft_dir.mkdir()
+
+    def fake_stream_generate(model, tokenizer, prompt, *, prompt_cache, **kwargs):
+        evaluated.append(list(prompt))
+        calls.append(kwargs)
+        # Target and draft layers end at different offsets after speculation.
+        for layer in prompt_cache[:2]:
+            layer.offset += len(prompt) + 2
+        for layer in prompt_cache[2:]:
+            layer.offset += len(prompt) + 1
+        yield types.SimpleNamespace(text="o", from_draft=False)
+        yield types.SimpleNamespace(text="ut", from_draft=True)
+
+    sys.modules["mlx_lm"].stream_generate = fake_stream_generate
+    engine = LocalMlxEngine(
+        "mthy",
+        EngineConfig(name="mthy"),
+        str(tmp_path),
+        max_tokens=8,
+        draft=str(draft_dir),
+        draft_tokens=3,
+    )
+
+    assert engine.translate(_mthy_request("first chunk", {})).text == "out"
+    engine.translate(_mthy_request("second chunk", {}))
+
+    assert calls[0]["draft_model"] is not None
+    assert calls[0]["num_draft_tokens"] == 3
+    assert evaluated[1] == [ord(c) for c in "second chunk"], "Both caches trimmed to the prompt"
+    assert engine.speculation is not None
+    assert (engine.speculation.drafted, engine.speculation.accepted) == (6, 2)
+    assert engine.speculation.generated == 4
+
+
+def test_mlx_engine_prompt_cache_can_be_disabled(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    from abersetz.config import EngineConfig
+    from abersetz.providers.mlx import LocalMlxEngine
+
+    evaluated: list[object] = []
+    _fake_mlx_with_prompt_cache(monkeypatch)
+    import sys
+
+    sys.modules["mlx_lm"].generate = lambda model, tok, *, prompt, max_tokens, verbose, **_: (
+        evaluated.append(prompt) or "out"
+    )
+    engine = LocalMlxEngine(
+        "mthy", EngineConfig(name="mthy"), str(tmp_path), max_tokens=8, prompt_cache=False
+    )
+    engine.translate(_mthy_request("chunk", {}))
+
+    assert isinstance(evaluated[0], str)
+
+
+def test_mlx_engine_caps_tokens_and_guards_repetition(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    from abersetz.config import EngineConfig
+    from abersetz.providers.mlx import LocalMlxEngine
+
+    calls: list[dict[str, object]] = []
+    _fake_mlx_with_prompt_cache(monkeypatch)
+    import sys
+
+    sys.modules["mlx_lm"].generate = lambda model, tok, **kwargs: calls.append(kwargs) or "out"
+    engine = LocalMlxEngine(
+        "mthy", EngineConfig(name="mthy"), str(tmp_path), max_tokens=512, prompt_cache=False
+    )
+    engine.translate(_mthy_request("x" * 100, {}))
+    unguarded = LocalMlxEngine(
+        "mthy",
+        EngineConfig(name="mthy"),
+        str(tmp_path),
+        max_tokens=512,
+        prompt_cache=False,
+        expansion=1.0,
+        repetition_guard=False,
+    )
+    unguarded.translate(_mthy_request("x" * 100, {}))
+
+    assert calls[0]["max_tokens"] == 200
+    assert len(calls[0]["logits_processors"]) == 1
+    assert calls[1]["max_tokens"] == 100
+    assert "logits_processors" not in calls[1]
+
+
+def test_gguf_engine_attaches_ram_prompt_cache(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    import sys
+    from types import SimpleNamespace
+
+    from abersetz.config import EngineConfig
+    from abersetz.providers.gguf import LocalGgufEngine
+
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    caches: list[object] = []
+
+    class FakeRamCache:
+        def __init__(self, capacity_bytes: int) -> None:
+            self.capacity_bytes = capacity_bytes
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            pass
+
+        def set_cache(self, cache: object) -> None:
+            caches.append(cache)
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
+            return {"choices": [{"message": {"content": "out"}}]}
+
+    monkeypatch.setitem(
+        sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama, LlamaRAMCache=FakeRamCache)
+    )
+    engine = LocalGgufEngine(
+        "mthy",
+        EngineConfig(name="mthy"),
+        str(model_path),
+        max_tokens=8,
+        temperature=0.0,
+        n_gpu_layers=0,
+        n_ctx=512,
+        prompt_cache_mb=64,
+    )
+    engine.translate(_mthy_request("chunk", {}))
+
+    assert [cache.capacity_bytes for cache in caches] == [64 * 1024 * 1024]
@@ -0,0 +1,104 @@
+# this_file: tests/test_mock_engine.py
+"""Tests for the offline mock engine."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from abersetz.config import AbersetzConfig, EngineConfig
+from abersetz.engines import create_engine
+from abersetz.pipeline import TranslatorOptions, translate_path
+from abersetz.providers.base import EngineError, EngineRequest, reset_retry_count, retry_count
+from abersetz.providers.mock import MockEngine, MockSpec, parse_duration
+
+
+def _request(text: str, *, is_html: bool = False) -> EngineRequest:
+    return EngineRequest(
+        text=text,
+        source_lang="en",
+        target_lang="de",
+        is_html=is_html,
+        voc={"a": "b"},
+        prolog={},
+        chunk_index=0,
+        total_chunks=1,
+    )
+
+
+def test_parse_duration_units() -> None:
+    assert parse_duration("50ms") == pytest.approx(0.05)
+    assert parse_duration("0.2s") == pytest.approx(0.2)
+    assert parse_duration("250us") == pytest.approx(0.00025)
+    assert parse_duration("10") == pytest.approx(0.01), "Bare numbers are milliseconds"
+    with pytest.raises(ValueError):
+        parse_duration("-5ms")
+
+
+def test_mock_spec_parses_selector_provider() -> None:
+    spec = MockSpec.parse("latency=50ms, jitter=10ms,fail=0.01,ratio=1.1")
+
+    assert spec == MockSpec(latency=0.05, jitter=0.01, fail=0.01, ratio=1.1)
+    assert MockSpec.parse(None) == MockSpec()
+    assert "ratio=1.1" in spec.describe()
+
+
+@pytest.mark.parametrize("spec", ["speed=3", "latency", "fail=2", "ratio=0", "slots=x"])
+def test_mock_spec_rejects_bad_options(spec: str) -> None:
+    with pytest.raises(EngineError):
+        MockSpec.parse(spec)
+
+
+def test_mock_engine_output_follows_ratio_and_keeps_html() -> None:
+    engine = MockEngine(MockSpec(ratio=1.5))
+
+    result = engine.translate(_request("abcd"))
+
+    assert result.text == "abcdab"
+    assert result.voc == {"a": "b"}
+    assert MockEngine(MockSpec(ratio=0.5)).translate(_request("abcd")).text == "ab"
+    html = "<p>Hello</p>"
+    assert engine.translate(_request(html, is_html=True)).text == html
+
+
+def test_mock_engine_failures_are_deterministic_and_retried() -> None:
+    with pytest.raises(EngineError, match="after 3 attempt"):
+        MockEngine(MockSpec(fail=1.0, retries=2)).translate(_request("x"))
+
+    reset_retry_count()
+    flaky = MockEngine(MockSpec(fail=0.5, retries=20, seed=7))
+    first = [flaky.translate(_request(f"chunk {i}")).text for i in range(20)]
+    retries = retry_count()
+    reset_retry_count()
+    second = [flaky.translate(_request(f"chunk {i}")).text for i in range(20)]
+
+    assert first == second
+    assert retries > 0
+    assert retry_count() == retries, "Same seed, same failures"
+
+
+def test_create_engine_builds_mock_from_selector() -> None:
+    config = AbersetzConfig()
+    config.engines["mock"] = EngineConfig(name="mock", chunk_size=300)
+
+    engine = create_engine("mk::latency=1ms,slots=2", config)
+    assert isinstance(engine, MockEngine)
+    assert engine.max_concurrency == 2
+    assert engine.chunk_size == 300
+    assert create_engine("mock::slots=2", config, slots=6).max_concurrency == 6
+
+
+def test_translate_path_runs_offline_with_mock(tmp_path: Path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text("Hello world.\n\n" * 50, encoding="utf-8")
+
+    results = translate_path(
+        source,
+        TranslatorOptions(
+            engine="mk::slots=4", to_lang="de", chunk_size=100, output_dir=tmp_path / "out"
+        ),
+    )
+
+    assert results[0].chunks > 1
+    assert results[0].destination.read_text(encoding="utf-8") == source.read_text(encoding="utf-8")
@@ -0,0 +1,97 @@
+# this_file: tests/test_model_index.py
+"""Tests for the persistent local model index."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from abersetz.providers.llm.local_discovery import LocalModel
+from abersetz.providers.model_index import INDEX_FILENAME, ModelIndex
+
+
+class FakeFinder:
+    """Reports the model files under ``root`` and records the scan like the real finder."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.scans = 0
+        self.scanned_dirs: dict[str, float] = {}
+        self.listings: dict[str, object] = {}
+
+    def _get_search_paths(self) -> dict[str, Path]:
+        return {"HuggingFace": self.root}
+
+    def scan_directories(self) -> list[tuple[LocalModel, str]]:
+        self.scans += 1
+        self.scanned_dirs = {}
+        models = []
+        for directory, _, files in os.walk(self.root):
+            self.scanned_dirs[directory] = os.stat(directory).st_mtime
+            for name in sorted(files):
+                path = Path(directory) / name
+                fmt = "GGUF" if path.suffix == ".gguf" else "Safetensors"
+                model = LocalModel(path, name, "HuggingFace", fmt, path.stat().st_size)
+                models.append((model, path.suffix[1:]))
+        return models
+
+
+def _hub(tmp_path: Path) -> Path:
+    root = tmp_path / "hub"
+    gguf = root / "models--tencent--Hy-MT2-1.8B-GGUF" / "snapshots" / "abc"
+    gguf.mkdir(parents=True)
+    (gguf / "Hy-MT2-1.8B-Q8_0.gguf").write_text("weights", encoding="utf-8")
+    mlx = root / "models--p0we7--Hy-MT2-1.8B-oQ8-fp16" / "snapshots" / "def"
+    mlx.mkdir(parents=True)
+    (mlx / "model.safetensors").write_text("weights", encoding="utf-8")
+    return root
+
+
+def test_model_index_is_reused_until_a_directory_changes(tmp_path: Path) -> None:
+    root = _hub(tmp_path)
+    finder = FakeFinder(root)
+    index_path = tmp_path / INDEX_FILENAME
+
+    first = ModelIndex.open(index_path, finder, min_size_mb=0)
+    second = ModelIndex.open(index_path, finder, min_size_mb=0)
+
+    assert finder.scans == 1, "An unchanged tree is served from the stored index"
+    assert second.lookup("tencent/Hy-MT2-1.8B-GGUF", "gguf") == first.lookup(
+        "tencent/Hy-MT2-1.8B-GGUF", "gguf"
+    )
+
+    new_repo = root / "models--tevino--Hy-MT2-7B-oQ8" / "snapshots" / "0"
+    new_repo.mkdir(parents=True)
+    (new_repo / "model.safetensors").write_text("weights", encoding="utf-8")
+    third = ModelIndex.open(index_path, finder, min_size_mb=0)
+
+    assert finder.scans == 2
+    assert third.lookup("tevino/Hy-MT2-7B-oQ8", "mlx") == str(new_repo)
+
+
+def test_model_index_lookup_by_repo_alias_and_backend(tmp_path: Path) -> None:
+    root = _hub(tmp_path)
+    index = ModelIndex.open(tmp_path / INDEX_FILENAME, FakeFinder(root), min_size_mb=0)
+    gguf_file = root / "models--tencent--Hy-MT2-1.8B-GGUF" / "snapshots" / "abc"
+    mlx_dir = root / "models--p0we7--Hy-MT2-1.8B-oQ8-fp16" / "snapshots" / "def"
+
+    assert index.lookup("tencent/Hy-MT2-1.8B-GGUF", "gguf") == str(
+        gguf_file / "Hy-MT2-1.8B-Q8_0.gguf"
+    )
+    assert index.lookup("1.8b-gguf", "gguf") == str(gguf_file / "Hy-MT2-1.8B-Q8_0.gguf")
+    assert index.lookup("p0we7/Hy-MT2-1.8B-oQ8-fp16", "mlx") == str(mlx_dir)
+    assert index.lookup("p0we7/Hy-MT2-1.8B-oQ8-fp16", "gguf") is None
+    assert index.lookup("Hy-MT2-1.8B-oQ8", "mlx") == str(mlx_dir), "Loose match still works"
+    assert index.lookup("unknown/model", "mlx") is None
+
+
+def test_model_index_rebuilds_when_file_is_corrupt(tmp_path: Path) -> None:
+    finder = FakeFinder(_hub(tmp_path))
+    index_path = tmp_path / INDEX_FILENAME
+    index_path.write_text("{not json", encoding="utf-8")
+
+    index = ModelIndex.open(index_path, finder, min_size_mb=0)
+
+    assert finder.scans == 1
+    assert len(index.models) == 2
+    assert ModelIndex(index_path).load()
@@ -129,3 +129,40 @@ def test_chat_declares_completions_attribute() -> None:
 def test_openai_initializes_chat_completions() -> None:
     client = OpenAI(api_key="secret")
     assert isinstance(client.chat.completions, ChatCompletions)
+
+
+def test_chat_completions_create_streams_server_sent_events(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    bodies: list[dict[str, Any]] = []
+    events = [
+        ": keep-alive",
+        'data: {"id": "s1", "choices": [{"index": 0, "delta": {"role": "assistant"}}]}',
+        'data: {"id": "s1", "choices": [{"index": 0, "delta": {"content": "Hola"}}]}',
+        'data: {"id": "s1", "choices": [{"index": 0, "delta": {"content": " mundo"},'
+        ' "finish_reason": "stop"}]}',
+        "data: [DONE]",
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        import json
+
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, text="\n\n".join(events) + "\n\n")
+
+    real_client = httpx.Client
+    monkeypatch.setattr(
+        httpx, "Client", lambda **kwargs: real_client(transport=httpx.MockTransport(handler))
+    )
+
+    client = OpenAI(api_key="sk-test")
+    chunks = list(
+        client.chat.completions.create(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "Hi"}], stream=True
+        )
+    )
+
+    assert bodies[0]["stream"] is True
+    assert [chunk.choices[0].delta.content for chunk in chunks] == [None, "Hola", " mundo"]
+    assert chunks[-1].choices[0].finish_reason == "stop"
+    assert chunks[0].model == "gpt-4o-mini"
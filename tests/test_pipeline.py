@@ -330,6 +330,24 @@ def test_translate_path_errors_on_unreadable_file(tmp_path: Path) -> None:
     assert "private.txt" in message
 
 
+def test_single_unreadable_file_fails_before_the_engine_is_built(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "private.txt"
+    source.write_text("secret", encoding="utf-8")
+    built: list[object] = []
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *args, **kwargs: built.append(1))
+
+    def denied(*args: object, **kwargs: object) -> None:
+        raise PermissionError("Permission denied")
+
+    monkeypatch.setattr("abersetz.pipeline.open", denied, raising=False)
+
+    with pytest.raises(PipelineError, match="Cannot read .*private.txt"):
+        translate_path(source, TranslatorOptions())
+    assert built == []
+
+
 def test_translate_path_write_over_updates_source(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -366,6 +384,7 @@ def test_translate_path_dry_run_skips_io(tmp_path: Path, monkeypatch: pytest.Mon
     assert results[0].destination == destination
     assert not destination.exists()
     assert not destination.with_suffix(destination.suffix + ".voc.json").exists()
+    assert not output_dir.exists()
 
 
 def test_translate_path_warns_on_large_file(
@@ -398,3 +417,336 @@ def test_translate_path_warns_on_large_file(
 
     assert results
     assert any("Large file detected" in entry for entry in warnings)
+
+
+def test_translate_path_logs_speculative_acceptance(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from loguru import logger
+
+    from abersetz.providers.speculative import SpeculationStats
+
+    source = tmp_path / "a.txt"
+    source.write_text("data", encoding="utf-8")
+    dummy = DummyEngine()
+    dummy.speculation = SpeculationStats()  # type: ignore[attr-defined]
+    dummy.speculation.record(drafted=10, accepted=7, generated=12)  # type: ignore[attr-defined]
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: dummy)
+
+    messages: list[str] = []
+    token = logger.add(lambda message: messages.append(str(message)), level="INFO")
+    try:
+        translate_path(source, TranslatorOptions(output_dir=tmp_path / "out"))
+    finally:
+        logger.remove(token)
+
+    assert any("7/10 draft tokens accepted (70%)" in line for line in messages)
+
+
+def test_translate_path_background_write_flushes_outputs(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src_dir = tmp_path / "docs"
+    src_dir.mkdir()
+    for name in ("a.txt", "b.txt", "c.txt"):
+        (src_dir / name).write_text(f"text {name}", encoding="utf-8")
+
+    dummy = DummyEngine()
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: dummy)
+
+    options = TranslatorOptions(output_dir=tmp_path / "out", background_write=True, save_voc=True)
+    results = translate_path(src_dir, options)
+
+    assert len(results) == 3
+    for result in results:
+        assert (
+            result.destination.read_text(encoding="utf-8") == f"TEXT {result.source.name}".upper()
+        )
+        assert result.destination.with_suffix(".txt.voc.json").exists()
+
+
+def test_translate_path_reports_unreadable_files_per_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import abersetz.pipeline as pipeline
+
+    src_dir = tmp_path / "docs"
+    src_dir.mkdir()
+    (src_dir / "good.txt").write_text("hello", encoding="utf-8")
+    (src_dir / "locked.txt").write_text("secret", encoding="utf-8")
+
+    real_read_source = pipeline.read_source
+
+    def guarded_read_source(source):
+        if source.path.name == "locked.txt":
+            raise PermissionError(13, "Permission denied")
+        return real_read_source(source)
+
+    dummy = DummyEngine()
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: dummy)
+    monkeypatch.setattr("abersetz.pipeline.read_source", guarded_read_source)
+
+    results = translate_path(src_dir, TranslatorOptions(output_dir=tmp_path / "out"))
+
+    by_name = {result.source.name: result for result in results}
+    assert by_name["good.txt"].error is None
+    assert by_name["good.txt"].destination.read_text(encoding="utf-8") == "HELLO"
+    assert "Cannot read" in (by_name["locked.txt"].error or "")
+    assert not by_name["locked.txt"].destination.exists()
+
+
+class FlakyEngine(DummyEngine):
+    """Dummy engine that fails on any chunk containing ``boom``."""
+
+    def translate(self, request) -> EngineResult:
+        if "boom" in request.text:
+            raise ValueError("engine exploded")
+        return super().translate(request)
+
+
+def _tree_with_bad_file(tmp_path: Path) -> Path:
+    src_dir = tmp_path / "docs"
+    src_dir.mkdir()
+    (src_dir / "a.txt").write_text("alpha", encoding="utf-8")
+    (src_dir / "b.txt").write_text("boom", encoding="utf-8")
+    (src_dir / "c.txt").write_text("gamma", encoding="utf-8")
+    (src_dir / "d.txt").write_text("   ", encoding="utf-8")
+    return src_dir
+
+
+def test_translate_path_isolates_engine_failures_and_writes_report(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+
+    src_dir = _tree_with_bad_file(tmp_path)
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: FlakyEngine())
+    report_path = tmp_path / "run.ndjson"
+
+    results = translate_path(
+        src_dir, TranslatorOptions(output_dir=tmp_path / "out", report=report_path)
+    )
+
+    assert [(r.source.name, r.status) for r in results] == [
+        ("a.txt", "ok"),
+        ("b.txt", "failed"),
+        ("c.txt", "ok"),
+        ("d.txt", "skipped"),
+    ]
+    failed = results[1]
+    assert failed.error_class == "ValueError"
+    assert failed.error == "engine exploded"
+    assert (tmp_path / "out" / "c.txt").read_text(encoding="utf-8") == "GAMMA"
+
+    lines = [json.loads(line) for line in report_path.read_text(encoding="utf-8").splitlines()]
+    assert [line["type"] for line in lines] == ["file"] * 4 + ["summary"]
+    assert lines[0]["chars"] == 5 and lines[0]["chunks"] == 1
+    summary = lines[-1]
+    assert (summary["ok"], summary["skipped"], summary["failed"]) == (2, 1, 1)
+    assert summary["aborted"] is None
+
+
+def test_translate_path_stops_when_max_failures_exceeded(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+
+    from abersetz.pipeline import FailureLimitExceeded
+
+    src_dir = _tree_with_bad_file(tmp_path)
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: FlakyEngine())
+    report_path = tmp_path / "run.json"
+
+    with pytest.raises(FailureLimitExceeded) as excinfo:
+        translate_path(
+            src_dir,
+            TranslatorOptions(output_dir=tmp_path / "out", report=report_path, max_failures=0),
+        )
+
+    assert [r.source.name for r in excinfo.value.results] == ["a.txt", "b.txt"]
+    document = json.loads(report_path.read_text(encoding="utf-8"))
+    assert [entry["status"] for entry in document["files"]] == ["ok", "failed"]
+    assert "FailureLimitExceeded" in document["summary"]["aborted"]
+    assert not (tmp_path / "out" / "c.txt").exists()
+
+
+def test_translate_path_retries_only_reported_failures(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src_dir = _tree_with_bad_file(tmp_path)
+    report_path = tmp_path / "run.json"
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: FlakyEngine())
+    translate_path(src_dir, TranslatorOptions(output_dir=tmp_path / "out", report=report_path))
+
+    healed = DummyEngine()
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: healed)
+    results = translate_path(
+        src_dir,
+        TranslatorOptions(
+            output_dir=tmp_path / "out", report=report_path, retry_failed=report_path
+        ),
+    )
+
+    assert [(r.source.name, r.status) for r in results] == [("b.txt", "ok")]
+    assert healed.chunks == ["boom"]
+    assert (tmp_path / "out" / "b.txt").read_text(encoding="utf-8") == "BOOM"
+
+
+def test_translate_path_counts_cache_hits(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import functools
+
+    import abersetz.pipeline as pipeline
+
+    src_dir = tmp_path / "docs"
+    src_dir.mkdir()
+    (src_dir / "a.txt").write_text("hello world", encoding="utf-8")
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: DummyEngine())
+    # twat_cache may be unavailable here; memoise explicitly so hits are deterministic.
+    monkeypatch.setattr(
+        pipeline, "_cached_translate_call", functools.cache(pipeline._cached_translate_call)
+    )
+    options = TranslatorOptions(output_dir=tmp_path / "out", chunk_size=4)
+
+    first = translate_path(src_dir, options)
+    second = translate_path(src_dir, options)
+
+    assert first[0].cache_hits == 0
+    assert second[0].cache_hits == second[0].chunks > 1
+
+
+def test_fully_cached_rerun_never_loads_local_model(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import functools
+    from types import SimpleNamespace
+
+    import abersetz.pipeline as pipeline
+    from abersetz.config import Defaults, EngineConfig
+
+    src_dir = tmp_path / "docs"
+    src_dir.mkdir()
+    (src_dir / "a.txt").write_text("alpha beta gamma", encoding="utf-8")
+    model_path = tmp_path / "model.gguf"
+    model_path.write_text("stub", encoding="utf-8")
+    loads: list[object] = []
+
+    class FakeLlama:
+        def __init__(self, **kwargs: object) -> None:
+            loads.append(kwargs)
+
+        def tokenize(self, text: bytes, **_: object) -> list[int]:
+            return list(text)
+
+        def create_chat_completion(self, **kwargs: object) -> dict[str, object]:
+            return {"choices": [{"message": {"content": "out"}}]}
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", SimpleNamespace(Llama=FakeLlama))
+    monkeypatch.setattr(
+        pipeline, "_cached_translate_call", functools.cache(pipeline._cached_translate_call)
+    )
+    cfg = AbersetzConfig(
+        defaults=Defaults(engine="gemma/gguf"),
+        engines={
+            "gemma": EngineConfig(
+                name="gemma", options={"backend": "gguf", "model_path": str(model_path)}
+            )
+        },
+    )
+    options = TranslatorOptions(output_dir=tmp_path / "out", chunk_size=6)
+
+    translate_path(src_dir, options, config=cfg)
+    rerun = translate_path(src_dir, options, config=cfg)
+
+    assert len(loads) == 1, "The rerun is served from the cache without loading the model"
+    assert rerun[0].cache_hits == rerun[0].chunks
+
+
+def test_translate_path_resumes_mid_file_from_checkpoint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    src_dir = tmp_path / "docs"
+    src_dir.mkdir()
+    (src_dir / "a.txt").write_text("first", encoding="utf-8")
+    (src_dir / "b.txt").write_text("one two boom four", encoding="utf-8")
+    out_dir = tmp_path / "out"
+    options = dict(output_dir=out_dir, chunk_size=4, checkpoint=True)
+
+    crashing = FlakyEngine()
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: crashing)
+    first = translate_path(src_dir, TranslatorOptions(**options))
+    assert [r.status for r in first] == ["ok", "failed"]
+    assert (out_dir / ".abersetz-journal.ndjson").exists()
+
+    healed = DummyEngine()
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: healed)
+    second = translate_path(src_dir, TranslatorOptions(**options, resume=True))
+
+    assert [(r.source.name, r.status) for r in second] == [("a.txt", "skipped"), ("b.txt", "ok")]
+    # Chunks finished before the crash are replayed from the journal.
+    assert "one " not in healed.chunks
+    assert healed.chunks[0] == "boom"
+    assert (out_dir / "b.txt").read_text(encoding="utf-8") == "ONE TWO BOOM FOUR"
+
+
+def test_translate_path_dispatches_static_voc_chunks_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import threading
+
+    class SlottedEngine(DummyEngine):
+        max_concurrency = 3
+        static_voc = True
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.gate = threading.Barrier(3)
+            self.lock = threading.Lock()
+
+        def translate(self, request) -> EngineResult:
+            self.gate.wait(timeout=5)  # only passes if three chunks are in flight at once
+            with self.lock:
+                self.chunks.append(request.text)
+            return EngineResult(text=request.text.upper(), voc=dict(request.voc))
+
+    source = tmp_path / "doc.txt"
+    source.write_text("abc def ghi", encoding="utf-8")
+    engine = SlottedEngine()
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: engine)
+
+    results = translate_path(
+        source, TranslatorOptions(output_dir=tmp_path / "out", chunk_size=4, save_voc=True)
+    )
+
+    assert results[0].chunks == 3
+    assert sorted(engine.chunks) == ["abc ", "def ", "ghi"]
+    assert (tmp_path / "out" / "doc.txt").read_text(encoding="utf-8") == "ABC DEF GHI"
+
+
+def test_translate_string_streams_misses_and_passes_hits_whole(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import functools
+
+    import abersetz.pipeline as pipeline
+    from abersetz.pipeline import translate_string
+
+    class StreamingEngine(DummyEngine):
+        def translate_stream(self, request):
+            result = self.translate(request)
+            yield from result.text
+            return result
+
+    monkeypatch.setattr("abersetz.pipeline.create_engine", lambda *_, **__: StreamingEngine())
+    monkeypatch.setattr(
+        pipeline, "_cached_translate_call", functools.cache(pipeline._cached_translate_call)
+    )
+    options = TranslatorOptions(to_lang="de", chunk_size=4)
+
+    first: list[str] = []
+    output = translate_string("abc def", options, config=AbersetzConfig(), on_text=first.append)
+    second: list[str] = []
+    translate_string("abc def", options, config=AbersetzConfig(), on_text=second.append)
+
+    assert output == "ABC DEF"
+    assert first == list("ABC DEF"), "Cache misses arrive as the engine's deltas"
+    assert second == ["ABC ", "DEF"], "Cached chunks arrive whole"
@@ -0,0 +1,147 @@
+# this_file: tests/test_pricing.py
+"""Tests for usage accounting, the price table and the spend budget."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from abersetz import metrics
+from abersetz.config import AbersetzConfig, Price, load_config
+from abersetz.pipeline import BudgetExceeded, TranslatorOptions, translate_path, translate_string
+from abersetz.pricing import Ledger, estimate, find_price
+from abersetz.providers.base import Usage
+
+
+@pytest.fixture(autouse=True)
+def _clean_registry() -> None:
+    metrics.REGISTRY.clear()
+
+
+def _priced_config(key: str = "mock") -> AbersetzConfig:
+    config = load_config()
+    config.pricing[key] = Price(input=1_000_000.0, output=2_000_000.0)  # $1 / $2 per token
+    return config
+
+
+def _write_docs(root: Path, count: int) -> None:
+    root.mkdir()
+    for index in range(count):
+        (root / f"doc{index}.txt").write_text(f"Document {index} says hello.", encoding="utf-8")
+
+
+def test_usage_reads_openai_mappings_and_objects() -> None:
+    assert Usage.from_openai({"prompt_tokens": 7, "completion_tokens": 2}) == Usage(7, 2)
+    assert Usage.from_openai(SimpleNamespace(prompt_tokens=3, completion_tokens=None)) == Usage(3)
+    assert Usage.from_openai(None) is None
+
+    total = Usage()
+    total.add(Usage(1, 2, 3))
+    total.add(None)
+    total.add(Usage(billed_chars=10))
+    assert total == Usage(1, 2, 13)
+
+
+def test_price_cost_and_config_round_trip() -> None:
+    price = Price(input=0.15, output=0.6)
+    assert price.cost(1_000_000, 500_000, 0) == pytest.approx(0.45)
+    assert Price(chars=20.0).cost(0, 0, 50_000) == pytest.approx(1.0)
+
+    config = AbersetzConfig.from_dict({"pricing": {"gpt-4o-mini": {"input": 0.15, "output": 0.6}}})
+    assert config.pricing["gpt-4o-mini"] == price
+    assert config.to_dict()["pricing"] == {"gpt-4o-mini": {"input": 0.15, "output": 0.6}}
+    assert "pricing" not in AbersetzConfig().to_dict()
+    with pytest.raises(ValueError, match="Unknown price field"):
+        Price.from_dict({"per_token": 1})
+
+
+def test_find_price_uses_first_listed_key() -> None:
+    table = {"deepl": Price(chars=25.0), "dt": Price(chars=1.0)}
+
+    assert find_price(table, None, "deepl", "dt/deepl", "dt") == Price(chars=25.0)
+    assert find_price(table, "unknown", None, "dt/google", "dt") == Price(chars=1.0)
+    assert find_price(table, "gpt-4o") is None
+
+
+def test_ledger_refuses_calls_that_would_exceed_budget() -> None:
+    price = Price(input=1_000_000.0, output=1_000_000.0)  # $1 per token either way
+    ledger = Ledger(price, budget=10.0)
+
+    reserved = ledger.reserve(8)  # 2 + 2 tokens
+    assert reserved == pytest.approx(estimate(price, 8)) == pytest.approx(4.0)
+    assert ledger.reserve(16) is None, "4 reserved + 8 estimated > 10"
+    assert ledger.settle(reserved, Usage(2, 1)) == pytest.approx(3.0)
+    assert ledger.spent == pytest.approx(3.0)
+    unreported = ledger.reserve(8)
+    assert unreported is not None
+    assert ledger.settle(unreported, None) == pytest.approx(4.0), "No usage books the estimate"
+    assert ledger.spent == pytest.approx(7.0)
+
+    unpriced = Ledger(None, budget=0.0)
+    assert unpriced.reserve(1000) == 0.0
+    assert unpriced.settle(0.0, Usage(5, 5)) is None
+
+
+def test_translate_path_records_tokens_cost_and_report(tmp_path: Path) -> None:
+    root = tmp_path / "docs"
+    _write_docs(root, 2)
+    report = tmp_path / "run.json"
+
+    results = translate_path(
+        root,
+        TranslatorOptions(engine="mk::", to_lang="de", output_dir=tmp_path / "out", report=report),
+        config=_priced_config(),
+    )
+
+    text = "Document 0 says hello."
+    tokens = -(-len(text) // 4)
+    first = next(result for result in results if result.source.name == "doc0.txt")
+    assert (first.prompt_tokens, first.completion_tokens) == (tokens, tokens)
+    assert first.cost == pytest.approx(3 * tokens)
+    summary = json.loads(report.read_text(encoding="utf-8"))["summary"]
+    assert summary["prompt_tokens"] == sum(result.prompt_tokens for result in results)
+    assert summary["cost"] == pytest.approx(sum(result.cost or 0 for result in results))
+    labels = {"engine": "mock", "provider": "mock"}
+    assert metrics.TOKENS_IN.value(**labels) == summary["prompt_tokens"]
+    assert metrics.COST_DOLLARS.value(**labels) == pytest.approx(summary["cost"])
+
+
+def test_unpriced_engine_reports_tokens_without_cost(tmp_path: Path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text("Hello there.", encoding="utf-8")
+
+    (result,) = translate_path(
+        source,
+        TranslatorOptions(engine="mk::", to_lang="de", output_dir=tmp_path / "out"),
+    )
+
+    assert result.prompt_tokens == 3
+    assert result.cost is None
+
+
+def test_budget_stops_directory_run_before_overspending(tmp_path: Path) -> None:
+    root = tmp_path / "docs"
+    _write_docs(root, 5)
+    # Each file is 6 + 6 estimated tokens, i.e. $18 at $1/$2 per token.
+    options = TranslatorOptions(
+        engine="mk::", to_lang="de", output_dir=tmp_path / "out", budget=40.0
+    )
+
+    with pytest.raises(BudgetExceeded, match=r"\$40 budget") as caught:
+        translate_path(root, options, config=_priced_config())
+
+    results = caught.value.results
+    assert [result.status for result in results] == ["ok", "ok", "failed"]
+    assert results[-1].error_class == "BudgetExceeded"
+    assert sum(result.cost or 0 for result in results) <= 40.0
+
+
+def test_budget_applies_to_translate_string() -> None:
+    options = TranslatorOptions(engine="mk::", to_lang="de", budget=1.0)
+
+    with pytest.raises(BudgetExceeded):
+        translate_string("Far too expensive.", options, config=_priced_config())
+    assert translate_string("Cheap.", TranslatorOptions(engine="mk::", to_lang="de")) == "Cheap."
@@ -0,0 +1,101 @@
+# this_file: tests/test_profiling.py
+"""Tests for the cpu/sample/alloc profilers behind ``--profile``."""
+
+from __future__ import annotations
+
+import pstats
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from abersetz import tracing
+from abersetz.cli import AbersetzCLI
+from abersetz.profiling import (
+    CpuProfiler,
+    StackSampler,
+    format_cpu,
+    format_samples,
+    parse_modes,
+    profiled,
+)
+
+
+def _busy_worker(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def test_parse_modes_accepts_flags_strings_and_tuples() -> None:
+    assert parse_modes(True) == {"stages"}
+    assert parse_modes(False) == frozenset()
+    assert parse_modes("cpu") == {"cpu"}
+    assert parse_modes("CPU, alloc") == {"cpu", "alloc"}
+    assert parse_modes(("sample", "stages")) == {"sample", "stages"}
+    with pytest.raises(ValueError, match="Unknown --profile mode"):
+        parse_modes("gpu")
+
+
+def test_cpu_profiler_covers_worker_threads() -> None:
+    profiler = CpuProfiler()
+    profiler.start()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(_busy_worker, [20_000] * 4))
+    stats = profiler.stop()
+
+    functions = {name for _, _, name in stats.stats}  # type: ignore[attr-defined]
+    assert "_busy_worker" in functions
+    assert "_busy_worker" in format_cpu(stats, top=50)
+
+
+def test_stack_sampler_collapses_other_threads() -> None:
+    release = threading.Event()
+    worker = threading.Thread(target=release.wait, name="waiter")
+    worker.start()
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    time.sleep(0.05)
+    stacks = sampler.stop()
+    release.set()
+    worker.join()
+
+    assert sampler.samples > 0
+    assert any(stack.startswith("waiter;") for stack in stacks)
+    line = sampler.collapsed().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+    assert "self %" in format_samples(stacks)
+
+
+def test_profiled_writes_files_and_summaries(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    prefix = tmp_path / "out" / "run"
+
+    with profiled({"cpu", "sample", "alloc"}, prefix, top=5):
+        blocks = [bytearray(1024) for _ in range(200)]
+        _busy_worker(50_000)
+    del blocks
+
+    err = capsys.readouterr().err
+    assert "allocation peak:" in err
+    assert "CPU profile" in err and "Stack samples" in err
+    stats = pstats.Stats(str(prefix.with_name("run.pstats")))
+    assert stats.total_calls > 0  # type: ignore[attr-defined]
+    assert prefix.with_name("run.collapsed").exists()
+    assert tracemalloc.Snapshot.load(str(prefix.with_name("run.tracemalloc"))).traces
+    assert not tracemalloc.is_tracing()
+
+
+def test_cli_profile_cpu_mode(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    prefix = tmp_path / "profile"
+
+    AbersetzCLI().tr("de", "Hello", engine="mk::", profile="cpu,stages", profile_out=str(prefix))
+
+    captured = capsys.readouterr()
+    assert captured.out == "Hello\n"
+    assert "engine_call" in captured.err, "stages still print the stage table"
+    assert "CPU profile" in captured.err
+    assert (tmp_path / "profile.pstats").exists()
+    assert not tracing.enabled()
@@ -0,0 +1,55 @@
+"""Tests for run reports."""
+# this_file: tests/test_report.py
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from abersetz.chunking import TextFormat
+from abersetz.pipeline import TranslationResult
+from abersetz.report import RunReport, failed_sources
+
+
+def _result(name: str, status: str, **extra: object) -> TranslationResult:
+    return TranslationResult(
+        source=Path("/src") / name,
+        destination=Path("/out") / name,
+        chunks=2,
+        voc={},
+        format=TextFormat.PLAIN,
+        status=status,
+        **extra,  # type: ignore[arg-type]
+    )
+
+
+def test_run_report_json_summary_sums_metrics(tmp_path: Path) -> None:
+    path = tmp_path / "reports" / "run.json"
+    with RunReport(path) as report:
+        report.add(_result("a.txt", "ok", chars=10, retries=1, cache_hits=2, seconds=0.5))
+        report.add(_result("b.txt", "failed", error="x", error_class="ValueError", seconds=0.25))
+
+    document = json.loads(path.read_text(encoding="utf-8"))
+    summary = document["summary"]
+    assert (summary["files"], summary["ok"], summary["failed"]) == (2, 1, 1)
+    assert (summary["chars"], summary["retries"], summary["cache_hits"]) == (10, 1, 2)
+    assert summary["chunks"] == 4
+    assert summary["seconds"] == 0.75
+    assert document["files"][1]["error_class"] == "ValueError"
+
+
+def test_failed_sources_reads_json_and_torn_ndjson(tmp_path: Path) -> None:
+    json_path = tmp_path / "run.json"
+    with RunReport(json_path) as report:
+        report.add(_result("a.txt", "ok"))
+        report.add(_result("b.txt", "failed"))
+    assert failed_sources(json_path) == {Path("/src/b.txt")}
+
+    ndjson_path = tmp_path / "run.ndjson"
+    report = RunReport(ndjson_path)
+    report.add(_result("c.txt", "failed"))
+    report.add(_result("d.txt", "skipped"))
+    report._handle.write('{"type": "file", "sour')  # type: ignore[union-attr] - killed mid-write
+    report._handle.flush()  # type: ignore[union-attr]
+    assert failed_sources(ndjson_path) == {Path("/src/c.txt")}
+    report.close()
@@ -0,0 +1,83 @@
+"""Tests for the local-inference slot pool."""
+# this_file: tests/test_scheduler.py
+
+from __future__ import annotations
+
+import contextlib
+import threading
+
+import pytest
+
+from abersetz.providers.scheduler import SlotPool, threads_per_slot
+
+
+def test_slot_pool_grows_only_when_callers_overlap() -> None:
+    built: list[int] = []
+
+    def factory() -> int:
+        built.append(len(built))
+        return built[-1]
+
+    pool = SlotPool(factory, size=3)
+    assert pool.created == 1
+
+    for _ in range(5):
+        with pool.acquire() as slot:
+            assert slot == 0
+    assert pool.created == 1
+
+    with pool.acquire() as first, pool.acquire() as second:
+        assert {first, second} == {0, 1}
+    assert pool.created == 2
+
+
+def test_slot_pool_blocks_when_all_slots_busy() -> None:
+    pool = SlotPool(object, size=2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    gate = threading.Barrier(2)
+
+    def worker() -> None:
+        nonlocal active, peak
+        with pool.acquire():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            with contextlib.suppress(threading.BrokenBarrierError):
+                gate.wait(timeout=0.2)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+    assert pool.created == 2
+
+
+def test_slot_pool_forgets_failed_builds() -> None:
+    calls = {"n": 0}
+
+    def factory() -> object:
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("out of memory")
+        return object()
+
+    pool = SlotPool(factory, size=2)
+    with pool.acquire():
+        with pytest.raises(RuntimeError), pool.acquire():
+            pass
+        assert pool.created == 1
+
+
+@pytest.mark.parametrize(
+    ("n_threads", "slots", "expected"),
+    [(None, 1, None), (8, 1, 8), (8, 2, 4), (3, 4, 1)],
+)
+def test_threads_per_slot_splits_budget(n_threads: int | None, slots: int, expected: int) -> None:
+    assert threads_per_slot(n_threads, slots) == expected
@@ -0,0 +1,48 @@
+# this_file: tests/test_speculative.py
+"""Tests for speculative-decoding helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from abersetz.providers.speculative import CountingDraft, GgufDraftModel, SpeculationStats
+
+
+def test_speculation_stats_accumulate_and_summarise() -> None:
+    stats = SpeculationStats()
+    assert stats.acceptance_rate == 0.0
+
+    stats.record(drafted=8, accepted=6, generated=10)
+    stats.record(drafted=4, accepted=0, generated=5)
+
+    assert (stats.drafted, stats.accepted, stats.generated) == (12, 6, 15)
+    assert stats.acceptance_rate == 0.5
+    assert stats.summary() == "6/12 draft tokens accepted (50%), 15 tokens generated"
+
+
+def test_counting_draft_estimates_accepted_tokens_and_resets() -> None:
+    counter = CountingDraft(lambda input_ids: [7, 8, 9, 10])
+    for _ in range(3):
+        counter([1, 2])
+
+    assert counter.take(generated=10) == (12, 6, 10)
+    assert counter.take(generated=1) == (0, 0, 1)
+
+
+def test_gguf_draft_model_drafts_greedily_until_eos() -> None:
+    np = pytest.importorskip("numpy")
+    seen: list[tuple[list[int], float]] = []
+
+    class FakeLlm:
+        def token_eos(self) -> int:
+            return 0
+
+        def generate(self, tokens: list[int], *, temp: float):
+            seen.append((tokens, temp))
+            yield from [5, 6, 0, 7]
+
+    draft = GgufDraftModel(FakeLlm(), num_pred_tokens=4)
+    tokens = draft(np.array([1, 2, 3], dtype=np.intc))
+
+    assert tokens.tolist() == [5, 6]
+    assert seen == [([1, 2, 3], 0.0)]
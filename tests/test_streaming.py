@@ -0,0 +1,39 @@
+"""Tests for incremental filtering of streamed engine output."""
+# this_file: tests/test_streaming.py
+
+from __future__ import annotations
+
+from abersetz.providers.streaming import DeltaFilter, filter_deltas
+
+
+def _visible(deltas: list[str], delta_filter: DeltaFilter) -> list[str]:
+    return list(filter_deltas(deltas, delta_filter))
+
+
+def test_delta_filter_extracts_tagged_body_across_split_tags() -> None:
+    deltas = ["noise <out", "put>\n Hel", "lo wor", "ld </out", "put><voc>{}</voc>"]
+    delta_filter = DeltaFilter(start="<output>", stops=("</output>",), strip=True)
+
+    pieces = _visible(deltas, delta_filter)
+
+    assert "".join(pieces) == "Hello world"
+    assert pieces[0] == "Hel", "Text is released before the reply is complete"
+    assert delta_filter.raw == "".join(deltas)
+
+
+def test_delta_filter_falls_back_to_whole_reply_without_start_tag() -> None:
+    pieces = _visible(["  plain ", "reply  "], DeltaFilter(start="<output>", strip=True))
+
+    assert pieces == ["plain reply"]
+
+
+def test_delta_filter_releases_false_stop_prefix_and_inner_spaces() -> None:
+    delta_filter = DeltaFilter(stops=("<end_of_turn>",), strip=True)
+
+    pieces = _visible(["a <en", "d> b ", "<end_of", "_turn> tail"], delta_filter)
+
+    assert "".join(pieces) == "a <end> b"
+
+
+def test_delta_filter_without_rules_passes_text_through() -> None:
+    assert _visible([" a", "", "b "], DeltaFilter()) == [" a", "b "]
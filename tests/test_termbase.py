@@ -0,0 +1,190 @@
+# this_file: tests/test_termbase.py
+"""Tests for the terminology base shared across runs."""
+
+from __future__ import annotations
+
+import functools
+import json
+from pathlib import Path
+
+import pytest
+
+from abersetz import pipeline
+from abersetz.config import AbersetzConfig
+from abersetz.glossary import relevant_terms
+from abersetz.pipeline import TranslatorOptions, translate_path, translate_string
+from abersetz.providers.base import EngineRequest, EngineResult
+from abersetz.termbase import TermBase, termbase_path
+
+
+def _lines(path: Path) -> list[dict[str, object]]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_majority_wins_and_incumbent_keeps_ties(tmp_path: Path) -> None:
+    base = TermBase(tmp_path, "en", "de")
+    base.observe({"cat": "Katze"})
+    base.observe({"cat": "Kater"})
+    assert base.vocabulary() == {"cat": "Katze"}, "A tie keeps the first translation"
+
+    base.observe({"cat": "Kater", "dog": "Hund"})
+    assert base.vocabulary() == {"cat": "Kater", "dog": "Hund"}
+    assert base.conflicts() == {"cat": {"Katze": 1, "Kater": 2}}
+
+
+def test_save_appends_votes_and_reloads(tmp_path: Path) -> None:
+    base = TermBase(tmp_path, "en", "de")
+    base.observe({"cat": "Katze", "dog": "Hund"})
+    base.save()
+    base.observe({"dog": "Köter"})
+    base.save()
+
+    path = termbase_path(tmp_path, "en", "de")
+    assert path.name == "en-de.terms.jsonl"
+    assert _lines(path)[-1] == {"term": "dog", "votes": {"Köter": 1}}
+    reloaded = TermBase(tmp_path, "en", "de")
+    assert reloaded.vocabulary() == {"cat": "Katze", "dog": "Hund"}
+    assert reloaded.conflicts() == {"dog": {"Hund": 1, "Köter": 1}}
+    assert len(TermBase(tmp_path, "en", "fr")) == 0, "Other language pairs are separate"
+
+
+def test_save_compacts_a_long_log(tmp_path: Path) -> None:
+    base = TermBase(tmp_path, "auto", "de")
+    base.observe({"cat": "Katze"})
+    base.save()
+    path = termbase_path(tmp_path, "auto", "de")
+    line_counts = []
+    for _ in range(2):
+        base.observe({"cat": "Kater"})
+        base.save()
+        line_counts.append(len(_lines(path)))
+
+    assert line_counts == [3, 2], "Appended once, then rewritten as one line per term"
+    assert _lines(path)[1] == {"term": "cat", "use": "Kater", "votes": {"Katze": 1, "Kater": 2}}
+    assert TermBase(tmp_path, "auto", "de").vocabulary() == {"cat": "Kater"}
+
+
+def test_unknown_format_is_left_alone(tmp_path: Path) -> None:
+    path = termbase_path(tmp_path, "en", "de")
+    path.write_text('{"kind": "termbase", "version": 99}\n', encoding="utf-8")
+
+    base = TermBase(tmp_path, "en", "de")
+    base.observe({"cat": "Katze"})
+    base.save()
+
+    assert path.read_text(encoding="utf-8") == '{"kind": "termbase", "version": 99}\n'
+
+
+class _LearningEngine:
+    """Learns the first word of each chunk and records the vocabulary it was given."""
+
+    name = "learning"
+    chunk_size = 100
+    html_chunk_size = None
+
+    def __init__(self) -> None:
+        self.seen: list[dict[str, str]] = []
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        self.seen.append(dict(request.voc))
+        term = request.text.split()[0]
+        return EngineResult(text=request.text, voc={**request.voc, term: term.upper()})
+
+
+def test_runs_share_terms_for_the_same_language_pair(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = _LearningEngine()
+    monkeypatch.setattr(pipeline, "create_engine", lambda *args, **kwargs: engine)
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.txt").write_text("alpha text", encoding="utf-8")
+    (docs / "b.txt").write_text("beta text", encoding="utf-8")
+    terms = tmp_path / "terms"
+    config = AbersetzConfig.from_dict({"defaults": {"termbase": str(terms)}})
+
+    def options() -> TranslatorOptions:
+        return TranslatorOptions(
+            engine="learning", from_lang="en", to_lang="de", output_dir=tmp_path / "out"
+        )
+
+    translate_path(docs, options(), config=config)
+    assert engine.seen == [{}, {}], "A run is seeded once, before its first file"
+    assert TermBase(terms, "en", "de").vocabulary() == {"alpha": "ALPHA", "beta": "BETA"}
+
+    engine.seen.clear()
+    explicit = options()
+    explicit.initial_voc = {"alpha": "Alpha"}
+    translate_path(docs / "a.txt", explicit, config=config)
+    assert engine.seen == [{"alpha": "Alpha", "beta": "BETA"}], "Explicit entries win"
+
+    assert translate_string("gamma", TranslatorOptions(to_lang="fr"), config=config) == "gamma"
+    assert engine.seen[-1] == {}, "Another language pair starts empty"
+    assert config.to_dict()["defaults"]["termbase"] == str(terms)
+
+
+class _PromptEngine(_LearningEngine):
+    """Sends only the vocabulary terms that occur in a chunk, like the LLM engines."""
+
+    name = "prompt-terms"
+
+    def prompt_voc(self, text: str, voc: dict[str, str]) -> dict[str, str]:
+        return relevant_terms(text, voc)
+
+
+def test_new_terms_elsewhere_keep_the_chunk_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = _PromptEngine()
+    monkeypatch.setattr(pipeline, "create_engine", lambda *args, **kwargs: engine)
+    # twat_cache may be unavailable here; memoise explicitly so hits are deterministic.
+    monkeypatch.setattr(
+        pipeline, "_cached_translate_call", functools.cache(pipeline._cached_translate_call)
+    )
+    source = tmp_path / "a.txt"
+    source.write_text("alpha keeps its cache", encoding="utf-8")
+    terms = tmp_path / "terms"
+    config = AbersetzConfig.from_dict({"defaults": {"termbase": str(terms)}})
+    base = TermBase(terms, "en", "de")
+    base.observe({"alpha": "ALPHA"})
+    base.save()
+    opts = TranslatorOptions(
+        engine="prompt-terms", from_lang="en", to_lang="de", output_dir=tmp_path / "out"
+    )
+
+    (first,) = translate_path(source, opts, config=config)
+    base = TermBase(terms, "en", "de")
+    base.observe({"omega": "OMEGA"})
+    base.save()
+    (second,) = translate_path(source, opts, config=config)
+
+    assert len(engine.seen) == 1, "A term the chunk never mentions does not change its key"
+    assert (first.cache_hits, second.cache_hits) == (0, 1)
+    assert second.voc == {"alpha": "ALPHA", "omega": "OMEGA"}
+
+
+def test_vocabulary_sidecar_holds_only_the_files_own_terms(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(pipeline, "create_engine", lambda *args, **kwargs: _LearningEngine())
+    source = tmp_path / "a.txt"
+    source.write_text("beta sidecar text", encoding="utf-8")
+    terms = tmp_path / "terms"
+    base = TermBase(terms, "en", "de")
+    base.observe({"alpha": "ALPHA", "omega": "OMEGA"})
+    base.save()
+    opts = TranslatorOptions(
+        engine="learning",
+        from_lang="en",
+        to_lang="de",
+        output_dir=tmp_path / "out",
+        save_voc=True,
+        initial_voc={"omega": "Omega"},
+    )
+
+    config = AbersetzConfig.from_dict({"defaults": {"termbase": str(terms)}})
+    (result,) = translate_path(source, opts, config=config)
+
+    assert result.voc == {"alpha": "ALPHA", "omega": "Omega", "beta": "BETA"}
+    sidecar = result.destination.with_suffix(".txt.voc.json")
+    assert json.loads(sidecar.read_text(encoding="utf-8")) == {"omega": "Omega", "beta": "BETA"}
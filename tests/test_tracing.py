@@ -0,0 +1,206 @@
+# this_file: tests/test_tracing.py
+"""Tests for pipeline tracing spans and hooks."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from abersetz import tracing
+from abersetz.cli import AbersetzCLI
+from abersetz.pipeline import TranslatorOptions, translate_path, translate_string
+from abersetz.tracing import NdjsonExporter, Span, StageProfile, TraceHook
+
+
+class Recorder(TraceHook):
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.spans: list[Span] = []
+
+    def on_start(self, span: Span) -> None:
+        self.started.append(span.name)
+
+    def on_end(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def named(self, name: str) -> list[Span]:
+        return [span for span in self.spans if span.name == name]
+
+
+def _by_id(spans: list[Span]) -> dict[str, Span]:
+    return {span.span_id: span for span in spans}
+
+
+def test_span_is_a_noop_without_hooks() -> None:
+    first = tracing.span("run")
+    with first as opened:
+        opened.set(anything=1)
+        tracing.add_event("retry")
+        assert tracing.current_span() is None
+    assert first is tracing.span("file")
+    assert not tracing.enabled()
+
+
+def test_spans_nest_and_record_errors() -> None:
+    recorder = Recorder()
+    with tracing.hooks(recorder), tracing.span("run") as run:
+        with pytest.raises(ValueError), tracing.span("file", path="x"):
+            tracing.add_event("retry", attempt=1)
+            raise ValueError("boom")
+        assert tracing.current_span() is run
+    assert not tracing.enabled()
+
+    file_span, run_span = recorder.spans
+    assert recorder.started == ["run", "file"]
+    assert file_span.parent_id == run_span.span_id
+    assert file_span.trace_id == run_span.trace_id
+    assert run_span.parent_id is None
+    assert (file_span.status, file_span.error) == ("error", "ValueError: boom")
+    assert file_span.attributes == {"path": "x"}
+    assert [event.name for event in file_span.events] == ["retry"]
+    assert 0 <= file_span.duration_ms <= run_span.duration_ms
+
+
+def test_broken_hook_does_not_fail_the_stage() -> None:
+    class Broken(TraceHook):
+        def on_end(self, span: Span) -> None:
+            raise RuntimeError("exporter down")
+
+    recorder = Recorder()
+    with tracing.hooks(Broken(), recorder), tracing.span("write"):
+        pass
+    assert [span.name for span in recorder.spans] == ["write"]
+
+
+@pytest.mark.parametrize("slots", [1, 4])
+def test_translate_path_traces_every_stage(tmp_path: Path, slots: int) -> None:
+    (tmp_path / "a.txt").write_text("Hello there.\n\n" * 40, encoding="utf-8")
+    (tmp_path / "b.html").write_text(
+        "<html><body><p>Hi</p><p>There</p></body></html>", encoding="utf-8"
+    )
+    recorder = Recorder()
+    opts = TranslatorOptions(
+        engine=f"mk::fail=0.4,retries=30,slots={slots}",
+        to_lang="de",
+        chunk_size=60,
+        output_dir=tmp_path / "out",
+    )
+
+    with tracing.hooks(recorder):
+        results = translate_path(tmp_path, opts)
+
+    names = {span.name for span in recorder.spans}
+    assert set(tracing.STAGES) <= names
+    spans = _by_id(recorder.spans)
+    (run,) = recorder.named("run")
+    assert run.attributes["files"] == 2
+    assert {span.trace_id for span in recorder.spans} == {run.trace_id}
+    for call in recorder.named("engine_call"):
+        lookup = spans[call.parent_id]
+        assert lookup.name == "cache_lookup"
+        assert spans[lookup.parent_id].name == "file"
+        assert call.attributes["engine"] == "mock"
+    retries = sum(
+        event.name == "retry" for call in recorder.named("engine_call") for event in call.events
+    )
+    assert retries == sum(result.retries for result in results) > 0
+    assert all(span.attributes["hit"] is False for span in recorder.named("cache_lookup"))
+
+
+def test_translate_string_traces_detect_chunk_and_calls() -> None:
+    recorder = Recorder()
+    with tracing.hooks(recorder):
+        translate_string("Hello.\n\n" * 20, TranslatorOptions(engine="mk::", to_lang="de"))
+
+    assert [span.name for span in recorder.spans][-1] == "run"
+    assert recorder.named("run")[0].attributes["mode"] == "string"
+    assert recorder.named("detect")[0].attributes["format"] == "plain"
+    assert len(recorder.named("engine_call")) == recorder.named("chunk")[0].attributes["chunks"]
+
+
+def test_ndjson_exporter_and_stage_profile(tmp_path: Path) -> None:
+    trace_file = tmp_path / "traces" / "run.ndjson"
+    profile = StageProfile()
+    with tracing.hooks(NdjsonExporter(trace_file), profile), tracing.span("run"):
+        for _ in range(3):
+            with tracing.span("engine_call") as call:
+                call.add_event("retry", attempt=1, wait=0.25)
+
+    lines = [json.loads(line) for line in trace_file.read_text(encoding="utf-8").splitlines()]
+    assert [line["name"] for line in lines] == ["engine_call"] * 3 + ["run"]
+    assert lines[0]["events"][0]["attributes"] == {"attempt": 1, "wait": 0.25}
+    assert lines[0]["parent_id"] == lines[-1]["span_id"]
+
+    assert profile.stages["engine_call"].calls == 3
+    report = profile.format().splitlines()
+    assert report[1].startswith("run ")
+    assert report[2].startswith("engine_call ")
+    assert "engine retries: 3 (750 ms waiting)" in report
+
+
+def test_opentelemetry_exporter_recreates_span_tree() -> None:
+    otel = pytest.importorskip("opentelemetry.trace")
+
+    class FakeSpan(otel.NonRecordingSpan):
+        def __init__(self, name: str, context: object) -> None:
+            super().__init__(otel.INVALID_SPAN_CONTEXT)
+            self.name = name
+            self.parent = None if context is None else otel.get_current_span(context)
+            self.attributes: dict[str, object] = {}
+            self.events: list[str] = []
+            self.status = None
+            self.end_time: int | None = None
+
+        def set_attribute(self, key: str, value: object) -> None:
+            self.attributes[key] = value
+
+        def add_event(self, name: str, attributes: dict, timestamp: int) -> None:
+            self.events.append(name)
+
+        def set_status(self, status: object) -> None:
+            self.status = status
+
+        def end(self, end_time: int) -> None:
+            self.end_time = end_time
+
+    class FakeTracer:
+        def __init__(self) -> None:
+            self.spans: list[FakeSpan] = []
+
+        def start_span(self, name, context=None, start_time=None, attributes=None):
+            span = FakeSpan(name, context)
+            span.attributes.update(attributes or {})
+            self.spans.append(span)
+            return span
+
+    tracer = FakeTracer()
+    with (
+        tracing.hooks(tracing.OpenTelemetryExporter(tracer)),
+        tracing.span("run", path=Path("/x")),
+        pytest.raises(RuntimeError),
+        tracing.span("engine_call"),
+    ):
+        tracing.add_event("retry", attempt=1)
+        raise RuntimeError("429")
+
+    run, call = tracer.spans
+    assert (run.name, call.name) == ("abersetz.run", "abersetz.engine_call")
+    assert call.parent is run
+    assert run.attributes == {"path": "/x"}
+    assert call.events == ["retry"]
+    assert call.status.status_code is otel.StatusCode.ERROR
+    assert run.end_time is not None and call.end_time is not None
+
+
+def test_cli_profile_and_trace_flags(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    trace_file = tmp_path / "trace.ndjson"
+
+    AbersetzCLI().tr("de", "Hello", engine="mk::", profile=True, trace=str(trace_file))
+
+    captured = capsys.readouterr()
+    assert captured.out == "Hello\n"
+    assert "engine_call" in captured.err
+    assert trace_file.read_text(encoding="utf-8").count("\n") >= 4
+    assert not tracing.enabled()
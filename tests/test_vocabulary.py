@@ -0,0 +1,105 @@
+# this_file: tests/test_vocabulary.py
+"""Tests for the immutable, incrementally hashed vocabulary."""
+
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from abersetz import pipeline
+from abersetz.pipeline import TranslatorOptions, translate_path
+from abersetz.providers.base import EngineRequest, EngineResult
+from abersetz.vocabulary import EMPTY, Vocabulary
+
+
+def test_digest_ignores_order_and_tracks_merges() -> None:
+    forward = Vocabulary({"cat": "Katze", "dog": "Hund"})
+    backward = Vocabulary([("dog", "Hund"), ("cat", "Katze")])
+
+    assert forward.digest == backward.digest
+    assert hash(forward) == hash(backward)
+    assert (
+        forward.merge({"bird": "Vogel"}).digest
+        == Vocabulary({"cat": "Katze", "dog": "Hund", "bird": "Vogel"}).digest
+    )
+    replaced = forward.merge({"dog": "Köter"})
+    assert replaced.digest == Vocabulary({"cat": "Katze", "dog": "Köter"}).digest
+    assert replaced.digest != forward.digest
+    assert Vocabulary({"ab": "c"}).digest != Vocabulary({"a": "bc"}).digest
+    assert EMPTY.digest == Vocabulary().digest
+
+
+def test_merge_returns_self_when_nothing_changes() -> None:
+    voc = Vocabulary({"cat": "Katze"})
+
+    assert voc.merge({}) is voc
+    assert voc.merge({"cat": "Katze"}) is voc
+    assert voc.changes(voc) == {}
+    assert voc.changes({"cat": "Katze", "dog": "Hund"}) == {"dog": "Hund"}
+
+
+def test_json_is_sorted_and_computed_once() -> None:
+    voc = Vocabulary({"z": "1", "ä": "2"})
+
+    text = voc.to_json()
+    assert text == '{"z": "1", "ä": "2"}'
+    assert voc.to_json() is text
+    assert Vocabulary.from_json(text) == voc
+    assert Vocabulary.from_json("not json") is EMPTY
+
+
+def test_vocabulary_is_a_read_only_mapping_that_pickles() -> None:
+    voc = Vocabulary({"cat": "Katze"})
+
+    assert voc == {"cat": "Katze"} and dict(voc) == {"cat": "Katze"}
+    assert "cat" in voc and len(voc) == 1
+    with pytest.raises(TypeError):
+        voc["dog"] = "Hund"  # type: ignore[index]
+    clone = pickle.loads(pickle.dumps(voc))
+    assert clone == voc and clone.digest == voc.digest
+
+
+class _GlossaryEngine:
+    """Adds one term per chunk and records the vocabulary each request carried."""
+
+    name = "glossary"
+    chunk_size = 12
+    html_chunk_size = None
+
+    def __init__(self) -> None:
+        self.seen: list[object] = []
+
+    def translate(self, request: EngineRequest) -> EngineResult:
+        self.seen.append(request.voc)
+        term = request.text.split()[0]
+        return EngineResult(text=request.text.upper(), voc={**request.voc, term: term.upper()})
+
+
+def test_pipeline_threads_vocabulary_between_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = _GlossaryEngine()
+    monkeypatch.setattr(pipeline, "create_engine", lambda *args, **kwargs: engine)
+    source = tmp_path / "doc.txt"
+    source.write_text("alpha one.\n\nbeta two.\n\ngamma three.", encoding="utf-8")
+
+    (result,) = translate_path(
+        source,
+        TranslatorOptions(
+            engine="glossary",
+            to_lang="de",
+            output_dir=tmp_path / "out",
+            chunk_size=12,
+            initial_voc={"seed": "Saat"},
+            save_voc=True,
+        ),
+    )
+
+    assert all(isinstance(voc, Vocabulary) for voc in engine.seen)
+    assert [len(voc) for voc in engine.seen] == [1, 2, 3]  # type: ignore[arg-type]
+    assert result.voc == {"seed": "Saat", "alpha": "ALPHA", "beta": "BETA", "gamma": "GAMMA"}
+    saved = json.loads(result.destination.with_suffix(".txt.voc.json").read_text("utf-8"))
+    assert saved == result.voc
@@ -0,0 +1,125 @@
+"""Tests for single-pass source discovery."""
+# this_file: tests/test_walker.py
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from abersetz import walker
+from abersetz.walker import GlobMatcher, iter_files, parse_gitignore
+
+
+def _paths(root: Path, *args: object, **kwargs: object) -> list[Path]:
+    return [item.path for item in iter_files(root, *args, **kwargs)]  # type: ignore[arg-type]
+
+
+def _touch(root: Path, *relative: str) -> None:
+    for item in relative:
+        path = root / item
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(item, encoding="utf-8")
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_iter_files_matches_sorted_rglob(tmp_path: Path, workers: int) -> None:
+    _touch(
+        tmp_path,
+        "a.txt",
+        "a/b.md",
+        "a/c/d.html",
+        "b.txt.bak",
+        "z/skip.py",
+        "z/y/x.md",
+    )
+    patterns = ("*.txt", "*.md", "*.html")
+    expected = sorted({p for pattern in patterns for p in tmp_path.rglob(pattern)})
+
+    assert _paths(tmp_path, patterns, workers=workers) == expected
+
+
+def test_iter_files_records_sizes_from_the_walk(tmp_path: Path) -> None:
+    _touch(tmp_path, "a.txt", "sub/longer-name.txt")
+
+    sizes = {item.path.name: item.size for item in iter_files(tmp_path, ("*.txt",))}
+
+    assert sizes == {"a.txt": len("a.txt"), "longer-name.txt": len("sub/longer-name.txt")}
+
+
+def test_iter_files_raises_for_unreadable_root(tmp_path: Path) -> None:
+    with pytest.raises(OSError):
+        list(iter_files(tmp_path / "missing-dir", ("*.txt",)))
+
+
+def test_iter_files_prunes_excluded_directories(tmp_path: Path) -> None:
+    _touch(tmp_path, "keep.md", "node_modules/pkg/readme.md", ".git/notes.md", "docs/tmp.md")
+
+    found = _paths(tmp_path, ("*.md",), ("node_modules", "docs/tmp.md"), workers=1)
+
+    assert found == [tmp_path / "keep.md"]
+
+
+def test_iter_files_non_recursive_only_lists_top_level(tmp_path: Path) -> None:
+    _touch(tmp_path, "top.txt", "sub/nested.txt")
+
+    assert _paths(tmp_path, ("*.txt",), recurse=False) == [tmp_path / "top.txt"]
+    assert _paths(tmp_path, ("sub/*.txt",), recurse=False) == [tmp_path / "sub" / "nested.txt"]
+
+
+def test_iter_files_honours_gitignore(tmp_path: Path) -> None:
+    _touch(tmp_path, "keep.md", "build/out.md", "sub/draft.md", "sub/final.md", "sub/notes.md")
+    (tmp_path / ".gitignore").write_text("build/\n*.md\n!final.md\n", encoding="utf-8")
+    (tmp_path / "sub" / ".gitignore").write_text("!notes.md\n", encoding="utf-8")
+
+    found = _paths(tmp_path, ("*.md",), gitignore=True, workers=1)
+    assert found == [tmp_path / "sub" / "final.md", tmp_path / "sub" / "notes.md"]
+
+    assert len(_paths(tmp_path, ("*.md",), gitignore=False)) == 5
+
+
+def test_iter_files_yields_single_file_root(tmp_path: Path) -> None:
+    source = tmp_path / "note.rst"
+    source.write_text("x", encoding="utf-8")
+
+    assert [(item.path, item.size) for item in iter_files(source, ("*.md",))] == [(source, 1)]
+
+
+def test_glob_matcher_uses_path_match_semantics() -> None:
+    matcher = GlobMatcher(["*.md", "docs/*.txt"])
+
+    assert matcher.matches(("a", "b", "c.md"))
+    assert matcher.matches(("x", "docs", "y.txt"))
+    assert not matcher.matches(("docs", "sub", "y.txt"))
+    assert not GlobMatcher([])
+
+
+def test_parse_gitignore_anchoring_and_double_star() -> None:
+    rules = parse_gitignore("/root.txt\nlogs/**/debug.log\n# comment\n\n")
+
+    assert [
+        rule.regex.match(path) is not None
+        for rule, path in zip(rules, ["root.txt", "logs/a/b/debug.log"], strict=True)
+    ] == [True, True]
+    assert rules[0].regex.match("sub/root.txt") is None
+
+
+def test_iter_files_bounds_listing_read_ahead(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _touch(tmp_path, *(f"d{index:02}/e/f.txt" for index in range(40)))
+    scans: list[str] = []
+    scan = walker._Scanner.scan
+
+    def counting_scan(self: object, directory: str, *args: object, **kwargs: object) -> object:
+        scans.append(directory)
+        return scan(self, directory, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(walker._Scanner, "scan", counting_scan)
+    files = iter_files(tmp_path, ("*.txt",), workers=2)
+
+    next(files)
+    time.sleep(0.2)
+    assert len(scans) <= 1 + 2 * walker.PREFETCH_PER_WORKER + 2, "Read-ahead is bounded"
+    assert len(list(files)) == 39 and len(scans) == 81
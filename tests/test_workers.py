@@ -0,0 +1,28 @@
+"""Tests for the multi-process local model worker pool."""
+# this_file: tests/test_workers.py
+
+from __future__ import annotations
+
+import operator
+
+from abersetz.providers.workers import ProcessWorkerPool, cpu_groups
+
+
+def test_cpu_groups_split_contiguously() -> None:
+    assert cpu_groups(4, list(range(8))) == [(0, 1), (2, 3), (4, 5), (6, 7)]
+    assert cpu_groups(3, list(range(8))) == [(0, 1), (2, 3, 4), (5, 6, 7)]
+
+
+def test_cpu_groups_share_cpus_when_oversubscribed() -> None:
+    assert cpu_groups(3, [4, 5]) == [(4,), (4,), (5,)]
+    assert cpu_groups(0, [0, 1]) == [(0, 1)]
+
+
+def test_process_worker_pool_loads_state_once_per_worker() -> None:
+    pool = ProcessWorkerPool(str, 2, n_threads=6)
+    try:
+        # The loader received ``n_threads // workers`` and its result is the state.
+        results = [pool.submit(operator.add, f"-{index}") for index in range(4)]
+        assert [future.result(timeout=60) for future in results] == ["3-0", "3-1", "3-2", "3-3"]
+    finally:
+        pool.close()